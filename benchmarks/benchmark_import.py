@@ -0,0 +1,51 @@
+"""
+Cold-start benchmark: wall time of fresh interpreters importing TermGuard
+entry points, and which heavy dependencies each one drags in.
+
+    PYTHONPATH=. python benchmarks/benchmark_import.py --repeat 7 --out outputs/import_time.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+HEAVY = ["pandas", "numpy", "scipy", "sklearn", "jieba"]
+
+CASES = {
+    "python_baseline": "pass",
+    "import_termguard_pipeline": "import termguard.pipeline",
+    "import_termguard_cli": "import termguard.cli",
+    "cli_help": "import sys; sys.argv=['termguard','--help']\nfrom termguard.cli import main\ntry:\n    main()\nexcept SystemExit:\n    pass",
+}
+
+
+def _time_case(code: str, repeat: int) -> dict:
+    probe = code + "\nimport sys, json; print(json.dumps([m for m in %r if m in sys.modules]))" % HEAVY
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+        times.append(perf_counter() - t0)
+        loaded = json.loads(out.strip().splitlines()[-1])
+    return {"median_s": statistics.median(times), "min_s": min(times), "heavy_modules": loaded}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Measure TermGuard import / CLI cold-start time")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--out", default=None, help="Optional JSON output path")
+    args = p.parse_args()
+
+    results = {name: _time_case(code, args.repeat) for name, code in CASES.items()}
+    text = json.dumps({"python": sys.version.split()[0], "repeat": args.repeat, "results": results}, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
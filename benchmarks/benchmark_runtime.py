@@ -0,0 +1,198 @@
+"""
+Scaling benchmark for the TermGuard pipeline.
+
+Generates seeded synthetic EN/ZH bitexts and glossaries, runs `run_pipeline`
+on each size in a fresh subprocess (so peak RSS is per case) and records the
+per-stage times. Results are written as JSON; `--compare` checks them against
+a saved baseline and exits non-zero when a stage regresses.
+
+    PYTHONPATH=. python benchmarks/benchmark_runtime.py --preset small --out outputs/bench.json
+    PYTHONPATH=. python benchmarks/benchmark_runtime.py --preset small --compare outputs/bench.json
+    PYTHONPATH=. python benchmarks/benchmark_runtime.py --sizes 5000x50,20000x500 --engine sparse
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+PRESETS = {
+    "smoke": ["200x10"],
+    "small": ["1000x10", "10000x100"],
+    "medium": ["1000x10", "10000x100", "100000x1000"],
+    "large": ["1000x10", "10000x100", "100000x1000", "1000000x100000"],
+}
+
+_EN_SYLLABLES = ["dro", "ne", "pro", "gram", "cam", "pus", "se", "cu", "ri", "ty", "po", "li", "ce",
+                 "da", "ta", "net", "work", "sys", "tem", "ma", "trix", "vec", "tor", "cor", "pus"]
+_EN_FILLER = ["the", "team", "will", "review", "report", "after", "each", "meeting", "with", "new",
+              "results", "from", "our", "partners", "today", "clearly", "improves", "requires"]
+_ZH_CHARS = "无人机项目校园安全警方隐私监控政策指导方针数据网络系统矩阵向量语料模型评估报告结果"
+_ZH_FILLER = ["团队", "将会", "审查", "每次", "会议", "之后", "新的", "结果", "来自", "合作", "伙伴", "今天"]
+
+
+def _en_word(rnd: random.Random) -> str:
+    return "".join(rnd.choice(_EN_SYLLABLES) for _ in range(rnd.randint(2, 3)))
+
+
+def _zh_word(rnd: random.Random) -> str:
+    return "".join(rnd.choice(_ZH_CHARS) for _ in range(rnd.randint(2, 4)))
+
+
+def make_bitext(n_sents: int, n_terms: int, seed: int = 0,
+                variant_rate: float = 0.15) -> Tuple[str, str, Dict[str, str]]:
+    """
+    Seeded synthetic bitext: one sentence per line, each mentioning 1-3
+    two-word glossary terms. ZH sentences render a term with its preferred
+    translation, or with a per-term variant at `variant_rate`.
+    """
+    rnd = random.Random(seed)
+    glossary: Dict[str, str] = {}
+    variants: Dict[str, str] = {}
+    while len(glossary) < n_terms:
+        en = f"{_en_word(rnd)} {_en_word(rnd)}"
+        if en not in glossary:
+            glossary[en] = _zh_word(rnd) + _zh_word(rnd)
+            variants[en] = _zh_word(rnd) + _zh_word(rnd)
+
+    terms = list(glossary)
+    en_lines: List[str] = []
+    zh_lines: List[str] = []
+    for _ in range(n_sents):
+        en_parts: List[str] = []
+        zh_parts: List[str] = []
+        for term in rnd.sample(terms, k=min(len(terms), rnd.randint(1, 3))):
+            en_parts += rnd.sample(_EN_FILLER, 2) + [term]
+            zh = variants[term] if rnd.random() < variant_rate else glossary[term]
+            zh_parts += rnd.sample(_ZH_FILLER, 2) + [zh]
+        en_lines.append(" ".join(en_parts).capitalize() + ".")
+        zh_lines.append("".join(zh_parts) + "。")
+    return "\n".join(en_lines), "\n".join(zh_lines), glossary
+
+
+def _peak_rss_mb() -> Any:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(n_sents: int, n_terms: int, seed: int, engine: str, workers: int) -> Dict[str, Any]:
+    from termguard.config import TermGuardConfig
+    from termguard.pipeline import run_pipeline
+    from termguard.utils import Timer
+
+    with Timer() as t:
+        en_text, zh_text, glossary = make_bitext(n_sents, n_terms, seed)
+    gen_time = t.elapsed
+
+    cfg = TermGuardConfig(align_engine=engine, align_workers=workers)
+    with tempfile.TemporaryDirectory() as out_dir:
+        # untimed warm-up: the jieba dictionary load and lazy imports would otherwise land in align_terms
+        warm_en, warm_zh, warm_glossary = make_bitext(20, 2, seed)
+        run_pipeline(warm_en, warm_zh, glossary=warm_glossary, out_dir=out_dir, config=cfg)
+        with Timer() as t:
+            result = run_pipeline(en_text, zh_text, glossary=glossary, out_dir=out_dir, config=cfg)
+    return {
+        "sentences": n_sents,
+        "glossary_terms": n_terms,
+        "aligned_pairs": result["aligned_pairs"],
+        "flags": len(result["flags"]),
+        "generate_s": gen_time,
+        "total_s": t.elapsed,
+        "stage_times": result["stage_times"],
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _case_in_subprocess(size: str, seed: int, engine: str, workers: int) -> Dict[str, Any]:
+    cmd = [sys.executable, __file__, "--_case", size, "--seed", str(seed), "--engine", engine, "--workers", str(workers)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _parse_size(size: str) -> Tuple[int, int]:
+    n_sents, _, n_terms = size.lower().partition("x")
+    return int(n_sents), int(n_terms or 10)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_seconds: float) -> List[str]:
+    """Stages slower than baseline by more than `threshold` (relative) and `min_seconds` (absolute)."""
+    base_cases = {(c["sentences"], c["glossary_terms"]): c for c in baseline["cases"]}
+    regressions: List[str] = []
+    for case in current["cases"]:
+        key = (case["sentences"], case["glossary_terms"])
+        if key not in base_cases:
+            continue
+        old_times = base_cases[key]["stage_times"]
+        for stage, new in case["stage_times"].items():
+            old = old_times.get(stage)
+            if old is None:
+                continue
+            if new > old * (1.0 + threshold) and new - old > min_seconds:
+                regressions.append(f"{key[0]}x{key[1]} {stage}: {old:.3f}s -> {new:.3f}s (+{(new / max(old, 1e-9) - 1):.0%})")
+    return regressions
+
+
+def main():
+    p = argparse.ArgumentParser(description="TermGuard scaling benchmark")
+    p.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    p.add_argument("--sizes", default=None, help="Comma list of <sentences>x<glossary_terms>, overrides --preset")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--engine", default="counter", help="Alignment engine (counter|sparse)")
+    p.add_argument("--workers", type=int, default=1, help="Alignment worker processes")
+    p.add_argument("--out", default=None, help="Write results JSON here")
+    p.add_argument("--compare", default=None, help="Baseline JSON; exit 1 if any stage regresses")
+    p.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown per stage (default: 0.25)")
+    p.add_argument("--min-seconds", type=float, default=0.05, help="Ignore slowdowns smaller than this (default: 0.05)")
+    p.add_argument("--_case", default=None, help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args._case:
+        n_sents, n_terms = _parse_size(args._case)
+        print(json.dumps(run_case(n_sents, n_terms, args.seed, args.engine, args.workers)))
+        return
+
+    sizes = args.sizes.split(",") if args.sizes else PRESETS[args.preset]
+    cases = []
+    for size in sizes:
+        case = _case_in_subprocess(size.strip(), args.seed, args.engine, args.workers)
+        cases.append(case)
+        stages = " ".join(f"{k}={v:.3f}s" for k, v in case["stage_times"].items())
+        print(f"[bench] {size}: total={case['total_s']:.3f}s peak_rss={case['peak_rss_mb']}MB {stages}", file=sys.stderr)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "engine": args.engine,
+            "workers": args.workers,
+        },
+        "cases": cases,
+    }
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        for r in regressions:
+            print(f"[regression] {r}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("[bench] no stage regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,30 @@
+import io
+
 import streamlit as st
 import pandas as pd
-from io import StringIO
-from termguard.pipeline import run_pipeline, load_glossary_csv
+from termguard.instrument import Instrumentation
+from termguard.memo import RunCache
+from termguard.pipeline import parse_glossary_csv
+from termguard.report import REPORT_COLUMNS
+
+STAGES = ["preprocess_align", "extract_terms", "align_terms", "detect_inconsistencies", "patch"]
+
+
+@st.cache_resource
+def shared_run_cache() -> RunCache:
+    # one per server process: warm jieba dictionary + memoized runs shared by all sessions
+    import jieba
+
+    jieba.initialize()
+    return RunCache(max_entries=32)
+
+
+@st.cache_data
+def parse_glossary(data: bytes) -> dict:
+    try:
+        return parse_glossary_csv(io.StringIO(data.decode("utf-8-sig"), newline=""))
+    except ValueError:  # no recognizable en/zh columns
+        return {}
 
 
 st.set_page_config(page_title="TermGuard Demo", layout="wide")
@@ -19,8 +42,6 @@ with col2:
 with col3:
     gl_file = st.file_uploader("Glossary (.csv, optional)", type=["csv"])
 
-out_dir = st.text_input("Output directory", value="outputs/streamlit_run")
-
 run_btn = st.button("Run TermGuard")
 
 if run_btn:
@@ -28,30 +49,35 @@ if run_btn:
         st.error("Please upload both English and Chinese text files.")
         st.stop()
 
-    en_text = en_file.read().decode("utf-8", errors="ignore")
-    zh_text = zh_file.read().decode("utf-8", errors="ignore")
+    en_text = en_file.getvalue().decode("utf-8", errors="ignore")
+    zh_text = zh_file.getvalue().decode("utf-8", errors="ignore")
 
     glossary = {}
     if gl_file:
-        # read as dataframe then convert
-        gl_df = pd.read_csv(gl_file)
-        if "en_term" in gl_df.columns and "zh_term" in gl_df.columns:
-            glossary = {str(r["en_term"]).strip(): str(r["zh_term"]).strip() for _, r in gl_df.iterrows()}
-        else:
+        glossary = parse_glossary(gl_file.getvalue())
+        if not glossary:
             st.warning("Glossary CSV must have columns: en_term, zh_term. Ignoring glossary.")
 
-    with st.spinner("Running pipeline..."):
-        result = run_pipeline(
-            en_text=en_text,
-            zh_text=zh_text,
-            glossary=glossary,
-            out_dir=out_dir
-        )
+    progress = st.progress(0.0, text="Running pipeline...")
+
+    def on_stage_end(rec) -> None:
+        done = STAGES.index(rec.name) + 1 if rec.name in STAGES else 0
+        progress.progress(done / len(STAGES), text=f"{rec.name} done ({rec.wall:.2f}s)")
 
-    st.success("Done!")
+    result, cached = shared_run_cache().get_or_run(
+        en_text, zh_text, glossary=glossary, instrumentation=Instrumentation(on_stage_end=on_stage_end)
+    )
+    progress.empty()
+    # results live in this session only; reruns (e.g. download clicks) reuse them
+    st.session_state["result"] = result
+    st.session_state["cached"] = cached
+
+if "result" in st.session_state:
+    result = st.session_state["result"]
+    st.success("Done! (cached result)" if st.session_state.get("cached") else "Done!")
 
     st.subheader("Flagged inconsistencies")
-    report_df = pd.read_csv(result["report_csv"])
+    report_df = pd.DataFrame(result["report_table"], columns=REPORT_COLUMNS)
     st.dataframe(report_df, use_container_width=True)
 
     st.subheader("Stage runtimes (seconds)")
@@ -59,14 +85,10 @@ if run_btn:
 
     # Downloads
     st.subheader("Downloads")
-    report_csv_bytes = open(result["report_csv"], "rb").read()
-    report_json_bytes = open(result["report_json"], "rb").read()
-    patched_bytes = open(result["patched_path"], "rb").read()
-
     c1, c2, c3 = st.columns(3)
     with c1:
-        st.download_button("Download report.csv", report_csv_bytes, file_name="report.csv")
+        st.download_button("Download report.csv", result["reports"]["csv"], file_name="report.csv")
     with c2:
-        st.download_button("Download report.json", report_json_bytes, file_name="report.json")
+        st.download_button("Download report.json", result["reports"]["json"], file_name="report.json")
     with c3:
-        st.download_button("Download zh_patched.txt", patched_bytes, file_name="zh_patched.txt")
+        st.download_button("Download zh_patched.txt", result["patched_zh"].encode("utf-8"), file_name="zh_patched.txt")
@@ -0,0 +1,5 @@
+from termguard.cli import main
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
+from array import array
 from collections import Counter
-from typing import Dict, List, Tuple, Optional
+from itertools import repeat
+from typing import AbstractSet, Callable, Dict, Iterable, List, Tuple, Optional
 
-import jieba
-
-from .utils import contains_en_term
+from .feature_cache import ZhFeatureCache, sentence_key
+from .segmentation import ZhSegmenter
+from .term_index import EnTermIndex
 
 
 def zh_tokenize(s: str) -> List[str]:
+    import jieba
+
     return [t.strip() for t in jieba.lcut(s) if t.strip()]
 
 
@@ -21,75 +25,467 @@ def zh_ngrams(tokens: List[str], max_n: int = 4) -> List[str]:
     return grams
 
 
+_ZH_STOP_CHARS = ("的", "了", "在", "是", "和", "与")
+
+
+def _is_candidate(g: str) -> bool:
+    return len(g) >= 2 and not any(ch in g for ch in _ZH_STOP_CHARS)
+
+
+def zh_candidate_grams(tokens: List[str], max_n: int = 4) -> List[str]:
+    """N-grams of a segmented sentence that are eligible as ZH term candidates."""
+    return [g for g in zh_ngrams(tokens, max_n=max_n) if _is_candidate(g)]
+
+
+class ZhGramTable:
+    """
+    Intern table for ZH tokens and candidate n-grams.
+
+    Tokens get integer ids along with their length and whether they contain a
+    stop character, so candidate filtering is decided per token and never on
+    joined strings. A token sequence is joined once, the first time it is
+    seen; sequences that join to the same string share one gram id, exactly
+    like str-keyed counting.
+    """
+
+    def __init__(self):
+        self.grams: List[str] = []
+        self._gram_ids: Dict[str, int] = {}
+        self._token_ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._token_stop: List[bool] = []
+        self._token_gram: List[int] = []  # unigram gram id, -1 if not a candidate
+        self._seq_ids: Dict[Tuple[int, ...], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.grams)
+
+    def gram_id(self, gram: str) -> Optional[int]:
+        return self._gram_ids.get(gram)
+
+    def intern_gram(self, gram: str) -> int:
+        gid = self._gram_ids.get(gram)
+        if gid is None:
+            gid = self._gram_ids[gram] = len(self.grams)
+            self.grams.append(gram)
+        return gid
+
+    def _token_id(self, tok: str) -> int:
+        tid = self._token_ids.get(tok)
+        if tid is None:
+            tid = self._token_ids[tok] = len(self._tokens)
+            self._tokens.append(tok)
+            self._token_stop.append(any(ch in tok for ch in _ZH_STOP_CHARS))
+            self._token_gram.append(self.intern_gram(tok) if _is_candidate(tok) else -1)
+        return tid
+
+    def sentence_counts(
+        self,
+        tokens: List[str],
+        max_n: int = 4,
+        anchors: Optional[AbstractSet[str]] = None,
+        window: int = 2,
+    ) -> Tuple[Dict[int, int], int]:
+        """
+        Candidate gram id -> count for one segmented sentence, in the order
+        `zh_candidate_grams` would produce them, plus the number of n-grams
+        generated before filtering. If some tokens are in `anchors`, only
+        n-grams lying within `window` tokens of one are generated.
+        """
+        tids = [self._token_id(t) for t in tokens]
+        n = len(tids)
+        stop = self._token_stop
+        near = None
+        if anchors:
+            hits = [i for i, t in enumerate(tokens) if t in anchors]
+            if hits:
+                near = [False] * n
+                for i in hits:
+                    for j in range(max(0, i - window), min(n, i + window + 1)):
+                        near[j] = True
+        # run_end[i]: first stop (or non-near) token at or after i; windows must end before it
+        run_end = [n] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            run_end[i] = i if stop[tids[i]] or (near is not None and not near[i]) else run_end[i + 1]
+
+        counts: Dict[int, int] = {}
+        token_gram = self._token_gram
+        for i, tid in enumerate(tids):
+            gid = token_gram[tid]
+            if gid >= 0 and (near is None or near[i]):
+                counts[gid] = counts.get(gid, 0) + 1
+        if near is None:
+            generated = sum(max(0, n - k + 1) for k in range(1, max_n + 1))
+        else:
+            generated = _windows_within(near, max_n)
+        seq_ids = self._seq_ids
+        for k in range(2, max_n + 1):
+            for i in range(n - k + 1):
+                if i + k > run_end[i]:
+                    continue
+                key = tuple(tids[i:i + k])
+                gid = seq_ids.get(key)
+                if gid is None:
+                    gid = seq_ids[key] = self.intern_gram("".join(self._tokens[t] for t in key))
+                counts[gid] = counts.get(gid, 0) + 1
+        return counts, generated
+
+
+def _windows_within(near: List[bool], max_n: int) -> int:
+    """Number of n-grams (n <= max_n) lying entirely inside runs of True."""
+    total = run = 0
+    for flag in near + [False]:
+        if flag:
+            run += 1
+            continue
+        total += sum(max(0, run - k + 1) for k in range(1, max_n + 1))
+        run = 0
+    return total
+
+
+def _init_align_worker() -> None:
+    # load the jieba dictionary once per worker process, not once per shard
+    import jieba
+
+    jieba.initialize()
+
+
+def _shard_features(
+    zh_sents: List[str], zh_ngram_max: int, segmenter: ZhSegmenter
+) -> List[Tuple[List[Tuple[str, int]], int]]:
+    # ids are local to this process, so shards travel back as (gram, count) pairs
+    table = ZhGramTable()
+    out = []
+    for s in zh_sents:
+        counts, generated = segmenter.sentence_counts(table, s, zh_ngram_max)
+        out.append(([(table.grams[g], c) for g, c in counts.items()], generated))
+    return out
+
+
+class ZhFeatureStore:
+    """
+    Per-run cache of ZH sentence features.
+
+    Each sentence is segmented and turned into filtered candidate counts at most
+    once, on first use, no matter how many EN terms it co-occurs with. Features
+    are (gram ids, counts) int64 arrays in first-occurrence order, with ids
+    from the store's `table`. With a persistent `cache`, `prefetch` only
+    segments sentences no earlier run saw. `segmenter` picks the tokenizer
+    and candidate window (plain jieba by default).
+    """
+
+    def __init__(self, zh_sents: List[str], zh_ngram_max: int = 4,
+                 cache: Optional[ZhFeatureCache] = None, segmenter: Optional[ZhSegmenter] = None):
+        self.zh_sents = zh_sents
+        self.zh_ngram_max = zh_ngram_max
+        self.cache = cache
+        self.segmenter = segmenter or ZhSegmenter()
+        self.table = ZhGramTable()
+        self._features: Dict[int, Tuple[array, array]] = {}
+        # work counters for instrumentation
+        self.sentences_segmented = 0
+        self.ngrams_generated = 0
+        self.ngrams_kept = 0
+
+    def features(self, i: int) -> Tuple[array, array]:
+        feats = self._features.get(i)
+        if feats is None:
+            counts, generated = self.segmenter.sentence_counts(self.table, self.zh_sents[i], self.zh_ngram_max)
+            feats = self._store(i, counts, generated)
+        return feats
+
+    def gram_counts(self, i: int) -> Counter:
+        """Features of sentence `i` as a str-keyed Counter."""
+        gids, cnts = self.features(i)
+        return Counter({self.table.grams[g]: c for g, c in zip(gids, cnts)})
+
+    def _intern(self, i: int, counts: Counter) -> None:
+        self._features[i] = (array("q", map(self.table.intern_gram, counts)), array("q", counts.values()))
+
+    def _store(self, i: int, counts: Dict[int, int], generated: int) -> Tuple[array, array]:
+        feats = (array("q", counts), array("q", counts.values()))
+        self._features[i] = feats
+        self.sentences_segmented += 1
+        self.ngrams_generated += generated
+        self.ngrams_kept += sum(feats[1])
+        return feats
+
+    def prefetch(self, idxs: Iterable[int], workers: int = 1) -> None:
+        """
+        Compute features for `idxs` ahead of time, sharded by sentence range
+        across a process pool. Shards are merged back in sentence order, so
+        downstream counting sees exactly what the serial path would.
+        """
+        todo = sorted(i for i in set(idxs) if i not in self._features)
+
+        keys: Dict[int, str] = {}
+        if self.cache is not None and todo:
+            seg_key = self.segmenter.key
+            keys = {i: sentence_key(self.zh_sents[i], self.zh_ngram_max, seg_key) for i in todo}
+            found = self.cache.get_many(keys.values())
+            for i in todo:
+                if keys[i] in found:
+                    self._intern(i, found[keys[i]])
+            todo = [i for i in todo if i not in self._features]
+
+        self._compute(todo, workers)
+
+        if self.cache is not None and todo:
+            self.cache.put_many((keys[i], self.gram_counts(i)) for i in todo)
+
+    def _compute(self, todo: List[int], workers: int) -> None:
+        if workers <= 1 or len(todo) < 2 * workers:
+            for i in todo:
+                self.features(i)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(todo) // (workers * 4))
+        shards = [todo[k:k + size] for k in range(0, len(todo), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_align_worker) as ex:
+            results = ex.map(
+                _shard_features,
+                [[self.zh_sents[i] for i in shard] for shard in shards],
+                repeat(self.zh_ngram_max),
+                repeat(self.segmenter),
+            )
+            for shard, feats in zip(shards, results):
+                for i, (pairs, generated) in zip(shard, feats):
+                    self._store(i, {self.table.intern_gram(g): c for g, c in pairs}, generated)
+
+
+def _glossary_variants(pref: str) -> List[str]:
+    """Known alternate renderings of a glossary term that get a count boost."""
+    extra_variants: List[str] = []
+    if pref.endswith("项目") and "无人机" in pref:
+        extra_variants.append(pref.replace("无人机", "无人飞行器"))
+    return extra_variants
+
+
+def _select_candidates(
+    term: str,
+    counts: Counter,
+    total_pairs: int,
+    zh_contains: Callable[[str], bool],
+    max_candidates: int,
+    glossary: Dict[str, str],
+) -> List[Tuple[str, float, int]]:
+    """
+    Score a term's ZH candidate counts and keep the top `max_candidates`.
+    `counts` must iterate in first-occurrence order; it breaks ties in the sort.
+    `zh_contains(v)` tells whether a glossary variant occurs in the term's ZH
+    sentences; it is only called for glossary terms.
+    """
+    scored: List[Tuple[str, float, int]] = []
+    for zh_term, c in counts.items():
+        if c < 2:
+            continue
+        score = c / max(1, total_pairs)
+        scored.append((zh_term, float(score), int(c)))
+    scored.sort(key=lambda x: (x[2], x[1]), reverse=True)
+
+    if term not in glossary:
+        return scored[:max_candidates]
+
+    pref = glossary[term]
+
+    for v in _glossary_variants(pref):
+        if zh_contains(v):
+            counts[v] += 2  # boost
+
+    rescored: List[Tuple[str, float, int]] = []
+    for zh_term, c in counts.items():
+        if c < 2:
+            continue
+        score = c / max(1, total_pairs)
+        rescored.append((zh_term, float(score), int(c)))
+    rescored.sort(key=lambda x: (x[2], x[1]), reverse=True)
+
+    pref_count = counts.get(pref, 0)
+    anchored = [(pref, 999.0, int(pref_count) + 1)]
+    alternates = [(z, s, ct) for (z, s, ct) in rescored if z != pref]
+    return anchored + alternates[: max(0, max_candidates - 1)]
+
+
 def align_terms(
     aligned_pairs: List[Tuple[str, str]],
     en_terms: List[str],
     zh_ngram_max: int = 4,
     max_candidates: int = 5,
     glossary: Optional[Dict[str, str]] = None,
+    engine: str = "counter",
+    workers: int = 1,
+    feature_cache: Optional[ZhFeatureCache] = None,
+    stats: Optional[Dict[str, int]] = None,
+    term_stats: Optional[Dict[str, Tuple[int, Counter, List[str]]]] = None,
+    approx_width: int = 1024,
+    segmenter: Optional[ZhSegmenter] = None,
 ) -> Dict[str, List[Tuple[str, float, int]]]:
+    """
+    Map EN terms to scored ZH candidates from sentence-pair co-occurrence.
+
+    engine="counter" sums interned per-sentence count arrays term by term;
+    engine="sparse" computes all co-occurrence counts with one sparse matrix
+    product (see align_sparse).
+    Both return identical mappings. engine="approx" counts each term in a
+    Space-Saving summary of `approx_width` grams (see heavy_hitters): memory
+    per term is capped and counts may be overestimated by at most
+    (term's total candidate count) / approx_width; exact while a term has no
+    more than `approx_width` distinct candidates. With workers > 1, ZH segmentation of the
+    matched sentences is sharded across a process pool first; with a
+    `feature_cache`, previously seen sentences are read from disk instead.
+    `segmenter` sets how ZH sentences are tokenized into candidates (see
+    segmentation.ZhSegmenter; plain jieba n-grams by default).
+    If `stats` is given it is filled with work counters for instrumentation.
+    If `term_stats` is given it receives, per term, the raw material of the
+    selection: (matched pairs, every candidate count, glossary variants seen),
+    see stats.CorpusStats.
+    """
     glossary = glossary or {}
-    en_lower = [en.lower() for en, _ in aligned_pairs]
-    results: Dict[str, List[Tuple[str, float, int]]] = {}
+    en_index = EnTermIndex(en.lower() for en, _ in aligned_pairs)
+    zh_sents = [zh for _, zh in aligned_pairs]
+    zh_store = ZhFeatureStore(zh_sents, zh_ngram_max=zh_ngram_max, cache=feature_cache, segmenter=segmenter)
+    if workers > 1 or feature_cache is not None:
+        zh_store.prefetch((i for t in en_terms for i in en_index.lookup(t.lower())), workers=workers)
 
-    for term in en_terms:
-        extra_variants: List[str] = []
+    # raw stats need every count, not just the ones that can still be selected
+    prune = None if term_stats is not None else max_candidates
+    if engine == "sparse":
+        from .align_sparse import sparse_term_counts
+        term_counts = sparse_term_counts(en_index, zh_store, en_terms, glossary, prune)
+    elif engine == "counter":
+        term_counts = _counter_term_counts(en_index, zh_store, en_terms, glossary, prune)
+    elif engine == "approx":
+        term_counts, evictions = _approx_term_counts(en_index, zh_store, en_terms, glossary, approx_width)
+    else:
+        raise ValueError(f"Unknown align engine: {engine!r}")
 
-        term_lower = term.lower()
-        idxs = [i for i, s in enumerate(en_lower) if contains_en_term(s, term_lower)]
+    results: Dict[str, List[Tuple[str, float, int]]] = {}
+    for term in en_terms:
+        idxs, counts = term_counts[term]
+        if term_stats is not None:
+            variants = _glossary_variants(glossary[term]) if term in glossary else []
+            if variants:
+                zh_concat = " ".join(zh_sents[i] for i in idxs)
+                variants = [v for v in variants if v in zh_concat]
+            term_stats[term] = (len(idxs), Counter(counts), variants)
         if not idxs:
             results[term] = []
             continue
+        results[term] = _select_candidates(
+            term, counts, len(idxs), lambda v, idxs=idxs: v in " ".join(zh_sents[i] for i in idxs),
+            max_candidates, glossary
+        )
 
-        counts: Counter = Counter()
-        total_pairs = 0
+    if stats is not None:
+        matched = [term_counts[t][0] for t in dict.fromkeys(en_terms)]
+        stats.update(
+            terms=len(matched),
+            terms_matched=sum(1 for idxs in matched if idxs),
+            sentences_aligned=len({i for idxs in matched for i in idxs}),
+            sentences_segmented=zh_store.sentences_segmented,
+            ngrams_generated=zh_store.ngrams_generated,
+            ngrams_kept=zh_store.ngrams_kept,
+        )
+        if engine == "approx":
+            stats["approx_evictions"] = evictions
+    return results
 
-        for i in idxs:
-            _, zh = aligned_pairs[i]
-            toks = zh_tokenize(zh)
-            grams = zh_ngrams(toks, max_n=zh_ngram_max)
 
-            for g in grams:
-                if len(g) < 2:
-                    continue
-                if any(ch in g for ch in ["的", "了", "在", "是", "和", "与"]):
-                    continue
-                counts[g] += 1
+def _pinned_ids(term: str, glossary: Dict[str, str], table: ZhGramTable) -> List[int]:
+    """Gram ids of the glossary preferred term and its variants; always kept."""
+    if term not in glossary:
+        return []
+    pref = glossary[term]
+    ids = (table.gram_id(g) for g in [pref] + _glossary_variants(pref))
+    return [g for g in ids if g is not None]
 
-            total_pairs += 1
 
-        scored: List[Tuple[str, float, int]] = []
-        for zh_term, c in counts.items():
-            if c < 2:
-                continue
-            score = c / max(1, total_pairs)
-            scored.append((zh_term, float(score), int(c)))
-        scored.sort(key=lambda x: (x[2], x[1]), reverse=True)
+def _keep_mask(gids, cnts, pinned: List[int], max_candidates: Optional[int]):
+    """
+    Grams that can still reach the top `max_candidates` of _select_candidates:
+    anything beaten strictly by `max_candidates` others is dropped, pinned
+    grams are always kept. `max_candidates=None` keeps everything.
+    """
+    import numpy as np
 
-        if term in glossary:
-            pref = glossary[term]
+    if max_candidates is None:
+        return np.ones(len(gids), dtype=bool)
 
-            if pref.endswith("项目") and "无人机" in pref:
-                extra_variants.append(pref.replace("无人机", "无人飞行器"))
+    pinned_mask = np.isin(gids, pinned) if pinned else np.zeros(len(gids), dtype=bool)
+    others = np.sort(cnts[~pinned_mask])[::-1]
+    if max_candidates <= 0:
+        cutoff = np.inf
+    elif len(others) >= max_candidates:
+        cutoff = max(2, others[max_candidates - 1])
+    else:
+        cutoff = 2
+    return pinned_mask | (cnts >= cutoff)
 
-            zh_concat = " ".join([aligned_pairs[i][1] for i in idxs])
-            for v in extra_variants:
-                if v in zh_concat:
-                    counts[v] += 2  # boost
 
-            rescored: List[Tuple[str, float, int]] = []
-            for zh_term, c in counts.items():
-                if c < 2:
-                    continue
-                score = c / max(1, total_pairs)
-                rescored.append((zh_term, float(score), int(c)))
-            rescored.sort(key=lambda x: (x[2], x[1]), reverse=True)
-
-            pref_count = counts.get(pref, 0)
-            anchored = [(pref, 999.0, int(pref_count) + 1)]
-            alternates = [(z, s, ct) for (z, s, ct) in rescored if z != pref]
-            results[term] = anchored + alternates[: max(0, max_candidates - 1)]
-        else:
-            results[term] = scored[:max_candidates]
+def _materialize(table: ZhGramTable, gids, cnts) -> Counter:
+    """str-keyed Counter for the surviving grams, keeping their order."""
+    return Counter({table.grams[g]: c for g, c in zip(gids.tolist(), cnts.tolist())})
 
-    return results
+
+def _counter_term_counts(
+    en_index: EnTermIndex,
+    zh_store: ZhFeatureStore,
+    en_terms: List[str],
+    glossary: Dict[str, str],
+    max_candidates: Optional[int],
+) -> Dict[str, Tuple[List[int], Counter]]:
+    """
+    Sum each term's sentence features as int64 arrays. Gram ids come back in
+    first-occurrence order (what a Counter updated sentence by sentence would
+    hold); only grams that can still be selected are turned back into strings.
+    """
+    import numpy as np
+
+    term_counts: Dict[str, Tuple[List[int], Counter]] = {}
+    for term in en_terms:
+        idxs = en_index.lookup(term.lower())
+        if not idxs:
+            term_counts[term] = (idxs, Counter())
+            continue
+        feats = [zh_store.features(i) for i in idxs]
+        gids = np.concatenate([np.frombuffer(g, dtype=np.int64) for g, _ in feats])
+        cnts = np.concatenate([np.frombuffer(c, dtype=np.int64) for _, c in feats])
+        uniq, first, inverse = np.unique(gids, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=cnts, minlength=len(uniq)).astype(np.int64)
+        order = np.argsort(first, kind="stable")
+        uniq, totals = uniq[order], totals[order]
+
+        keep = _keep_mask(uniq, totals, _pinned_ids(term, glossary, zh_store.table), max_candidates)
+        term_counts[term] = (idxs, _materialize(zh_store.table, uniq[keep], totals[keep]))
+    return term_counts
+
+
+def _approx_term_counts(
+    en_index: EnTermIndex,
+    zh_store: ZhFeatureStore,
+    en_terms: List[str],
+    glossary: Dict[str, str],
+    width: int,
+) -> Tuple[Dict[str, Tuple[List[int], Counter]], int]:
+    """
+    Stream each term's sentence features through a Space-Saving summary of
+    `width` grams; the glossary preferred term and its variants are pinned
+    and counted exactly. Returns the term counts and the number of evictions.
+    """
+    from .heavy_hitters import SpaceSaving
+
+    term_counts: Dict[str, Tuple[List[int], Counter]] = {}
+    evictions = 0
+    for term in dict.fromkeys(en_terms):
+        idxs = en_index.lookup(term.lower())
+        feats = [zh_store.features(i) for i in idxs]
+        summary = SpaceSaving(width, pinned=_pinned_ids(term, glossary, zh_store.table))
+        for gids, cnts in feats:
+            for g, c in zip(gids, cnts):
+                summary.add(g, c)
+        evictions += summary.evictions
+        grams = zh_store.table.grams
+        term_counts[term] = (idxs, Counter({grams[g]: c for g, c in summary.counts.items()}))
+    return term_counts, evictions
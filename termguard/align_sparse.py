@@ -0,0 +1,98 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .align import ZhFeatureStore, _keep_mask, _materialize, _pinned_ids
+from .term_index import EnTermIndex
+
+
+def _incidence_matrices(
+    term_idxs: List[List[int]],
+    zh_store: ZhFeatureStore,
+) -> Tuple[sparse.csr_matrix, sparse.csr_matrix, sparse.csc_matrix]:
+    """
+    Build the EN term × sentence incidence matrix (binary) and the sentence ×
+    ZH gram count matrix (columns are the store's interned gram ids), plus a
+    parallel matrix holding each gram's first-occurrence rank within its
+    sentence (offset by 1 to stay nonzero). Only sentences that contain at
+    least one term are segmented.
+    """
+    n_sents = len(zh_store.zh_sents)
+
+    t_rows = np.repeat(np.arange(len(term_idxs)), [len(ix) for ix in term_idxs])
+    t_cols = np.fromiter((i for ix in term_idxs for i in ix), dtype=np.int64, count=len(t_rows))
+    en_inc = sparse.csr_matrix(
+        (np.ones(len(t_rows), dtype=np.int64), (t_rows, t_cols)),
+        shape=(len(term_idxs), n_sents),
+    )
+
+    sents = np.unique(t_cols).tolist()
+    feats = [zh_store.features(s) for s in sents]
+    sizes = [len(g) for g, _ in feats]
+    rows = np.repeat(np.asarray(sents, dtype=np.int64), sizes)
+    cols = np.concatenate([np.frombuffer(g, dtype=np.int64) for g, _ in feats] or [np.zeros(0, np.int64)])
+    vals = np.concatenate([np.frombuffer(c, dtype=np.int64) for _, c in feats] or [np.zeros(0, np.int64)])
+    ranks = np.concatenate([np.arange(1, n + 1, dtype=np.int64) for n in sizes] or [np.zeros(0, np.int64)])
+
+    shape = (n_sents, len(zh_store.table))
+    zh_counts = sparse.csr_matrix((vals, (rows, cols)), shape=shape)
+    zh_ranks = sparse.csc_matrix((ranks, (rows, cols)), shape=shape)
+    zh_ranks.sort_indices()
+    return en_inc, zh_counts, zh_ranks
+
+
+def _first_occurrence_keys(
+    zh_ranks: sparse.csc_matrix,
+    idxs: np.ndarray,
+    gids: np.ndarray,
+) -> np.ndarray:
+    """
+    For each n-gram id, the (sentence, rank) of its first occurrence among the
+    sentences `idxs`, packed into one sortable integer. This reproduces the
+    insertion order of a Counter filled sentence by sentence.
+    """
+    sub = zh_ranks[:, gids]
+    stride = int(sub.data.max()) + 1 if sub.nnz else 1
+    key = sub.indices.astype(np.int64) * stride + sub.data
+    key[~np.isin(sub.indices, idxs)] = np.iinfo(np.int64).max
+    return np.minimum.reduceat(key, sub.indptr[:-1])
+
+
+def sparse_term_counts(
+    en_index: EnTermIndex,
+    zh_store: ZhFeatureStore,
+    en_terms: List[str],
+    glossary: Dict[str, str],
+    max_candidates: Optional[int],
+) -> Dict[str, Tuple[List[int], Counter]]:
+    """
+    Co-occurrence counts for every term from a single sparse product
+    (term × sentence) · (sentence × n-gram).
+
+    The returned Counters only hold the n-grams that can still reach the top
+    `max_candidates` of `align._select_candidates` (plus the glossary preferred
+    term and its boosted variants), in the same order the Counter engine would
+    have inserted them, so both engines select identical candidates.
+    """
+    term_idxs = [en_index.lookup(t.lower()) for t in en_terms]
+    en_inc, zh_counts, zh_ranks = _incidence_matrices(term_idxs, zh_store)
+
+    cooc = (en_inc @ zh_counts).tocsr()
+    cooc.sort_indices()
+
+    term_counts: Dict[str, Tuple[List[int], Counter]] = {}
+    for t, term in enumerate(en_terms):
+        idxs = term_idxs[t]
+        row = slice(cooc.indptr[t], cooc.indptr[t + 1])
+        gids = cooc.indices[row]
+        cnts = cooc.data[row]
+
+        keep = _keep_mask(gids, cnts, _pinned_ids(term, glossary, zh_store.table), max_candidates)
+        gids, cnts = gids[keep], cnts[keep]
+        if len(gids):
+            order = np.argsort(_first_occurrence_keys(zh_ranks, np.asarray(idxs), gids), kind="stable")
+            gids, cnts = gids[order], cnts[order]
+        term_counts[term] = (idxs, _materialize(zh_store.table, gids, cnts))
+    return term_counts
@@ -0,0 +1,149 @@
+from __future__ import annotations
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from .config import TermGuardConfig
+from .utils import Timer, safe_mkdir
+
+SUMMARY_FIELDS = ["id", "status", "aligned_pairs", "flags", "elapsed", "en", "zh", "glossary", "out", "error"]
+
+
+def load_manifest(path: str) -> List[Dict[str, str]]:
+    """
+    Read a batch manifest (.csv with a header row, or .jsonl) with columns
+    en, zh and optional glossary, out, id. Relative paths are resolved
+    against the manifest's directory. Ids must be unique, since each one
+    names its job's output directory.
+    """
+    base = Path(path).parent
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as fh:
+            rows = [json.loads(ln) for ln in fh if ln.strip()]
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as fh:
+            rows = [{str(k).strip(): v for k, v in r.items()} for r in csv.DictReader(fh)]
+
+    jobs: List[Dict[str, str]] = []
+    seen: Dict[str, int] = {}
+    for n, r in enumerate(rows):
+        job = {"id": str(r.get("id") or n)}
+        if job["id"] in seen:
+            raise ValueError(f"Manifest rows {seen[job['id']]} and {n} share the id {job['id']!r}")
+        seen[job["id"]] = n
+        for key in ("en", "zh", "glossary", "out"):
+            val = (r.get(key) or "").strip()
+            if val:
+                job[key] = val if Path(val).is_absolute() else str(base / val)
+        if "en" not in job or "zh" not in job:
+            raise ValueError(f"Manifest row {n} needs both 'en' and 'zh' paths")
+        jobs.append(job)
+    return jobs
+
+
+def pair_directory(root: str, en_suffix: str = ".en.txt", zh_suffix: str = ".zh.txt") -> List[Dict[str, str]]:
+    """Pair `<name><en_suffix>` with `<name><zh_suffix>` under `root`; unpaired files are skipped."""
+    jobs: List[Dict[str, str]] = []
+    for en_path in sorted(Path(root).rglob(f"*{en_suffix}")):
+        name = en_path.name[: -len(en_suffix)]
+        zh_path = en_path.with_name(name + zh_suffix)
+        if zh_path.exists():
+            doc_id = str(en_path.relative_to(root).with_name(name))
+            jobs.append({"id": doc_id, "en": str(en_path), "zh": str(zh_path)})
+    return jobs
+
+
+def _init_batch_worker() -> None:
+    # pay the heavy imports and the jieba dictionary load once per worker
+    import jieba
+    from . import pipeline  # noqa: F401
+
+    jieba.initialize()
+
+
+@lru_cache(maxsize=32)
+def _cached_glossary(path: str) -> Mapping[str, str]:
+    from .glossary import load_glossary
+
+    return load_glossary(path)
+
+
+def _run_job(job: Dict[str, str], config: TermGuardConfig) -> Dict[str, Any]:
+    from .pipeline import run_pipeline
+    from .utils import read_text
+
+    row: Dict[str, Any] = {k: job.get(k, "") for k in SUMMARY_FIELDS}
+    with Timer() as t:
+        try:
+            glossary = _cached_glossary(job["glossary"]) if job.get("glossary") else {}
+            result = run_pipeline(
+                en_text=read_text(job["en"]),
+                zh_text=read_text(job["zh"]),
+                glossary=dict(glossary) if isinstance(glossary, dict) else glossary,
+                out_dir=job["out"],
+                config=config,
+            )
+            row.update(status="ok", aligned_pairs=result["aligned_pairs"], flags=len(result["flags"]))
+        except Exception as e:  # one bad document must not sink the batch
+            row.update(status="error", error=f"{type(e).__name__}: {e}")
+    row["elapsed"] = round(t.elapsed, 4)
+    return row
+
+
+def run_batch(
+    jobs: List[Dict[str, str]],
+    out_dir: str,
+    config: Optional[TermGuardConfig] = None,
+    workers: int = 1,
+    glossary_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run many document pairs on one process pool and write a combined summary.
+
+    Each job writes its usual report to its `out` path (default
+    `<out_dir>/<id>`); `glossary_path` is used for jobs without their own.
+    Rows come back in manifest order regardless of completion order.
+    Ids that are absolute or contain ".." raise ValueError before any job runs.
+    """
+    cfg = config or TermGuardConfig()
+    jobs = [dict(job) for job in jobs]
+    for job in jobs:
+        doc_id = Path(job["id"])
+        if doc_id.is_absolute() or ".." in doc_id.parts:
+            raise ValueError(f"Job id {job['id']!r} must be a relative path inside the output directory")
+        job.setdefault("out", str(Path(out_dir) / doc_id))
+        if glossary_path and not job.get("glossary"):
+            job["glossary"] = glossary_path
+    safe_mkdir(out_dir)
+
+    if workers <= 1:
+        _init_batch_worker()
+        rows = [_run_job(job, cfg) for job in jobs]
+    else:
+        # documents are the unit of parallelism; no nested alignment pools
+        cfg = replace(cfg, align_workers=1)
+        chunksize = max(1, len(jobs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as ex:
+            rows = list(ex.map(_run_job, jobs, [cfg] * len(jobs), chunksize=chunksize))
+
+    summary_csv = str(Path(out_dir) / "batch_summary.csv")
+    summary_json = str(Path(out_dir) / "batch_summary.json")
+    with open(summary_csv, "w", encoding="utf-8-sig", newline="") as fh:
+        w = csv.DictWriter(fh, fieldnames=SUMMARY_FIELDS, lineterminator="\n")
+        w.writeheader()
+        w.writerows(rows)
+
+    totals = {
+        "documents": len(rows),
+        "failed": sum(r["status"] != "ok" for r in rows),
+        "flags": sum(r["flags"] or 0 for r in rows),
+        "elapsed": round(sum(r["elapsed"] for r in rows), 4),
+    }
+    Path(summary_json).write_text(
+        json.dumps({"totals": totals, "documents": rows}, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return {"rows": rows, "totals": totals, "summary_csv": summary_csv, "summary_json": summary_json}
@@ -1,26 +1,235 @@
 import argparse
-from termguard.pipeline import run_pipeline_from_files
+import sys
+from typing import List, Optional
 
-def main():
-    p = argparse.ArgumentParser(description="TermGuard: terminology consistency checker (EN->ZH)")
+from termguard.config import TermGuardConfig
+
+
+def _width(value: str) -> int:
+    width = int(value)
+    if width < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {width}")
+    return width
+
+
+def _run_main(argv: List[str]) -> None:
+    p = argparse.ArgumentParser(description="TermGuard: terminology consistency checker (EN->ZH)",
+                                epilog="Other commands: termguard {batch,serve,glossary,merge,watch} --help")
     p.add_argument("--en", required=True, help="Path to English text file")
     p.add_argument("--zh", required=True, help="Path to Chinese translation text file")
-    p.add_argument("--glossary", default=None, help="Optional glossary CSV with columns en_term,zh_term")
+    p.add_argument("--glossary", default=None, help="Optional glossary CSV (en_term,zh_term) or compiled glossary")
     p.add_argument("--out", default="outputs/run", help="Output directory")
-    args = p.parse_args()
+    p.add_argument("--workers", type=int, default=1, help="Worker processes for term alignment (default: 1)")
+    p.add_argument("--approx", type=_width, default=None, metavar="WIDTH",
+                   help="Approximate candidate counting: Space-Saving summary of WIDTH grams per term")
+    p.add_argument("--zh-segmentation", choices=["jieba", "glossary", "anchored"], default="jieba",
+                   help="glossary: glossary ZH terms are single tokens; anchored: also keep candidates near them")
+    p.add_argument("--feature-cache", default=None, help="Optional SQLite file caching ZH segmentation across runs")
+    p.add_argument("--trace", action="store_true", help="Write per-stage stats and a Chrome trace to the output directory")
+    p.add_argument("--trace-memory", action="store_true", help="Record tracemalloc peak memory per stage")
+    p.add_argument("--stream", action="store_true",
+                   help="Read sentences lazily from memory-mapped inputs and count them in bounded batches, "
+                        "overlapping reading, ZH segmentation and counting (not with --feature-cache)")
+    p.add_argument("--pipelined", action="store_true", help="Same as --stream")
+    p.add_argument("--report-format", default="csv,json",
+                   help="Comma list of csv,json,jsonl,parquet,arrow (default: csv,json)")
+    p.add_argument("--compress", choices=["gzip", "zstd"], default=None, help="Compress report files")
+    p.add_argument("--stats", action="store_true", help="Also write term_stats.json.gz for `termguard merge`")
+    p.add_argument("--patch-log", action="store_true",
+                   help="Also write zh_patch_log.jsonl with the offsets of every replacement")
+    args = p.parse_args(argv)
+
+    # heavy dependencies load only once there is work to do, keeping --help fast
+    from termguard.pipeline import run_pipeline_from_files
 
     result = run_pipeline_from_files(
         en_path=args.en,
         zh_path=args.zh,
         glossary_path=args.glossary,
-        out_dir=args.out
+        out_dir=args.out,
+        config=TermGuardConfig(
+            align_workers=args.workers,
+            align_engine="approx" if args.approx is not None else "counter",
+            approx_width=args.approx if args.approx is not None else 1024,
+            zh_segmentation=args.zh_segmentation,
+            feature_cache_path=args.feature_cache,
+            write_trace=args.trace,
+            trace_memory=args.trace_memory,
+            stream_input=args.stream or args.pipelined,
+            execution="pipelined" if args.pipelined else "staged",
+            report_formats=tuple(f.strip() for f in args.report_format.split(",") if f.strip()),
+            report_compression=args.compress,
+            write_stats=args.stats,
+            write_patch_log=args.patch_log,
+        )
     )
 
     print("\n✅ TermGuard finished.")
-    print(f"- Report CSV : {result['report_csv']}")
-    print(f"- Report JSON: {result['report_json']}")
+    for fmt, path in result["report_paths"].items():
+        print(f"- Report {fmt.upper():<4}: {path}")
     print(f"- Patched ZH : {result['patched_path']}")
+    if result["patch_log_path"] is not None:
+        print(f"- Patch log  : {result['patch_log_path']}")
     print(f"- Flags      : {len(result['flags'])}")
+    if result["feature_cache"] is not None:
+        print(f"- Cache hits : {result['feature_cache']['hit_rate']:.1%}")
+    if result["trace_paths"] is not None:
+        print(f"- Trace      : {result['trace_paths'][1]}")
+    if result["stats_path"] is not None:
+        print(f"- Term stats : {result['stats_path']}")
+
+
+def _batch_main(argv: List[str]) -> None:
+    p = argparse.ArgumentParser(prog="termguard batch", description="Check many EN/ZH document pairs in one process pool")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--manifest", help="CSV or JSONL with columns en,zh[,glossary,out,id]")
+    src.add_argument("--dir", help="Directory of <name><en-suffix> / <name><zh-suffix> pairs")
+    p.add_argument("--en-suffix", default=".en.txt", help="EN file suffix for --dir (default: .en.txt)")
+    p.add_argument("--zh-suffix", default=".zh.txt", help="ZH file suffix for --dir (default: .zh.txt)")
+    p.add_argument("--glossary", default=None, help="Glossary CSV for documents without their own")
+    p.add_argument("--out", default="outputs/batch", help="Output directory for summaries and per-document reports")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    p.add_argument("--stats", action="store_true", help="Write term_stats.json.gz per document for `termguard merge`")
+    args = p.parse_args(argv)
+
+    from termguard.batch import load_manifest, pair_directory, run_batch
+
+    jobs = load_manifest(args.manifest) if args.manifest else pair_directory(args.dir, args.en_suffix, args.zh_suffix)
+    result = run_batch(jobs, out_dir=args.out, config=TermGuardConfig(write_stats=args.stats),
+                       workers=args.workers, glossary_path=args.glossary)
+
+    totals = result["totals"]
+    print("\n✅ TermGuard batch finished.")
+    print(f"- Documents  : {totals['documents']} ({totals['failed']} failed)")
+    print(f"- Flags      : {totals['flags']}")
+    print(f"- Summary CSV: {result['summary_csv']}")
+
+
+def _serve_main(argv: List[str]) -> None:
+    p = argparse.ArgumentParser(prog="termguard serve", description="Serve TermGuard checks over local HTTP/JSON")
+    p.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    p.add_argument("--glossary", default=None, help="Glossary CSV kept in memory for requests without their own")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes running checks (default: 1)")
+    args = p.parse_args(argv)
+
+    from termguard.server import serve
+
+    glossary = {}
+    if args.glossary:
+        from termguard.glossary import load_glossary
+        glossary = load_glossary(args.glossary)
+
+    print(f"TermGuard serving on http://{args.host}:{args.port} (POST /check, GET /health)")
+    serve(args.host, args.port, glossary=glossary, workers=args.workers)
+
+
+def _glossary_main(argv: List[str]) -> None:
+    p = argparse.ArgumentParser(prog="termguard glossary", description="Glossary tools")
+    sub = p.add_subparsers(dest="action", required=True)
+    c = sub.add_parser("compile", help="Compile a glossary CSV into a memory-mappable artifact")
+    c.add_argument("csv", help="Glossary CSV with columns en_term,zh_term")
+    c.add_argument("-o", "--out", required=True, help="Artifact path (e.g. glossary.tgg)")
+    args = p.parse_args(argv)
+
+    from termguard.glossary import compile_glossary
+    from termguard.pipeline import load_glossary_csv
+    from termguard.utils import Timer
+
+    with Timer() as t:
+        glossary = load_glossary_csv(args.csv)
+        compile_glossary(glossary, args.out)
+    print(f"Compiled {len(glossary)} terms -> {args.out} ({t.elapsed:.2f}s)")
+
+
+def _merge_main(argv: List[str]) -> None:
+    p = argparse.ArgumentParser(prog="termguard merge",
+                                description="Corpus-level consistency from per-document term_stats.json.gz files",
+                                epilog="Each document only counts the terms it aligned. Terms extracted from some "
+                                       "documents but not others are undercounted and reported with a warning; "
+                                       "give every document the same term list (e.g. a glossary) to avoid that.")
+    p.add_argument("stats", nargs="+", help="Stats files, in document order")
+    p.add_argument("--glossary", default=None, help="Glossary CSV or compiled glossary")
+    p.add_argument("--out", default="outputs/merge", help="Output directory")
+    p.add_argument("--report-format", default="csv,json",
+                   help="Comma list of csv,json,jsonl,parquet,arrow (default: csv,json)")
+    p.add_argument("--compress", choices=["gzip", "zstd"], default=None, help="Compress report files")
+    args = p.parse_args(argv)
+
+    from termguard.pipeline import run_merge
+
+    result = run_merge(
+        args.stats,
+        glossary_path=args.glossary,
+        out_dir=args.out,
+        config=TermGuardConfig(
+            report_formats=tuple(f.strip() for f in args.report_format.split(",") if f.strip()),
+            report_compression=args.compress,
+        )
+    )
+
+    print("\n✅ TermGuard merge finished.")
+    print(f"- Documents  : {result['documents']} ({result['aligned_pairs']} sentence pairs)")
+    if result["partial_terms"]:
+        print(f"- Partial    : {len(result['partial_terms'])} terms missing from some documents (undercounted)")
+    for fmt, path in result["report_paths"].items():
+        print(f"- Report {fmt.upper():<4}: {path}")
+    print(f"- Flags      : {len(result['flags'])}")
+    print(f"- Term stats : {result['stats_path']}")
+
+
+def _watch_main(argv: List[str]) -> None:
+    p = argparse.ArgumentParser(prog="termguard watch",
+                                description="Re-check a file pair on every save, updating only what changed")
+    p.add_argument("--en", required=True, help="Path to English text file")
+    p.add_argument("--zh", required=True, help="Path to Chinese translation text file")
+    p.add_argument("--glossary", default=None, help="Optional glossary CSV (en_term,zh_term) or compiled glossary")
+    p.add_argument("--out", default="outputs/watch", help="Output directory (reports rewritten on every change)")
+    p.add_argument("--interval", type=float, default=0.5, help="Seconds between file checks (default: 0.5)")
+    p.add_argument("--report-format", default="csv,json",
+                   help="Comma list of csv,json,jsonl,parquet,arrow (default: csv,json)")
+    args = p.parse_args(argv)
+
+    from termguard.watch import watch
+
+    def on_update(result) -> None:
+        for term in result["new_flags"]:
+            print(f"  + flagged : {term}")
+        for term in result["resolved_flags"]:
+            print(f"  - resolved: {term}")
+
+    print(f"Watching {args.en} + {args.zh} (Ctrl-C to stop)")
+    try:
+        watch(
+            args.en, args.zh,
+            glossary_path=args.glossary,
+            out_dir=args.out,
+            config=TermGuardConfig(
+                report_formats=tuple(f.strip() for f in args.report_format.split(",") if f.strip()),
+            ),
+            interval=args.interval,
+            on_update=on_update,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+COMMANDS = {
+    "batch": _batch_main,
+    "serve": _serve_main,
+    "glossary": _glossary_main,
+    "merge": _merge_main,
+    "watch": _watch_main,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+    else:
+        _run_main(argv)
+
 
 if __name__ == "__main__":
     main()
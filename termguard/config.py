@@ -1,17 +1,40 @@
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 
 @dataclass(frozen=True)
 class TermGuardConfig:
+    # Input
+    stream_input: bool = False  # run_pipeline_from_files reads memory-mapped files through the bounded "pipelined" path
+
+    # Execution
+    execution: str = "staged"  # "staged" | "pipelined" (file runs: reader -> segmenter -> counter over bounded queues; no "sparse" engine or feature cache)
+    pipeline_queue_size: int = 8  # batches waiting between two pipelined stages
+    pipeline_batch_size: int = 256  # sentence pairs per batch
+
+    # Sentence alignment
+    sentence_aligner: str = "index"  # "index" (pair by position) | "length" (Gale-Church banded DP)
+    aligner_band: int = 16
+
     # Term extraction
     ngram_min: int = 1
     ngram_max: int = 3
     top_k_terms: int = 30
     min_term_chars: int = 3
+    term_extraction: str = "tfidf"  # "tfidf" | "streaming" (hashed, bounded memory)
+    extraction_memory_mb: int = 64  # hash table budget for streaming extraction
+    extraction_chunk_size: int = 10000
 
     # Alignment
+    zh_segmentation: str = "jieba"  # "jieba" | "glossary" (glossary ZH terms are single tokens) | "anchored" (and candidates stay near them)
+    zh_anchor_window: int = 2  # "anchored": tokens either side of a glossary token that candidates may span
     zh_ngram_max: int = 4
     max_zh_candidates_per_en_term: int = 5
+    align_engine: str = "counter"  # "counter" | "sparse" (scipy co-occurrence product) | "approx" (Space-Saving)
+    approx_width: int = 1024  # grams tracked per term by the "approx" engine; overestimate <= term total / width
+    align_workers: int = 1  # >1 shards ZH segmentation across a process pool
+    feature_cache_path: Optional[str] = None  # SQLite file reused across runs
+    feature_cache_max_entries: int = 1_000_000
 
     # Consistency
     min_total_occurrences: int = 2
@@ -19,3 +42,18 @@ class TermGuardConfig:
 
     # Patching
     enable_patching: bool = True
+    patch_chunk_chars: int = 1 << 20  # streamed runs patch the ZH file in chunks of this many characters
+    write_patch_log: bool = False  # zh_patch_log.jsonl: character offsets of every replacement
+
+    # Reports
+    report_formats: Tuple[str, ...] = ("csv", "json")  # also "jsonl", "parquet", "arrow"
+    report_compression: Optional[str] = None  # None | "gzip" | "zstd"
+    write_stats: bool = False  # term_stats.json.gz: mergeable per-term counts (termguard merge)
+
+    # Instrumentation
+    trace_memory: bool = False  # tracemalloc peak per stage (slows the run)
+    write_trace: bool = False  # stage_stats.json + trace_events.json (Chrome trace format)
+
+    def __post_init__(self) -> None:
+        if self.approx_width < 1:
+            raise ValueError(f"approx_width must be >= 1, got {self.approx_width}")
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import logging
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from .config import TermGuardConfig
+from .glossary import CompiledGlossary, GlossaryMatcher, load_glossary
+from .instrument import Instrumentation
+from .logger import log_to_file
+from .pipeline import _write_outputs, check_texts
+from .segmentation import ZhSegmenter
+from .utils import safe_mkdir
+
+
+class TermGuardEngine:
+    """
+    Reusable checker for embedding TermGuard in a service.
+
+    Built once from a glossary and config: the jieba dictionary (or the
+    glossary-aware tokenizer) is loaded and the glossary presence matcher
+    is compiled up front, then shared by every `check`. Checks run fully in
+    memory and write nothing unless given an `out_dir`; per-call state
+    (instrumentation, gram tables, the run log file) is private to the
+    call, so one engine can serve many threads at once.
+    """
+
+    def __init__(
+        self,
+        glossary: Optional[Mapping[str, str]] = None,
+        config: Optional[TermGuardConfig] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.config = config or TermGuardConfig()
+        self.glossary = glossary if isinstance(glossary, CompiledGlossary) else dict(glossary or {})
+        self.logger = logger or logging.getLogger("termguard")
+        cfg = self.config
+        self.segmenter = ZhSegmenter.for_glossary(cfg.zh_segmentation, self.glossary, cfg.zh_anchor_window)
+        self.glossary_matcher: Optional[GlossaryMatcher] = None
+        if isinstance(self.glossary, CompiledGlossary):
+            self.glossary.matcher  # builds the compiled glossary's word sets here, not in the first check
+        elif self.glossary:
+            self.glossary_matcher = GlossaryMatcher.from_terms(list(self.glossary))
+        self.segmenter.tokenize("预热")  # loads the dictionary now, not in the first check
+
+    @classmethod
+    def from_files(
+        cls,
+        glossary_path: Optional[str] = None,
+        config: Optional[TermGuardConfig] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> "TermGuardEngine":
+        """Engine for a glossary CSV or compiled glossary on disk."""
+        return cls(load_glossary(glossary_path) if glossary_path else {}, config, logger)
+
+    def check(
+        self,
+        en_text: str,
+        zh_text: str,
+        out_dir: Optional[str] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> Dict[str, Any]:
+        """
+        Flags, mappings and the patched ZH text of one EN/ZH pair, as
+        `pipeline.check_texts` returns them. With `out_dir`, the usual
+        output files are written there as well (config.report_formats etc.)
+        together with a termguard.log of this call only, and the result
+        gains their paths ("report_paths", "patched_path", ...).
+        """
+        cfg = self.config
+        inst = instrumentation or Instrumentation(trace_memory=cfg.trace_memory)
+        if out_dir is None:
+            return self._check(en_text, zh_text, inst)
+
+        safe_mkdir(out_dir)
+        with log_to_file(str(Path(out_dir) / "termguard.log"), name=self.logger.name):
+            result = self._check(en_text, zh_text, inst)
+            written = _write_outputs(result, out_dir, cfg, inst, self.logger)
+        return {**result, **written}
+
+    def _check(self, en_text: str, zh_text: str, inst: Instrumentation) -> Dict[str, Any]:
+        return check_texts(
+            en_text, zh_text, glossary=self.glossary, config=self.config, logger=self.logger,
+            instrumentation=inst, segmenter=self.segmenter, glossary_matcher=self.glossary_matcher
+        )
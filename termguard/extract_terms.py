@@ -1,10 +1,9 @@
+import heapq
 import re
-from typing import List, Tuple
+import zlib
+from typing import Dict, Iterable, Iterator, List, Tuple
 from collections import Counter
 
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-
 _EN_WORD = re.compile(r"[a-zA-Z][a-zA-Z0-9\-']*")
 
 
@@ -31,6 +30,9 @@ def extract_en_terms(sentences: List[str], top_k: int = 30, ngram_min: int = 1,
     if not sentences:
         return []
 
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     # Prepare corpus
     corpus = [" ".join(_tokenize_en(s)) for s in sentences]
     corpus = [c for c in corpus if c.strip()]
@@ -74,3 +76,118 @@ def extract_en_terms(sentences: List[str], top_k: int = 30, ngram_min: int = 1,
 
     boosted.sort(key=lambda x: x[1], reverse=True)
     return boosted[:top_k]
+
+
+# sklearn's default word token pattern, so streaming features match TfidfVectorizer's
+_SK_TOKEN = re.compile(r"(?u)\b\w+\b")
+
+# bytes held per hash bucket: df + unigram count (int32) and idf, boost, score (float64)
+_BYTES_PER_BUCKET = 4 + 4 + 8 + 8 + 8
+
+
+def _doc_ngrams(doc: str, ngram_min: int, ngram_max: int) -> Iterator[Tuple[int, str]]:
+    toks = _SK_TOKEN.findall(doc)
+    for n in range(ngram_min, ngram_max + 1):
+        for i in range(len(toks) - n + 1):
+            yield n, " ".join(toks[i:i + n])
+
+
+def _is_term_candidate(t: str, min_chars: int) -> bool:
+    return len(t) >= min_chars and not all(p in STOPWORDS for p in t.split())
+
+
+def extract_en_terms_streaming(sentences: Iterable[str], top_k: int = 30, ngram_min: int = 1,
+                               ngram_max: int = 3, min_chars: int = 3, memory_mb: int = 64,
+                               chunk_size: int = 10000) -> List[Tuple[str, float]]:
+    """
+    Bounded-memory variant of `extract_en_terms` for very large corpora.
+
+    N-grams are hashed (crc32) into a fixed number of buckets sized from
+    `memory_mb`, so memory does not grow with the vocabulary. Three chunked
+    passes over `sentences` (which must be re-iterable, e.g. a list):
+    1) document frequencies and unigram counts, 2) l2-normalized TF-IDF
+    mass per bucket with the unigram frequency boost, 3) recovering n-gram
+    strings for the best buckets only. Without hash collisions the scores
+    equal the TfidfVectorizer ones; collisions can only merge n-grams.
+    """
+    if iter(sentences) is sentences:
+        raise TypeError("extract_en_terms_streaming needs a re-iterable corpus, not a one-shot iterator")
+
+    import numpy as np
+
+    n_buckets = max(1024, memory_mb * 1024 * 1024 // _BYTES_PER_BUCKET)
+
+    def bucket(s: str) -> int:
+        return zlib.crc32(s.encode("utf-8")) % n_buckets
+
+    def chunks() -> Iterator[List[str]]:
+        batch: List[str] = []
+        for s in sentences:
+            c = " ".join(_tokenize_en(s))
+            if c.strip():
+                batch.append(c)
+                if len(batch) >= chunk_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    # Pass 1: document frequencies + whitespace-token counts (for the unigram boost)
+    df = np.zeros(n_buckets, dtype=np.int32)
+    uni = np.zeros(n_buckets, dtype=np.int32)
+    n_docs = 0
+    for chunk in chunks():
+        n_docs += len(chunk)
+        hs: List[int] = []
+        us: List[int] = []
+        for doc in chunk:
+            us.extend(bucket(t) for t in doc.split())
+            hs.extend({bucket(g) for _, g in _doc_ngrams(doc, ngram_min, ngram_max)})
+        np.add.at(df, hs, 1)
+        np.add.at(uni, us, 1)
+    if n_docs == 0:
+        return []
+
+    # smooth_idf=True, as in TfidfVectorizer
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    boost = 1.0 + np.minimum(1.5, 0.1 * uni)
+    del df, uni
+    score = np.zeros(n_buckets, dtype=np.float64)
+
+    # Pass 2: per-document l2-normalized tf-idf, summed per bucket
+    for chunk in chunks():
+        doc_ids: List[int] = []
+        hs = []
+        kinds: List[int] = []  # 0 = filtered out, 1 = multiword, 2 = unigram (boosted)
+        for d, doc in enumerate(chunk):
+            for n, g in _doc_ngrams(doc, ngram_min, ngram_max):
+                doc_ids.append(d)
+                hs.append(bucket(g))
+                kinds.append(0 if not _is_term_candidate(g, min_chars) else (2 if " " not in g else 1))
+        if not hs:
+            continue
+        keys = np.asarray(doc_ids, dtype=np.int64) * n_buckets + np.asarray(hs, dtype=np.int64)
+        uniq, first, tf = np.unique(keys, return_index=True, return_counts=True)
+        d_u, h_u = uniq // n_buckets, uniq % n_buckets
+        w = tf * idf[h_u]
+        norm = np.sqrt(np.bincount(d_u, weights=w * w, minlength=len(chunk)))
+        kind = np.asarray(kinds, dtype=np.int8)[first]
+        factor = np.where(kind == 2, boost[h_u], kind.astype(np.float64))
+        np.add.at(score, h_u, w / norm[d_u] * factor)
+
+    # Pass 3: name the best buckets (oversampled so collisions cannot starve the top-k)
+    k = min(n_buckets, max(1, top_k) * 4)
+    best = np.argpartition(-score, k - 1)[:k] if k < n_buckets else np.arange(n_buckets)
+    wanted = {int(b) for b in best if score[b] > 0}
+    names: Dict[int, str] = {}
+    for chunk in chunks():
+        for doc in chunk:
+            for _, g in _doc_ngrams(doc, ngram_min, ngram_max):
+                b = bucket(g)
+                if b in wanted and b not in names and _is_term_candidate(g, min_chars):
+                    names[b] = g
+        if len(names) == len(wanted):
+            break
+
+    top = heapq.nsmallest(top_k, ((-float(score[b]), t) for b, t in names.items()))
+    return [(t, -neg) for neg, t in top]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# bump when segmentation or candidate filtering changes, so stale rows never match
+CACHE_VERSION = 1
+
+_BATCH = 500
+
+
+def sentence_key(zh_sentence: str, zh_ngram_max: int, segmentation: str = "") -> str:
+    # `segmentation` is ZhSegmenter.key, empty for plain jieba
+    h = hashlib.blake2b(digest_size=16)
+    prefix = f"{segmentation}\0" if segmentation else ""
+    h.update(f"{prefix}{CACHE_VERSION}\0{zh_ngram_max}\0{zh_sentence}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class ZhFeatureCache:
+    """
+    On-disk, content-addressed cache of per-sentence ZH candidate counts.
+
+    Rows are keyed by a hash of the sentence text and `zh_ngram_max`. The
+    SQLite file runs in WAL mode so several processes can read it while one
+    writes; once it holds more than `max_entries` rows the least recently used
+    ones are evicted. Counts keep their first-occurrence order, which
+    alignment relies on for tie-breaking.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS zh_features ("
+            "key TEXT PRIMARY KEY, grams TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS zh_features_lru ON zh_features(last_used)")
+        self._conn.commit()
+        self._touched: List[str] = []
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Counter]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Counter] = {}
+        for k in range(0, len(keys), _BATCH):
+            batch = keys[k:k + _BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, grams FROM zh_features WHERE key IN ({marks})", batch
+            ).fetchall()
+            for key, grams in rows:
+                found[key] = Counter(dict(json.loads(grams)))
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        self._touched.extend(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Counter]]) -> None:
+        now = time.time()
+        rows = [(key, json.dumps(list(feats.items()), ensure_ascii=False), now) for key, feats in items]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO zh_features (key, grams, last_used) VALUES (?, ?, ?)", rows
+            )
+            self._conn.executemany(
+                "UPDATE zh_features SET last_used = ? WHERE key = ?", [(now, k) for k in self._touched]
+            )
+            self._touched = []
+            self._evict()
+
+    def _evict(self) -> None:
+        (n,) = self._conn.execute("SELECT COUNT(*) FROM zh_features").fetchone()
+        if n > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM zh_features WHERE key IN "
+                "(SELECT key FROM zh_features ORDER BY last_used LIMIT ?)",
+                (n - self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._touched:
+            self.put_many([])
+        self._conn.close()
+
+    def __enter__(self) -> "ZhFeatureCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
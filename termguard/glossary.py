@@ -0,0 +1,390 @@
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import re
+import struct
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"TGGLOSS\0"
+# bump when the layout or the term hashing changes; older artifacts are refused
+GLOSSARY_VERSION = 1
+
+_TOKEN = re.compile(r"(\w+)")
+_SIMPLE_TERM = re.compile(r"[a-z0-9]+(?: [a-z0-9]+)*")
+_PRIME = 1099511628211
+_MASK = (1 << 64) - 1
+_SCAN_CHUNK = 1 << 20  # characters of EN text tokenized at a time
+_ALIGN = 8
+
+
+def _token_hash(tok: str) -> int:
+    return int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _key_hash(en_term: str) -> int:
+    return _token_hash("\0" + en_term)
+
+
+def _term_key(term_lower: str) -> Optional[List[str]]:
+    """Words of a plain multi-word term, or None if it needs a substring check."""
+    if " " not in term_lower or not _SIMPLE_TERM.fullmatch(term_lower):
+        return None
+    return term_lower.split(" ")
+
+
+def _rolling_hash(words: Sequence[str]) -> int:
+    h = 0
+    for w in words:
+        h = (h * _PRIME + _token_hash(w)) & _MASK
+    return h
+
+
+def _text_chunks(texts: Iterable[str]) -> Iterator[str]:
+    """
+    Regroup `texts` into pieces of about _SCAN_CHUNK characters, cut at
+    newlines and joined with newlines; terms never span a line break.
+    """
+    buf: List[str] = []
+    size = 0
+    for text in texts:
+        start = 0
+        while start < len(text):
+            end = text.find("\n", start + _SCAN_CHUNK)
+            end = len(text) if end < 0 else end
+            buf.append(text[start:end])
+            size += end - start
+            start = end + 1
+            if size >= _SCAN_CHUNK:
+                yield "\n".join(buf)
+                buf, size = [], 0
+    if buf:
+        yield "\n".join(buf)
+
+
+class GlossaryMatcher:
+    """
+    Multi-pattern matcher for the multi-word glossary terms (the ones the
+    pipeline aligns): finds every term that occurs in a text, case-insensitive
+    substring semantics, in one pass over the text.
+
+    A plain term "w1 w2 ... wk" occurs exactly when k text tokens are joined by
+    single spaces, the middle ones equal w2..w(k-1), the first one ends with w1
+    and the last one starts with wk. Terms are stored as sorted 64-bit rolling
+    hashes of their words; the text is tokenized once, each distinct token is
+    expanded into the first/last words it can stand for, and all token-window
+    hashes are looked up with numpy. Terms with other characters (hyphens,
+    symbols, non-ASCII) get a plain substring check.
+    """
+
+    def __init__(self, hashes: "np.ndarray", term_ids: "np.ndarray", lengths: Sequence[int],
+                 first_words: Iterable[str], last_words: Iterable[str],
+                 fallback: Sequence[Tuple[int, str]]):
+        self.hashes = hashes
+        self.term_ids = term_ids
+        self.lengths = sorted(set(lengths))
+        self.first_words = set(first_words)
+        self.last_words = set(last_words)
+        self.fallback = list(fallback)
+
+    @classmethod
+    def from_terms(cls, terms: Sequence[str]) -> "GlossaryMatcher":
+        import numpy as np
+
+        keyed: List[Tuple[int, int]] = []
+        lengths, first, last = set(), set(), set()
+        fallback: List[Tuple[int, str]] = []
+        for i, t in enumerate(terms):
+            words = _term_key(t.lower())
+            if words is not None:
+                lengths.add(len(words))
+                first.add(words[0])
+                last.add(words[-1])
+                keyed.append((_rolling_hash(words), i))
+            elif " " in t:
+                fallback.append((i, t.lower()))
+        keyed.sort()
+        hashes = np.fromiter((h for h, _ in keyed), dtype=np.uint64, count=len(keyed))
+        ids = np.fromiter((i for _, i in keyed), dtype=np.int32, count=len(keyed))
+        return cls(hashes, ids, lengths, first, last, fallback)
+
+    def find(self, texts: Iterable[str]) -> List[int]:
+        """Sorted ids of the terms occurring in any of `texts`; consumes `texts` once."""
+        found: set = set()
+        vocab = _TokenVocab(self.first_words, self.last_words)
+        pending = list(self.fallback)
+        for chunk in _text_chunks(texts):
+            chunk = chunk.lower()
+            if self.lengths:
+                found.update(self._find_chunk(chunk, vocab))
+            if pending:
+                hits = [i for i, term_lower in pending if term_lower in chunk]
+                if hits:
+                    found.update(hits)
+                    pending = [(i, t) for i, t in pending if t not in chunk]
+        return sorted(found)
+
+    def _find_chunk(self, chunk: str, vocab: "_TokenVocab") -> List[int]:
+        import numpy as np
+
+        parts = _TOKEN.split(chunk)
+        toks = parts[1::2]
+        m = len(toks)
+        if m < 2:
+            return []
+        ids = vocab.ids(toks)
+        if not vocab.head_width or not vocab.tail_width:
+            return []
+        h, heads, head_ok, tails, tail_ok = vocab.arrays()
+        h = h[ids]
+        heads, head_ok, tails, tail_ok = heads[ids], head_ok[ids], tails[ids], tail_ok[ids]
+        spaced = np.fromiter((s == " " for s in parts[2:-1:2]), dtype=bool, count=m - 1)
+
+        found: List[int] = []
+        prime = np.uint64(_PRIME)
+        mid = np.zeros(m - 1, dtype=np.uint64)  # rolling hash of the exact middle tokens
+        ok = spaced
+        for n in range(2, self.lengths[-1] + 1):
+            size = m - n + 1
+            if size <= 0:
+                break
+            if n > 2:
+                mid = mid[:size] * prime + h[n - 2:n - 2 + size]
+                ok = ok[:size] & spaced[n - 2:n - 2 + size]
+            if n not in self.lengths:
+                continue
+            scale = np.uint64(pow(_PRIME, n - 1, 1 << 64))
+            grams = heads[:size, :, None] * scale + (mid * prime)[:, None, None] + tails[n - 1:, None, :]
+            valid = head_ok[:size, :, None] & tail_ok[n - 1:, None, :] & ok[:, None, None]
+            found.extend(self._lookup(np.unique(grams[valid])))
+        return found
+
+    def _lookup(self, grams: "np.ndarray") -> List[int]:
+        import numpy as np
+
+        lo = np.searchsorted(self.hashes, grams, side="left")
+        hi = np.searchsorted(self.hashes, grams, side="right")
+        hit = hi > lo
+        return [int(i) for a, b in zip(lo[hit].tolist(), hi[hit].tolist()) for i in self.term_ids[a:b]]
+
+
+class _TokenVocab:
+    """
+    Distinct lowercased text tokens seen during one scan, each with its own
+    hash and the hashes of the glossary first words it ends with and last
+    words it starts with, kept as arrays indexed by token id.
+    """
+
+    def __init__(self, first_words: set, last_words: set):
+        self.first_words = first_words
+        self.last_words = last_words
+        self._ids: Dict[str, int] = {}
+        self._hash: List[int] = []
+        self._heads: List[List[int]] = []
+        self._tails: List[List[int]] = []
+        self.head_width = self.tail_width = 0
+        self._arrays = None
+
+    def ids(self, toks: List[str]) -> "np.ndarray":
+        import numpy as np
+
+        first, last = self.first_words, self.last_words
+        for v in set(toks).difference(self._ids):
+            self._ids[v] = len(self._hash)
+            self._hash.append(_token_hash(v))
+            heads = [_token_hash(v[k:]) for k in range(len(v)) if v[k:] in first]
+            tails = [_token_hash(v[:k]) for k in range(1, len(v) + 1) if v[:k] in last]
+            self._heads.append(heads)
+            self._tails.append(tails)
+            self.head_width = max(self.head_width, len(heads))
+            self.tail_width = max(self.tail_width, len(tails))
+            self._arrays = None
+        return np.fromiter(map(self._ids.__getitem__, toks), dtype=np.int64, count=len(toks))
+
+    def arrays(self):
+        import numpy as np
+
+        if self._arrays is None:
+            def matrix(rows: List[List[int]], width: int):
+                mat = np.zeros((len(rows), width), dtype=np.uint64)
+                ok = np.zeros((len(rows), width), dtype=bool)
+                for j, alts in enumerate(rows):
+                    if alts:
+                        mat[j, :len(alts)] = alts
+                        ok[j, :len(alts)] = True
+                return mat, ok
+
+            self._arrays = (np.array(self._hash, dtype=np.uint64),
+                            *matrix(self._heads, self.head_width), *matrix(self._tails, self.tail_width))
+        return self._arrays
+
+
+class CompiledGlossary(Mapping):
+    """
+    Read-only glossary (en_term -> zh_term) backed by a memory-mapped artifact
+    written by `compile_glossary`.
+
+    Opening only maps the file and wraps its arrays, so it takes milliseconds
+    for any size; strings are decoded on access. Worker processes that open
+    the same file share its pages, and pickling reopens by path.
+    """
+
+    def __init__(self, path: str):
+        import numpy as np
+
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a compiled TermGuard glossary")
+        (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(self._mm[start:start + header_len]))
+        if header["version"] != GLOSSARY_VERSION:
+            raise ValueError(
+                f"{path} has glossary format version {header['version']}, expected {GLOSSARY_VERSION}; recompile it"
+            )
+        self._n = header["n_terms"]
+        self._a = {
+            name: np.frombuffer(self._mm, dtype=dtype, count=count, offset=offset)
+            for name, (dtype, offset, count) in header["arrays"].items()
+        }
+        self._lengths = header["lengths"]
+        self._matcher: Optional[GlossaryMatcher] = None
+
+    @property
+    def matcher(self) -> GlossaryMatcher:
+        # the hash tables are views into the map; only the word sets are built, on first use
+        if self._matcher is None:
+            self._matcher = GlossaryMatcher(
+                self._a["ngram_hash"], self._a["ngram_ids"], self._lengths,
+                self._strings("first"), self._strings("last"),
+                [(i, self.en_term(i).lower()) for i in self._a["fallback_ids"].tolist()],
+            )
+        return self._matcher
+
+    def _string(self, blob: str, i: int) -> str:
+        offs = self._a[blob + "_offsets"]
+        return bytes(self._a[blob][offs[i]:offs[i + 1]]).decode("utf-8")
+
+    def _strings(self, blob: str) -> Iterator[str]:
+        return (self._string(blob, i) for i in range(len(self._a[blob + "_offsets"]) - 1))
+
+    def en_term(self, i: int) -> str:
+        return self._string("en", i)
+
+    def zh_term(self, i: int) -> str:
+        return self._string("zh", i)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.en_term(i) for i in range(self._n))
+
+    def __getitem__(self, en_term: str) -> str:
+        import numpy as np
+
+        hashes = self._a["key_hash"]
+        h = np.uint64(_key_hash(en_term))
+        lo, hi = np.searchsorted(hashes, h, side="left"), np.searchsorted(hashes, h, side="right")
+        for i in self._a["key_ids"][lo:hi].tolist():
+            if self.en_term(i) == en_term:
+                return self.zh_term(i)
+        raise KeyError(en_term)
+
+    def present_terms(self, texts: Iterable[str]) -> List[str]:
+        """Multi-word glossary terms occurring in `texts`; single words are never returned."""
+        return [self.en_term(i) for i in self.matcher.find(texts)]
+
+    def __reduce__(self):
+        return (CompiledGlossary, (self.path,))
+
+
+def _blob(strings: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def compile_glossary(glossary: Dict[str, str], out_path: str) -> str:
+    """Write `glossary` as a versioned, memory-mappable artifact (see CompiledGlossary)."""
+    import numpy as np
+
+    terms = list(glossary)
+    matcher = GlossaryMatcher.from_terms(terms)
+    keys = sorted((_key_hash(t), i) for i, t in enumerate(terms))
+    en_offsets, en = _blob(terms)
+    zh_offsets, zh = _blob([glossary[t] for t in terms])
+    arrays = {
+        "en_offsets": en_offsets, "en": en,
+        "zh_offsets": zh_offsets, "zh": zh,
+        "key_hash": np.array([h for h, _ in keys], dtype=np.uint64),
+        "key_ids": np.array([i for _, i in keys], dtype=np.int32),
+        "ngram_hash": matcher.hashes,
+        "ngram_ids": matcher.term_ids,
+        "fallback_ids": np.array([i for i, _ in matcher.fallback], dtype=np.int32),
+    }
+    arrays["first_offsets"], arrays["first"] = _blob(sorted(matcher.first_words))
+    arrays["last_offsets"], arrays["last"] = _blob(sorted(matcher.last_words))
+
+    # lay arrays out after the header, each 8-byte aligned
+    def layout(header_len: int) -> Dict[str, List]:
+        pos = len(MAGIC) + 4 + header_len
+        table = {}
+        for name, a in arrays.items():
+            pos += -pos % _ALIGN
+            table[name] = [a.dtype.str, pos, len(a)]
+            pos += a.nbytes
+        return table
+
+    header = {"version": GLOSSARY_VERSION, "n_terms": len(terms), "lengths": matcher.lengths}
+    header_len = 0
+    while True:
+        header["arrays"] = layout(header_len)
+        raw = json.dumps(header).encode("utf-8")
+        if len(raw) <= header_len:
+            break
+        header_len = len(raw) + 64
+    raw = raw.ljust(header_len)
+
+    with open(out_path, "wb") as fh:
+        fh.write(MAGIC + struct.pack("<I", header_len) + raw)
+        for name, a in arrays.items():
+            fh.write(b"\0" * (header["arrays"][name][1] - fh.tell()))
+            fh.write(a.tobytes())
+    return out_path
+
+
+def load_glossary(path: str) -> Mapping:
+    """A compiled artifact (opened lazily) or a glossary CSV (parsed into a dict)."""
+    with open(path, "rb") as fh:
+        is_compiled = fh.read(len(MAGIC)) == MAGIC
+    if is_compiled:
+        return CompiledGlossary(path)
+    from .pipeline import load_glossary_csv
+
+    return load_glossary_csv(path)
+
+
+def find_present_terms(
+    glossary: Mapping, texts: Iterable[str], matcher: Optional[GlossaryMatcher] = None
+) -> List[str]:
+    """
+    Multi-word glossary terms occurring in `texts`, in glossary order, from
+    one scan; single-word terms are skipped, as the pipeline never aligns
+    them. `matcher` may be a prebuilt GlossaryMatcher.from_terms(list(glossary))
+    reused across calls.
+    """
+    if isinstance(glossary, CompiledGlossary):
+        return glossary.present_terms(texts)
+    terms = list(glossary)
+    matcher = matcher or GlossaryMatcher.from_terms(terms)
+    return [terms[i] for i in matcher.find(texts)]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+import heapq
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving summary (Metwally et al.) holding at most `width`
+    keys, plus any `pinned` keys, which are always counted exactly.
+
+    Let N be the total weight added for unpinned keys. Every reported count
+    is an overestimate by at most `error(key)` <= N / width, i.e.
+    true <= count <= true + N / width, and every key whose true count
+    exceeds N / width is in the summary. While no more than `width` distinct
+    keys have been seen nothing is evicted and all counts are exact.
+    Keys iterate in the order they (last) entered the summary.
+    """
+
+    def __init__(self, width: int, pinned: Iterable[Hashable] = ()):
+        if width < 1:
+            raise ValueError("width must be >= 1")
+        self.width = width
+        self.pinned = set(pinned)
+        self.total = 0
+        self.evictions = 0
+        self.counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        self._seq: Dict[Hashable, int] = {}
+        self._next = 0
+        self._monitored = 0
+        # (count, entry seq, key); stale entries are skipped lazily
+        self._heap: List[Tuple[int, int, Hashable]] = []
+
+    def add(self, key: Hashable, c: int = 1) -> None:
+        counts = self.counts
+        if key in self.pinned:
+            counts[key] = counts.get(key, 0) + c
+            return
+        self.total += c
+        if key in counts:
+            counts[key] += c
+        else:
+            err = 0
+            if self._monitored >= self.width:
+                err = self._evict()
+            else:
+                self._monitored += 1
+            counts[key] = err + c
+            self._errors[key] = err
+            self._seq[key] = self._next
+            self._next += 1
+        heapq.heappush(self._heap, (counts[key], self._seq[key], key))
+        if len(self._heap) > 4 * self.width:
+            self._compact_heap()
+
+    def _evict(self) -> int:
+        # pop the smallest live entry; ties go to the key monitored longest
+        while True:
+            count, seq, key = heapq.heappop(self._heap)
+            if self._seq.get(key) == seq and self.counts.get(key) == count:
+                break
+        del self.counts[key], self._errors[key], self._seq[key]
+        self.evictions += 1
+        return count
+
+    def _compact_heap(self) -> None:
+        self._heap = [(c, self._seq[k], k) for k, c in self.counts.items() if k not in self.pinned]
+        heapq.heapify(self._heap)
+
+    def error(self, key: Hashable) -> int:
+        """Maximum overestimate of `key`'s count (0 for pinned or never-evicted keys)."""
+        return self._errors.get(key, 0)
+
+    @property
+    def max_error(self) -> float:
+        """The N / width bound on every reported count's overestimate."""
+        return self.total / self.width if self.evictions else 0.0
+
+    def __len__(self) -> int:
+        return len(self.counts)
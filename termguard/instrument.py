@@ -0,0 +1,109 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageRecord:
+    name: str
+    start: float = 0.0  # seconds since the Instrumentation was created
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_mem_bytes: Optional[int] = None
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, key: str, n: int = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + int(n)
+
+
+class Instrumentation:
+    """
+    Per-run stage recorder: wall time, CPU time, optional tracemalloc peak
+    and free-form work counters for every stage.
+
+    `on_stage_start(name)` and `on_stage_end(record)` are called around each
+    stage for progress reporting. Records export as plain JSON or as Chrome
+    trace events (load in chrome://tracing or Perfetto).
+    """
+
+    def __init__(
+        self,
+        trace_memory: bool = False,
+        on_stage_start: Optional[Callable[[str], None]] = None,
+        on_stage_end: Optional[Callable[[StageRecord], None]] = None,
+    ):
+        self.trace_memory = trace_memory
+        self.on_stage_start = on_stage_start
+        self.on_stage_end = on_stage_end
+        self.records: List[StageRecord] = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        rec = StageRecord(name=name)
+        if self.on_stage_start is not None:
+            self.on_stage_start(name)
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        cpu0 = time.process_time()
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec.wall = time.perf_counter() - t0
+            rec.cpu = time.process_time() - cpu0
+            rec.start = t0 - self._origin
+            if self.trace_memory:
+                rec.peak_mem_bytes = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            self.records.append(rec)
+            if self.on_stage_end is not None:
+                self.on_stage_end(rec)
+
+    @property
+    def stage_times(self) -> Dict[str, float]:
+        return {r.name: r.wall for r in self.records}
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return [asdict(r) for r in self.records]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        pid, tid = os.getpid(), threading.get_ident()
+        events: List[Dict[str, Any]] = []
+        for r in self.records:
+            args: Dict[str, Any] = {"cpu_s": r.cpu, **r.counters}
+            if r.peak_mem_bytes is not None:
+                args["peak_mem_bytes"] = r.peak_mem_bytes
+            events.append({
+                "name": r.name, "cat": "termguard", "ph": "X",
+                "ts": r.start * 1e6, "dur": r.wall * 1e6,
+                "pid": pid, "tid": tid, "args": args,
+            })
+            if r.counters:
+                events.append({
+                    "name": f"{r.name} counters", "ph": "C",
+                    "ts": (r.start + r.wall) * 1e6, "pid": pid, "args": dict(r.counters),
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path: str) -> str:
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+    def write_chrome_trace(self, path: str) -> str:
+        Path(path).write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return path
@@ -1,24 +1,63 @@
 import logging
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
+
+_FORMAT = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+
+class _RunFileHandler(logging.FileHandler):
+    """File handler owned by one `log_to_file` block; get_logger leaves it alone."""
 
 
 def get_logger(name: str = "termguard", log_path: str | None = None) -> logging.Logger:
+    """
+    The `name` logger with one console handler and, if `log_path` is given,
+    one file handler writing there. A later call with a different
+    `log_path` moves the file handler instead of keeping the first one.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
-    if logger.handlers:
-        return logger
-
-    fmt = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-
-    sh = logging.StreamHandler()
-    sh.setFormatter(fmt)
-    logger.addHandler(sh)
+    if not any(type(h) is logging.StreamHandler for h in logger.handlers):
+        sh = logging.StreamHandler()
+        sh.setFormatter(_FORMAT)
+        logger.addHandler(sh)
 
     if log_path:
+        target = os.path.abspath(log_path)
+        for h in [h for h in logger.handlers if type(h) is logging.FileHandler]:
+            if h.baseFilename == target:
+                return logger
+            logger.removeHandler(h)
+            h.close()
         Path(log_path).parent.mkdir(parents=True, exist_ok=True)
         fh = logging.FileHandler(log_path, encoding="utf-8")
-        fh.setFormatter(fmt)
+        fh.setFormatter(_FORMAT)
         logger.addHandler(fh)
 
     return logger
+
+
+@contextmanager
+def log_to_file(log_path: str, name: str = "termguard") -> Iterator[logging.Logger]:
+    """
+    Also write the calling thread's records of the `name` logger to
+    `log_path` while the block runs. The handler is removed and closed on
+    exit, so concurrent runs each get their own file and nothing lingers.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+    fh = _RunFileHandler(log_path, encoding="utf-8")
+    fh.setFormatter(_FORMAT)
+    ident = threading.get_ident()
+    fh.addFilter(lambda record: record.thread == ident)
+    logger.addHandler(fh)
+    try:
+        yield logger
+    finally:
+        logger.removeHandler(fh)
+        fh.close()
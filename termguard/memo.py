@@ -0,0 +1,102 @@
+from __future__ import annotations
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .config import TermGuardConfig
+from .instrument import Instrumentation
+from .pipeline import check_texts
+from .report import render_reports
+
+
+def run_key(
+    en_text: str,
+    zh_text: str,
+    glossary: Optional[Mapping[str, str]] = None,
+    config: Optional[TermGuardConfig] = None,
+) -> str:
+    """Content hash of everything a run's result depends on."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (en_text, zh_text):
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    # insertion order matters: it orders extracted terms, mappings and flags
+    h.update(json.dumps(list((glossary or {}).items()), ensure_ascii=False).encode("utf-8"))
+    h.update(repr(config or TermGuardConfig()).encode("utf-8"))
+    return h.hexdigest()
+
+
+class RunCache:
+    """
+    In-memory memo of full runs (stages 1-5 plus rendered reports), keyed by
+    `run_key`. Nothing is written to disk.
+
+    Thread-safe and meant to be shared: callers asking for a key that is
+    being computed wait for that run instead of starting their own. Every
+    caller gets a private deep copy, so one session can never change what
+    another sees. The `max_entries` most recently used results are kept.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get_or_run(
+        self,
+        en_text: str,
+        zh_text: str,
+        glossary: Optional[Mapping[str, str]] = None,
+        config: Optional[TermGuardConfig] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Result of `check_texts` plus "report_table" and "reports"
+        ({format: bytes} for config.report_formats, uncompressed), and
+        whether it came from the cache. Stage callbacks on `instrumentation`
+        only fire when the run is actually computed.
+        """
+        cfg = config or TermGuardConfig()
+        key = run_key(en_text, zh_text, glossary, cfg)
+        while True:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(cached), True
+                waiter = self._pending.get(key)
+                if waiter is None:
+                    self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # someone else is computing this key; if that run fails we try ourselves
+            waiter.wait()
+
+        try:
+            result = check_texts(
+                en_text, zh_text, glossary=dict(glossary or {}), config=cfg,
+                logger=logger, instrumentation=instrumentation
+            )
+            result["reports"], result["report_table"] = render_reports(result["flags"], formats=cfg.report_formats)
+            with self._lock:
+                self._entries[key] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+        return copy.deepcopy(result), False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
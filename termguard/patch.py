@@ -1,6 +1,9 @@
 # termguard/patch.py
+import json
 import re
-from typing import Dict, List
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 def _parse_candidate_zh_terms(s: str) -> List[str]:
@@ -20,40 +23,201 @@ def _parse_candidate_zh_terms(s: str) -> List[str]:
     return parts
 
 
-def patch_zh_text(zh_text: str, glossary: Dict[str, str], flags: List[Dict]) -> str:
-    patched = zh_text
+def _flag_variants(f: Dict) -> List[str]:
+    variants: List[str] = []
+
+    # Case A: already structured
+    if isinstance(f.get("candidate_terms"), list):
+        variants.extend([str(x).strip() for x in f["candidate_terms"] if str(x).strip()])
+
+    # Case B: stored as a single string like "xxx(2); yyy(3)"
+    if isinstance(f.get("candidate_zh_terms"), str):
+        variants.extend(_parse_candidate_zh_terms(f["candidate_zh_terms"]))
+
+    # Case C: only the alternates are given
+    if isinstance(f.get("alternates"), list):
+        variants.extend([str(x).strip() for x in f["alternates"] if str(x).strip()])
+
+    return variants
 
+
+def build_patch_rules(flags: List[Dict]) -> Dict[str, str]:
+    """
+    Collect (variant -> preferred) rules from flags. Preferred terms map to
+    themselves so the scan consumes them intact instead of rewriting their
+    substrings. Earlier flags win when two flags claim the same variant.
+    """
+    rules: Dict[str, str] = {}
+    replacements: List[Tuple[str, str]] = []
     for f in flags:
         preferred = (f.get("preferred_zh") or "").strip()
         if not preferred:
             continue
+        rules[preferred] = preferred
+        for v in _flag_variants(f):
+            # Safety: avoid "无人机项目项目"
+            if v == preferred or v in preferred:
+                continue
+            replacements.append((v, preferred))
 
-        variants: List[str] = []
+    for v, preferred in replacements:
+        rules.setdefault(v, preferred)
+    return rules
 
-        # Case A: already structured
-        if isinstance(f.get("candidate_terms"), list):
-            variants.extend([str(x).strip() for x in f["candidate_terms"] if str(x).strip()])
 
-        # Case B: stored as a single string like "xxx(2); yyy(3)"
-        if isinstance(f.get("candidate_zh_terms"), str):
-            variants.extend(_parse_candidate_zh_terms(f["candidate_zh_terms"]))
+def _trie_regex(words: List[str]) -> str:
+    trie: Dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
 
-        # de-dup + replace longer first
-        variants = sorted(set([v for v in variants if v]), key=len, reverse=True)
+    def build(node: Dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # greedy optional: try the longer continuation first
+        return "(?:" + body + ")?" if "" in node else body
 
-        for v in variants:
-            if v == preferred:
-                continue
+    return build(trie)
 
-            # Safety: avoid "无人机项目项目"
-            if v in preferred:
-                continue
 
-            patched = re.sub(re.escape(v), preferred, patched)
+def compile_patch_rules(rules: Dict[str, str]) -> Optional["re.Pattern[str]"]:
+    """Compile all rule keys into one trie-shaped regex that matches the longest key."""
+    if not rules:
+        return None
+    return re.compile(_trie_regex(list(rules)))
+
+
+class ZhStreamPatcher:
+    """
+    Incremental form of `patch_zh_text_spans`: feed the text in pieces of
+    any size and get back the patched text that is already final.
+
+    A match at some position depends only on the next (longest rule) chars,
+    so everything before the last `longest - 1` chars of the input seen so
+    far is decided; only that tail is carried into the next `feed`. The
+    concatenated output and spans (in input coordinates) equal one
+    `patch_zh_text_spans` call over the whole text.
+    """
+
+    def __init__(self, rules: Dict[str, str], pattern: Optional["re.Pattern[str]"] = None):
+        self.rules = rules
+        self.pattern = pattern if pattern is not None else compile_patch_rules(rules)
+        self.carry = max(map(len, rules)) - 1 if rules else 0
+        self._buf = ""
+        self._offset = 0  # input offset of _buf[0]
+        self._last_end, self._last_new, self._last_replaced = -1, "", False
+
+    def feed(self, text: str, final: bool = False) -> Tuple[str, List[Tuple[int, int, str, str]]]:
+        buf = self._buf + text if self._buf else text
+        spans: List[Tuple[int, int, str, str]] = []
+        if self.pattern is None:
+            self._buf = ""
+            return buf, spans
+
+        rules, base = self.rules, self._offset
+        # matches starting at or after `limit` may still grow with the next piece
+        limit = len(buf) if final else len(buf) - self.carry
+        out: List[str] = []
+        pos = 0
+        last_end, last_new, last_replaced = self._last_end, self._last_new, self._last_replaced
+        for m in self.pattern.finditer(buf):
+            start, end = m.span()
+            if start >= limit:
+                break
+            old = m.group()
+            new = rules[old]
+            replaced = old != new
+            out.append(buf[pos:start])
+
+            if base + start == last_end and new == last_new and (replaced or last_replaced):
+                spans.append((base + start, base + end, old, ""))
+            else:
+                out.append(new)
+                if replaced:
+                    spans.append((base + start, base + end, old, new))
+            pos = end
+            last_end, last_new, last_replaced = base + end, new, replaced
+        cut = max(pos, limit)
+        out.append(buf[pos:cut])
+        self._buf = buf[cut:]
+        self._offset = base + cut
+        self._last_end, self._last_new, self._last_replaced = last_end, last_new, last_replaced
+        return "".join(out), spans
+
+    def close(self) -> Tuple[str, List[Tuple[int, int, str, str]]]:
+        return self.feed("", final=True)
+
+
+def patch_zh_text_spans(
+    zh_text: str,
+    rules: Dict[str, str],
+    pattern: Optional["re.Pattern[str]"] = None,
+) -> Tuple[str, List[Tuple[int, int, str, str]]]:
+    """
+    Rewrite `zh_text` in one left-to-right scan, taking the longest rule at
+    each position. Returns the patched text and (start, end, old, new) spans
+    in input coordinates. A rewritten region is never scanned again; a
+    replacement that would sit right next to the same preferred term is
+    dropped (recorded with new="") instead of duplicating it.
+    """
+    return ZhStreamPatcher(rules, pattern).feed(zh_text, final=True)
+
+
+def _span_row(span: Tuple[int, int, str, str]) -> str:
+    start, end, old, new = span
+    return json.dumps({"start": start, "end": end, "old": old, "new": new}, ensure_ascii=False) + "\n"
+
 
-        # collapse accidental duplicates
-        dup = preferred + preferred
-        while dup in patched:
-            patched = patched.replace(dup, preferred)
+def write_patch_log(path: str, spans: Iterable[Tuple[int, int, str, str]]) -> str:
+    """JSON lines {start, end, old, new}: character offsets into the unpatched text."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.writelines(map(_span_row, spans))
+    return path
 
+
+def patch_zh_file(
+    src_path: str,
+    dst_path: str,
+    rules: Optional[Dict[str, str]],
+    chunk_chars: int = 1 << 20,
+    log_path: Optional[str] = None,
+) -> int:
+    """
+    Patch a file in chunks of `chunk_chars` into `dst_path` without loading
+    it whole; matches across chunk boundaries are handled by carrying the
+    undecided tail over (see ZhStreamPatcher), so memory stays constant even
+    for a file that is one huge line. With `log_path`, every replacement is
+    appended there as it happens (see write_patch_log). Returns the number
+    of replacements.
+    """
+    if chunk_chars < 1:
+        raise ValueError(f"chunk_chars must be at least 1, got {chunk_chars}")
+    patcher = ZhStreamPatcher(rules or {})
+    n = 0
+    Path(dst_path).parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        src = stack.enter_context(open(src_path, encoding="utf-8"))
+        dst = stack.enter_context(open(dst_path, "w", encoding="utf-8"))
+        log = None
+        if log_path:
+            Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+            log = stack.enter_context(open(log_path, "w", encoding="utf-8"))
+        while True:
+            chunk = src.read(chunk_chars)
+            text, spans = patcher.feed(chunk, final=not chunk)
+            dst.write(text)
+            n += len(spans)
+            if log is not None:
+                log.writelines(map(_span_row, spans))
+            if not chunk:
+                return n
+
+
+def patch_zh_text(zh_text: str, glossary: Dict[str, str], flags: List[Dict]) -> str:
+    patched, _ = patch_zh_text_spans(zh_text, build_patch_rules(flags))
     return patched
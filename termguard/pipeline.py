@@ -1,136 +1,450 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+import logging
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-import pandas as pd
+import csv
 
 from .config import TermGuardConfig
-from .logger import get_logger
-from .utils import read_text, write_text, safe_mkdir, Timer
-from .preprocess import align_sentence_pairs
-from .extract_terms import extract_en_terms
+from .logger import get_logger, log_to_file
+from .utils import read_text, write_text, safe_mkdir
+from .preprocess import align_sentence_pairs, align_sentence_streams
+from .reader import iter_sentences
+from .extract_terms import extract_en_terms, extract_en_terms_streaming
 from .align import align_terms
+from .streaming import pipelined_align_terms
+from .segmentation import ZhSegmenter
+from .feature_cache import ZhFeatureCache
+from .glossary import GlossaryMatcher, find_present_terms, load_glossary
+from .instrument import Instrumentation
 from .consistency import detect_inconsistencies
-from .patch import patch_zh_text
-from .report import write_report
+from .patch import build_patch_rules, patch_zh_file, patch_zh_text_spans, write_patch_log
+from .report import write_reports
+from .stats import CorpusStats, merge_stats_files
 
 def load_glossary_csv(path: str) -> dict[str, str]:
-    import pandas as pd
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        return parse_glossary_csv(fh)
 
-    df = pd.read_csv(path)
+
+def parse_glossary_csv(lines: Iterable[str]) -> dict[str, str]:
+    """Glossary from CSV lines (a file opened with newline="", or an io.StringIO)."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return {}
+    rows = list(reader)
 
     # normalize headers: strip whitespace + BOM
-    df.columns = [str(c).strip().lstrip("\ufeff") for c in df.columns]
+    columns = [str(c).strip().lstrip("\ufeff") for c in header]
 
     # accept multiple header conventions
-    en_col = "en_term" if "en_term" in df.columns else ("en" if "en" in df.columns else "term")
-    zh_col = "zh_term" if "zh_term" in df.columns else ("preferred_zh" if "preferred_zh" in df.columns else "zh")
+    en_col = "en_term" if "en_term" in columns else ("en" if "en" in columns else "term")
+    zh_col = "zh_term" if "zh_term" in columns else ("preferred_zh" if "preferred_zh" in columns else "zh")
+    en_i, zh_i = columns.index(en_col), columns.index(zh_col)
 
     glossary = {}
-    for _, r in df.iterrows():
-        en = str(r[en_col]).strip()
-        zh = str(r[zh_col]).strip()
+    for r in rows:
+        if len(r) <= max(en_i, zh_i):
+            continue
+        en = r[en_i].strip()
+        zh = r[zh_i].strip()
         if en and zh:
             glossary[en] = zh
     return glossary
 
-def run_pipeline(
-    en_text: str,
-    zh_text: str,
+
+def _extract_terms(
+    en_sents: Iterable[str],
+    presence_texts: Iterable[str],
+    glossary: Dict[str, str],
+    cfg: TermGuardConfig,
+    inst: Instrumentation,
+    logger: logging.Logger,
+    glossary_matcher: Optional[GlossaryMatcher] = None
+) -> Tuple[List[Tuple[str, float]], List[str]]:
+    with inst.stage("extract_terms") as st:
+        if cfg.term_extraction == "streaming":
+            term_scored = extract_en_terms_streaming(
+                en_sents,
+                top_k=cfg.top_k_terms,
+                ngram_min=cfg.ngram_min,
+                ngram_max=cfg.ngram_max,
+                min_chars=cfg.min_term_chars,
+                memory_mb=cfg.extraction_memory_mb,
+                chunk_size=cfg.extraction_chunk_size
+            )
+        else:
+            term_scored = extract_en_terms(
+                en_sents,
+                top_k=cfg.top_k_terms,
+                ngram_min=cfg.ngram_min,
+                ngram_max=cfg.ngram_max,
+                min_chars=cfg.min_term_chars
+            )
+        # ✅ For a clean terminology QA demo: prioritize glossary terms
+        if glossary:
+            # Keep glossary terms that actually appear in the English text (one scan, case-insensitive)
+            present = find_present_terms(glossary, presence_texts, matcher=glossary_matcher)
+            en_terms = [t for t in present if " " in t]
+        else:
+            en_terms = [tup[0] for tup in term_scored]
+        st.count("terms_extracted", len(term_scored))
+        st.count("terms_selected", len(en_terms))
+
+    logger.info(f"[terms] extracted_terms={len(en_terms)} time={st.wall:.3f}s")
+    return term_scored, en_terms
+
+
+def _detect_and_patch(
+    mappings: Dict[str, List[Tuple[str, float, int]]],
+    glossary: Dict[str, str],
+    zh_text: Optional[str],
+    cfg: TermGuardConfig,
+    inst: Instrumentation,
+    logger: logging.Logger
+) -> Tuple[
+    List[Dict[str, Any]], Optional[str], Optional[Dict[str, str]], Optional[List[Tuple[int, int, str, str]]]
+]:
+    # 4) detect inconsistencies
+    with inst.stage("detect_inconsistencies") as st:
+        flags = detect_inconsistencies(
+            mappings=mappings,
+            glossary=glossary,
+            min_total_occurrences=cfg.min_total_occurrences,
+            entropy_threshold=cfg.flag_entropy_threshold
+        )
+        st.count("flags", len(flags))
+    logger.info(f"[consistency] flags={len(flags)} time={st.wall:.3f}s")
+
+    # 5) patch zh text (optional)
+    patched_zh = zh_text
+    rules = spans = None
+    with inst.stage("patch") as st:
+        if cfg.enable_patching and glossary:
+            rules = build_patch_rules(flags)
+            if zh_text is not None:
+                patched_zh, spans = patch_zh_text_spans(zh_text, rules)
+                st.count("replacements", len(spans))
+    logger.info(f"[patch] enabled={cfg.enable_patching and bool(glossary)} time={st.wall:.3f}s")
+    return flags, patched_zh, rules, spans
+
+
+def check_texts(
+    en_text: Optional[str],
+    zh_text: Optional[str],
     glossary: Optional[Dict[str, str]] = None,
-    out_dir: str = "outputs/run",
     config: Optional[TermGuardConfig] = None,
-    log_path: Optional[str] = None
+    logger: Optional[logging.Logger] = None,
+    instrumentation: Optional[Instrumentation] = None,
+    pairs: Optional[Iterable[Tuple[str, str]]] = None,
+    segmenter: Optional[ZhSegmenter] = None,
+    glossary_matcher: Optional[GlossaryMatcher] = None
 ) -> Dict[str, Any]:
+    """
+    Run stages 1-5 fully in memory: no output directory, no files written.
+    Returns mappings, flags and the patched ZH text. Per-stage wall/CPU time
+    and work counters are recorded on `instrumentation` (a fresh one if None).
+
+    Pass `pairs` instead of the texts to skip sentence splitting; they are
+    read into a list, so file-sized streams belong in check_files_pipelined.
+    Without `zh_text` patching only builds the rules ("patch_rules") and
+    "patched_zh" is None.
+
+    `segmenter` and `glossary_matcher` let a caller reuse warm state built
+    for this glossary and config (see engine.TermGuardEngine).
+    """
     cfg = config or TermGuardConfig()
-    safe_mkdir(out_dir)
-    logger = get_logger(log_path=log_path or str(Path(out_dir) / "termguard.log"))
+    logger = logger or logging.getLogger("termguard")
+    inst = instrumentation or Instrumentation(trace_memory=cfg.trace_memory)
 
     glossary = glossary or {}
 
-    stage_times: Dict[str, float] = {}
-
     # 1) align sentence pairs
-    with Timer() as t:
-        pairs = align_sentence_pairs(en_text, zh_text)
-    stage_times["preprocess_align"] = t.elapsed
-    logger.info(f"[preprocess] aligned_pairs={len(pairs)} time={t.elapsed:.3f}s")
+    with inst.stage("preprocess_align") as st:
+        if pairs is None:
+            pairs = align_sentence_pairs(
+                en_text,
+                zh_text,
+                method=cfg.sentence_aligner,
+                glossary=glossary,
+                band=cfg.aligner_band
+            )
+        else:
+            pairs = list(pairs)
+        st.count("aligned_pairs", len(pairs))
+    logger.info(f"[preprocess] aligned_pairs={len(pairs)} time={st.wall:.3f}s")
 
     en_sents = [p[0] for p in pairs]
 
     # 2) extract EN terms
-    with Timer() as t:
-        term_scored = extract_en_terms(
-            en_sents,
-            top_k=cfg.top_k_terms,
-            ngram_min=cfg.ngram_min,
-            ngram_max=cfg.ngram_max,
-            min_chars=cfg.min_term_chars
+    term_scored, en_terms = _extract_terms(
+        en_sents, [en_text] if en_text is not None else en_sents, glossary, cfg, inst, logger, glossary_matcher
+    )
+
+    # 3) align terms EN->ZH
+    segmenter = segmenter or ZhSegmenter.for_glossary(cfg.zh_segmentation, glossary, cfg.zh_anchor_window)
+    feature_cache = None
+    if cfg.feature_cache_path:
+        feature_cache = ZhFeatureCache(cfg.feature_cache_path, max_entries=cfg.feature_cache_max_entries)
+    align_stats: Dict[str, int] = {}
+    term_stats: Optional[Dict[str, Any]] = {} if cfg.write_stats else None
+    with inst.stage("align_terms") as st:
+        try:
+            mappings = align_terms(
+                aligned_pairs=pairs,
+                en_terms=en_terms,
+                zh_ngram_max=cfg.zh_ngram_max,
+                max_candidates=cfg.max_zh_candidates_per_en_term,
+                glossary=glossary,
+                engine=cfg.align_engine,
+                workers=cfg.align_workers,
+                feature_cache=feature_cache,
+                stats=align_stats,
+                term_stats=term_stats,
+                approx_width=cfg.approx_width,
+                segmenter=segmenter
+            )
+        finally:
+            if feature_cache is not None:
+                feature_cache.close()
+        for key, n in align_stats.items():
+            st.count(key, n)
+    logger.info(
+        f"[align] mapped_terms={len(mappings)} ngrams_generated={align_stats.get('ngrams_generated', 0)} "
+        f"ngrams_kept={align_stats.get('ngrams_kept', 0)} time={st.wall:.3f}s"
+    )
+    cache_stats = feature_cache.stats() if feature_cache is not None else None
+    if cache_stats is not None:
+        logger.info(
+            f"[align] feature_cache hits={cache_stats['hits']} misses={cache_stats['misses']} "
+            f"hit_rate={cache_stats['hit_rate']:.1%}"
         )
-        # ✅ For a clean terminology QA demo: prioritize glossary terms
-        if glossary:
-            # Keep glossary terms that actually appear in the English text (case-insensitive)
-            en_text_lower = en_text.lower()
-            en_terms = [t for t in glossary.keys() if " " in t and t.lower() in en_text_lower]
-        else:
-            en_terms = [tup[0] for tup in term_scored]
 
-    stage_times["extract_terms"] = t.elapsed
-    logger.info(f"[terms] extracted_terms={len(en_terms)} time={t.elapsed:.3f}s")
+    # 4-5) detect inconsistencies, patch
+    flags, patched_zh, rules, spans = _detect_and_patch(mappings, glossary, zh_text, cfg, inst, logger)
 
-    # 3) align terms EN->ZH
-    with Timer() as t:
-        mappings = align_terms(
-            aligned_pairs=pairs,
-            en_terms=en_terms,
+    return {
+        "aligned_pairs": len(pairs),
+        "term_stats": _corpus_stats(term_stats, len(pairs), cfg, segmenter),
+        "extracted_terms": term_scored,
+        "mappings": mappings,
+        "flags": flags,
+        "patched_zh": patched_zh,
+        "patch_rules": rules,
+        "patch_spans": spans if cfg.write_patch_log else None,
+        "stage_times": inst.stage_times,
+        "stage_stats": inst.to_dict(),
+        "feature_cache": cache_stats,
+    }
+
+
+def _count_settings(cfg: TermGuardConfig, segmenter: ZhSegmenter) -> Dict[str, Any]:
+    """Config that shapes the raw counts in CorpusStats, beyond zh_ngram_max and the segmentation mode."""
+    return {
+        "zh_anchor_window": cfg.zh_anchor_window,
+        "segmenter": segmenter.key,  # the glossary words a "glossary"/"anchored" tokenizer was built with
+        "sentence_aligner": cfg.sentence_aligner,
+        "aligner_band": cfg.aligner_band,
+        "counting": f"approx:{cfg.approx_width}" if cfg.align_engine == "approx" else "exact",
+    }
+
+
+def _corpus_stats(
+    term_stats: Optional[Dict[str, Any]], n_pairs: int, cfg: TermGuardConfig, segmenter: ZhSegmenter
+) -> Optional[CorpusStats]:
+    if term_stats is None:
+        return None
+    return CorpusStats.from_alignment(
+        term_stats, n_pairs, zh_ngram_max=cfg.zh_ngram_max, segmentation=cfg.zh_segmentation,
+        settings=_count_settings(cfg, segmenter)
+    )
+
+
+class _Replay:
+    """Re-iterable view of a stream factory; each pass re-reads the source and records `count`."""
+
+    def __init__(self, factory: Callable[[], Iterable[str]]):
+        self.factory = factory
+        self.count = 0
+
+    def __iter__(self) -> Iterator[str]:
+        n = 0
+        for item in self.factory():
+            n += 1
+            yield item
+        self.count = n
+
+
+def _check_pipelined_config(cfg: TermGuardConfig) -> None:
+    if cfg.align_engine == "sparse":
+        raise ValueError('align_engine="sparse" is not supported with execution="pipelined"')
+    if cfg.feature_cache_path:
+        raise ValueError('feature_cache_path is not supported with execution="pipelined"')
+
+
+def check_files_pipelined(
+    pair_stream: Callable[[], Iterable[Tuple[str, str]]],
+    glossary: Optional[Dict[str, str]] = None,
+    config: Optional[TermGuardConfig] = None,
+    logger: Optional[logging.Logger] = None,
+    instrumentation: Optional[Instrumentation] = None
+) -> Dict[str, Any]:
+    """
+    Stages 1-5 with the alignment pass pipelined (see streaming.pipelined_align_terms).
+
+    `pair_stream()` must return a fresh sentence-pair stream on every call:
+    term extraction reads the EN side first, then reader, segmenter and
+    counter run concurrently over a second pass. Only the EN sentences are
+    held in memory (and only for "tfidf" extraction), never the ZH side.
+    Patching only builds the rules; "patched_zh" is None. The "sparse"
+    engine and the feature cache need the whole ZH side at once and raise
+    ValueError here.
+    """
+    cfg = config or TermGuardConfig()
+    _check_pipelined_config(cfg)
+    logger = logger or logging.getLogger("termguard")
+    inst = instrumentation or Instrumentation(trace_memory=cfg.trace_memory)
+    glossary = glossary or {}
+
+    # 1-2) first pass: EN side only
+    en_sents: Any = _Replay(lambda: (en for en, _ in pair_stream()))
+    if cfg.term_extraction != "streaming":
+        en_sents = list(en_sents)
+    term_scored, en_terms = _extract_terms(en_sents, en_sents, glossary, cfg, inst, logger)
+    n_pairs = len(en_sents) if isinstance(en_sents, list) else en_sents.count
+    logger.info(f"[preprocess] aligned_pairs={n_pairs}")
+
+    # 3) second pass: reader -> segmenter -> counter
+    segmenter = ZhSegmenter.for_glossary(cfg.zh_segmentation, glossary, cfg.zh_anchor_window)
+    align_stats: Dict[str, int] = {}
+    term_stats: Optional[Dict[str, Any]] = {} if cfg.write_stats else None
+    with inst.stage("align_terms") as st:
+        mappings = pipelined_align_terms(
+            pair_stream(),
+            en_terms,
             zh_ngram_max=cfg.zh_ngram_max,
             max_candidates=cfg.max_zh_candidates_per_en_term,
-            glossary=glossary
-        )
-    stage_times["align_terms"] = t.elapsed
-    logger.info(f"[align] mapped_terms={len(mappings)} time={t.elapsed:.3f}s")
-
-    # 4) detect inconsistencies
-    with Timer() as t:
-        flags = detect_inconsistencies(
-            mappings=mappings,
             glossary=glossary,
-            min_total_occurrences=cfg.min_total_occurrences,
-            entropy_threshold=cfg.flag_entropy_threshold
+            workers=cfg.align_workers,
+            queue_size=cfg.pipeline_queue_size,
+            batch_size=cfg.pipeline_batch_size,
+            stats=align_stats,
+            term_stats=term_stats,
+            approx_width=cfg.approx_width if cfg.align_engine == "approx" else None,
+            segmenter=segmenter
         )
-    stage_times["detect_inconsistencies"] = t.elapsed
-    logger.info(f"[consistency] flags={len(flags)} time={t.elapsed:.3f}s")
+        for key, n in align_stats.items():
+            st.count(key, n)
+    logger.info(
+        f"[align] mapped_terms={len(mappings)} ngrams_generated={align_stats.get('ngrams_generated', 0)} "
+        f"ngrams_kept={align_stats.get('ngrams_kept', 0)} time={st.wall:.3f}s"
+    )
 
-    # 5) patch zh text (optional)
-    patched_zh = zh_text
-    with Timer() as t:
-        if cfg.enable_patching and glossary:
-            patched_zh = patch_zh_text(zh_text, glossary, flags)
-    stage_times["patch"] = t.elapsed
-    logger.info(f"[patch] enabled={cfg.enable_patching and bool(glossary)} time={t.elapsed:.3f}s")
+    # 4-5) detect inconsistencies, patch rules
+    flags, patched_zh, rules, _ = _detect_and_patch(mappings, glossary, None, cfg, inst, logger)
+
+    return {
+        "aligned_pairs": n_pairs,
+        "term_stats": _corpus_stats(term_stats, n_pairs, cfg, segmenter),
+        "extracted_terms": term_scored,
+        "mappings": mappings,
+        "flags": flags,
+        "patched_zh": patched_zh,
+        "patch_rules": rules,
+        "patch_spans": None,
+        "stage_times": inst.stage_times,
+        "stage_stats": inst.to_dict(),
+        "feature_cache": None,
+    }
+
+
+def run_pipeline(
+    en_text: str,
+    zh_text: str,
+    glossary: Optional[Dict[str, str]] = None,
+    out_dir: str = "outputs/run",
+    config: Optional[TermGuardConfig] = None,
+    log_path: Optional[str] = None,
+    instrumentation: Optional[Instrumentation] = None
+) -> Dict[str, Any]:
+    cfg = config or TermGuardConfig()
+    safe_mkdir(out_dir)
+    logger = get_logger()
+    inst = instrumentation or Instrumentation(trace_memory=cfg.trace_memory)
+
+    # the run log is scoped to this call; nothing stays attached to the shared logger
+    with log_to_file(log_path or str(Path(out_dir) / "termguard.log"), name=logger.name):
+        result = check_texts(en_text, zh_text, glossary=glossary, config=cfg, logger=logger, instrumentation=inst)
+        return _write_outputs(result, out_dir, cfg, inst, logger)
+
+
+def _write_outputs(
+    result: Dict[str, Any],
+    out_dir: str,
+    cfg: TermGuardConfig,
+    inst: Instrumentation,
+    logger: logging.Logger,
+    zh_path: Optional[str] = None
+) -> Dict[str, Any]:
+    flags = result["flags"]
+    term_scored = result["extracted_terms"]
 
     # 6) write outputs
-    with Timer() as t:
-        csv_path, json_path = write_report(out_dir, flags)
+    with inst.stage("write_outputs") as st:
+        report_paths, report_table = write_reports(
+            out_dir, flags, formats=cfg.report_formats, compression=cfg.report_compression
+        )
         patched_path = str(Path(out_dir) / "zh_patched.txt")
-        write_text(patched_path, patched_zh)
+        log_path = str(Path(out_dir) / "zh_patch_log.jsonl") if cfg.write_patch_log else None
+        if result["patched_zh"] is None:
+            # streamed input: patch the source file chunk by chunk
+            st.count("replacements", patch_zh_file(
+                zh_path, patched_path, result["patch_rules"], chunk_chars=cfg.patch_chunk_chars, log_path=log_path
+            ))
+        else:
+            write_text(patched_path, result["patched_zh"])
+            if log_path:
+                write_patch_log(log_path, result.get("patch_spans") or [])
         # also save top terms for transparency
         terms_path = str(Path(out_dir) / "extracted_terms.txt")
         write_text(terms_path, "\n".join([f"{term}\t{score:.4f}" for term, score in term_scored]))
-    stage_times["write_outputs"] = t.elapsed
+        stats_path = None
+        if result.get("term_stats") is not None:
+            stats_path = result["term_stats"].save(str(Path(out_dir) / "term_stats.json.gz"))
+        st.count("files_written", len(report_paths) + 2 + (stats_path is not None) + (log_path is not None))
+
+    trace_paths = None
+    if cfg.write_trace:
+        trace_paths = (
+            inst.write_json(str(Path(out_dir) / "stage_stats.json")),
+            inst.write_chrome_trace(str(Path(out_dir) / "trace_events.json")),
+        )
+        logger.info(f"[output] stage_stats={trace_paths[0]} trace={trace_paths[1]}")
 
-    logger.info(f"[output] report_csv={csv_path}")
-    logger.info(f"[output] report_json={json_path}")
+    for fmt, path in report_paths.items():
+        logger.info(f"[output] report_{fmt}={path}")
     logger.info(f"[output] zh_patched={patched_path}")
+    if log_path:
+        logger.info(f"[output] patch_log={log_path}")
+    if stats_path:
+        logger.info(f"[output] term_stats={stats_path}")
 
     return {
-        "aligned_pairs": len(pairs),
+        "aligned_pairs": result["aligned_pairs"],
         "extracted_terms": term_scored,
-        "mappings": mappings,
+        "mappings": result["mappings"],
         "flags": flags,
-        "report_csv": csv_path,
-        "report_json": json_path,
+        "report_csv": report_paths.get("csv"),
+        "report_json": report_paths.get("json"),
+        "report_paths": report_paths,
+        "report_table": report_table,
         "patched_path": patched_path,
-        "stage_times": stage_times,
+        "patch_log_path": log_path,
+        "stats_path": stats_path,
+        "stage_times": inst.stage_times,
+        "stage_stats": inst.to_dict(),
+        "trace_paths": trace_paths,
+        "feature_cache": result["feature_cache"],
     }
 
 
@@ -141,13 +455,106 @@ def run_pipeline_from_files(
     out_dir: str,
     config: TermGuardConfig | None = None
 ) -> Dict[str, Any]:
-    en_text = read_text(en_path)
-    zh_text = read_text(zh_path)
-    glossary = load_glossary_csv(glossary_path) if glossary_path else {}
-    return run_pipeline(
-        en_text=en_text,
-        zh_text=zh_text,
-        glossary=glossary,
-        out_dir=out_dir,
-        config=config
-    )
+    cfg = config or TermGuardConfig()
+    glossary = load_glossary(glossary_path) if glossary_path else {}
+    if cfg.execution not in ("staged", "pipelined"):
+        raise ValueError(f"Unknown execution mode: {cfg.execution!r}")
+    streamed = cfg.stream_input or cfg.execution == "pipelined"
+    if streamed:
+        _check_pipelined_config(cfg)
+    if not streamed:
+        return run_pipeline(
+            en_text=read_text(en_path),
+            zh_text=read_text(zh_path),
+            glossary=glossary,
+            out_dir=out_dir,
+            config=cfg
+        )
+
+    # sentences come straight off memory-mapped files and are counted in bounded batches;
+    # neither the raw texts nor the sentence pairs are ever held whole
+    safe_mkdir(out_dir)
+    logger = get_logger()
+    inst = Instrumentation(trace_memory=cfg.trace_memory)
+
+    def pair_stream() -> Iterator[Tuple[str, str]]:
+        return align_sentence_streams(
+            iter_sentences(en_path, "en"),
+            iter_sentences(zh_path, "zh"),
+            method=cfg.sentence_aligner,
+            glossary=glossary,
+            band=cfg.aligner_band
+        )
+
+    with log_to_file(str(Path(out_dir) / "termguard.log"), name=logger.name):
+        result = check_files_pipelined(pair_stream, glossary=glossary, config=cfg, logger=logger, instrumentation=inst)
+        return _write_outputs(result, out_dir, cfg, inst, logger, zh_path=zh_path)
+
+
+def run_merge(
+    stats_paths: List[str],
+    glossary_path: str | None,
+    out_dir: str,
+    config: TermGuardConfig | None = None
+) -> Dict[str, Any]:
+    """
+    Corpus-level consistency from saved per-document stats (`write_stats`):
+    merge them in the given order, select candidates, flag and report,
+    without touching the source texts. The merged stats are saved as well,
+    so merges can be merged again. Terms that not every document aligned
+    are logged as a warning and returned as "partial_terms" (see
+    `CorpusStats`).
+    """
+    cfg = config or TermGuardConfig()
+    glossary = load_glossary(glossary_path) if glossary_path else {}
+    safe_mkdir(out_dir)
+    logger = get_logger()
+    inst = Instrumentation(trace_memory=cfg.trace_memory)
+
+    with log_to_file(str(Path(out_dir) / "termguard.log"), name=logger.name):
+        with inst.stage("merge_stats") as st:
+            merged = merge_stats_files(stats_paths)
+            mappings = merged.to_mappings(cfg.max_zh_candidates_per_en_term, glossary)
+            st.count("documents", merged.documents)
+            st.count("terms", len(mappings))
+        logger.info(
+            f"[merge] files={len(stats_paths)} documents={merged.documents} terms={len(mappings)} time={st.wall:.3f}s"
+        )
+        if merged.partial_terms:
+            logger.warning(
+                f"[merge] {len(merged.partial_terms)} terms are missing from some documents' stats "
+                "and are undercounted: "
+                + ", ".join(merged.partial_terms[:10]) + (" ..." if len(merged.partial_terms) > 10 else "")
+            )
+
+        with inst.stage("detect_inconsistencies") as st:
+            flags = detect_inconsistencies(
+                mappings=mappings,
+                glossary=glossary,
+                min_total_occurrences=cfg.min_total_occurrences,
+                entropy_threshold=cfg.flag_entropy_threshold
+            )
+            st.count("flags", len(flags))
+        logger.info(f"[consistency] flags={len(flags)} time={st.wall:.3f}s")
+
+        with inst.stage("write_outputs") as st:
+            report_paths, report_table = write_reports(
+                out_dir, flags, formats=cfg.report_formats, compression=cfg.report_compression
+            )
+            stats_path = merged.save(str(Path(out_dir) / "term_stats.json.gz"))
+            st.count("files_written", len(report_paths) + 1)
+        for fmt, path in report_paths.items():
+            logger.info(f"[output] report_{fmt}={path}")
+        logger.info(f"[output] term_stats={stats_path}")
+
+    return {
+        "documents": merged.documents,
+        "aligned_pairs": merged.aligned_pairs,
+        "partial_terms": merged.partial_terms,
+        "mappings": mappings,
+        "flags": flags,
+        "report_paths": report_paths,
+        "report_table": report_table,
+        "stats_path": stats_path,
+        "stage_times": inst.stage_times,
+    }
@@ -1,52 +1,289 @@
+import bisect
+import math
 import re
-from typing import List, Tuple
-from .utils import normalize_whitespace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 _EN_SPLIT = re.compile(r"(?<=[\.\?\!])\s+")
-_ZH_SPLIT = re.compile(r"(?<=[。！？])")
+_ZH_SENT = re.compile(r"[^。！？]*[。！？]|[^。！？]+")
+_INLINE_WS = re.compile(r"[ \t\u3000]+")
+
+
+def _line_spans(line: str, lang: str) -> Iterator[Tuple[int, int]]:
+    """Raw (start, end) character spans of the sentences in one line."""
+    if lang == "zh":
+        for m in _ZH_SENT.finditer(line):
+            yield m.span()
+        return
+    pos = 0
+    for m in _EN_SPLIT.finditer(line):
+        yield pos, m.start()
+        pos = m.end()
+    yield pos, len(line)
+
+
+def line_sentences(line: str, lang: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Split one line into sentences without copying the whole line first.
+    Yields (start, end, sentence): the raw character span and the sentence
+    with whitespace normalized as in `normalize_whitespace`. Empty ones are skipped.
+    """
+    for start, end in _line_spans(line, lang):
+        sent = _INLINE_WS.sub(" ", line[start:end]).strip()
+        if sent:
+            yield start, end, sent
 
 
 def split_en_sentences(text: str) -> List[str]:
-    text = normalize_whitespace(text)
-    if not text:
-        return []
     # If file has multiple lines, keep them; also split long lines into sentences
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    sents: List[str] = []
-    for ln in lines:
-        parts = _EN_SPLIT.split(ln)
-        sents.extend([p.strip() for p in parts if p.strip()])
-    return sents
+    return [s for ln in text.splitlines() for _, _, s in line_sentences(ln, "en")]
 
 
 def split_zh_sentences(text: str) -> List[str]:
-    text = normalize_whitespace(text)
-    if not text:
-        return []
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    sents: List[str] = []
-    for ln in lines:
-        parts = [p.strip() for p in _ZH_SPLIT.split(ln) if p.strip()]
-        # add punctuation back if lost
-        rebuilt: List[str] = []
-        buf = ""
-        for ch in ln:
-            buf += ch
-            if ch in "。！？":
-                rebuilt.append(buf.strip())
-                buf = ""
-        if buf.strip():
-            rebuilt.append(buf.strip())
-        sents.extend(rebuilt if rebuilt else parts)
-    return sents
-
-
-def align_sentence_pairs(en_text: str, zh_text: str) -> List[Tuple[str, str]]:
+    # split after 。！？ keeping the punctuation with its sentence
+    return [s for ln in text.splitlines() for _, _, s in line_sentences(ln, "zh")]
+
+
+def align_sentence_streams(
+    en_sents: Iterable[str],
+    zh_sents: Iterable[str],
+    method: str = "index",
+    glossary: Optional[Dict[str, str]] = None,
+    band: int = 16,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Pair two sentence streams. The index aligner consumes both lazily and stops
+    at the shorter one; the length aligner needs the full lists and buffers them.
+    """
+    if method == "length":
+        return iter(length_align_sentences(list(en_sents), list(zh_sents), glossary=glossary, band=band))
+    if method != "index":
+        raise ValueError(f"Unknown sentence aligner: {method!r}")
+    return zip(en_sents, zh_sents)
+
+
+def align_sentence_pairs(
+    en_text: str,
+    zh_text: str,
+    method: str = "index",
+    glossary: Optional[Dict[str, str]] = None,
+    band: int = 16,
+) -> List[Tuple[str, str]]:
     """
     MVP alignment: split EN/ZH into sentences and align by index (truncate to min length).
+    method="length" uses the Gale-Church style aligner instead (see length_align_sentences).
+    """
+    return list(align_sentence_streams(
+        split_en_sentences(en_text), split_zh_sentences(zh_text), method=method, glossary=glossary, band=band
+    ))
+
+
+# Gale & Church (1993) bead priors: (en sentences, zh sentences) -> -log P
+_BEADS = {
+    (1, 1): -math.log(0.89),
+    (1, 0): -math.log(0.0099 / 2),
+    (0, 1): -math.log(0.0099 / 2),
+    (2, 1): -math.log(0.089 / 2),
+    (1, 2): -math.log(0.089 / 2),
+    (2, 2): -math.log(0.011),
+}
+_BEAD_CODES = list(_BEADS)
+_GC_VARIANCE = 6.8
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def find_alignment_anchors(
+    en_sents: List[str],
+    zh_sents: List[str],
+    glossary: Optional[Dict[str, str]] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Sentence pairs that are almost certainly translations of each other: the
+    same set of numbers, or the only EN/ZH sentences containing a glossary
+    term and its preferred rendering. Only signatures unique on both sides
+    are used, and the longest monotonic chain of them is returned.
+    """
+    en_sig: Dict[object, List[int]] = {}
+    zh_sig: Dict[object, List[int]] = {}
+    for i, s in enumerate(en_sents):
+        nums = tuple(sorted(_NUMBER.findall(s)))
+        if nums:
+            en_sig.setdefault(nums, []).append(i)
+    for j, s in enumerate(zh_sents):
+        nums = tuple(sorted(_NUMBER.findall(s)))
+        if nums:
+            zh_sig.setdefault(nums, []).append(j)
+
+    if glossary:
+        from .patch import compile_patch_rules
+        from .term_index import EnTermIndex
+
+        en_index = EnTermIndex(s.lower() for s in en_sents)
+        zh_to_en: Dict[str, List[str]] = {}
+        for en, zh in glossary.items():
+            zh_to_en.setdefault(zh, []).append(en)
+        pattern = compile_patch_rules({zh: zh for zh in zh_to_en})
+        for j, s in enumerate(zh_sents):
+            for zh in {m.group() for m in pattern.finditer(s)} if pattern else ():
+                for en in zh_to_en[zh]:
+                    zh_sig.setdefault(("g", en), []).append(j)
+        for en in glossary:
+            if ("g", en) in zh_sig:
+                en_sig[("g", en)] = en_index.lookup(en.lower())
+
+    cands = sorted(
+        (en_sig[k][0], zh_sig[k][0]) for k in en_sig
+        if k in zh_sig and len(en_sig[k]) == 1 and len(zh_sig[k]) == 1
+    )
+
+    # longest chain increasing in both i and j (patience sorting)
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev = [-1] * len(cands)
+    for c, (_, j) in enumerate(cands):
+        k = bisect.bisect_left(tails, j)
+        if k == len(tails):
+            tails.append(j)
+            tail_idx.append(c)
+        else:
+            tails[k] = j
+            tail_idx[k] = c
+        prev[c] = tail_idx[k - 1] if k > 0 else -1
+    chain: List[Tuple[int, int]] = []
+    c = tail_idx[-1] if tail_idx else -1
+    while c >= 0:
+        chain.append(cands[c])
+        c = prev[c]
+    chain.reverse()
+    # two anchors on one EN (or ZH) sentence cannot both hold
+    return [a for k, a in enumerate(chain) if k == 0 or (a[0] > chain[k - 1][0] and a[1] > chain[k - 1][1])]
+
+
+def length_align_beads(
+    en_sents: List[str],
+    zh_sents: List[str],
+    anchors: Optional[List[Tuple[int, int]]] = None,
+    band: int = 16,
+) -> List[Tuple[int, int, int, int]]:
     """
-    en_sents = split_en_sentences(en_text)
-    zh_sents = split_zh_sentences(zh_text)
-    n = min(len(en_sents), len(zh_sents))
-    return list(zip(en_sents[:n], zh_sents[:n]))
+    Gale-Church length-based alignment as banded dynamic programming.
+
+    Row i only scores ZH positions within `band` of where the best path of
+    row i-1 ended, advanced by the local sentence-count slope taken from the
+    anchors. An anchor (i, j) pins the path to (i, j) and (i + 1, j + 1).
+    Time and memory are O(n_en * band). Returns beads
+    (en_start, en_end, zh_start, zh_end), including 1-0 / 0-1 beads.
+    """
+    n, m = len(en_sents), len(zh_sents)
+    if n == 0 or m == 0:
+        return []
+    en_pre = [0]
+    for s in en_sents:
+        en_pre.append(en_pre[-1] + len(s))
+    zh_pre = [0]
+    for s in zh_sents:
+        zh_pre.append(zh_pre[-1] + len(s))
+    ratio = max(zh_pre[-1], 1) / max(en_pre[-1], 1)
+    var = _GC_VARIANCE * ratio
+    sqrt2 = math.sqrt(2.0)
+    log, sqrt, erfc = math.log, math.sqrt, math.erfc
+
+    guide = [(0, 0)] + [a for a in (anchors or []) if 0 < a[0] < n and 0 < a[1] < m] + [(n, m)]
+    guide_i = [g[0] for g in guide]
+    pinned: Dict[int, Tuple[int, int]] = {}
+    for ai, aj in guide[1:-1]:
+        for pi, pj in ((ai, aj), (ai + 1, aj + 1)):
+            lo_hi = pinned.get(pi, (pj, pj))
+            pinned[pi] = (min(lo_hi[0], pj), max(lo_hi[1], pj))
+
+    beads_moves = [(di, dj, _BEADS[(di, dj)], code) for code, (di, dj) in enumerate(_BEAD_CODES)]
+    inf = float("inf")
+    los: List[int] = []
+    backs: List[bytearray] = []
+    rows: List[List[float]] = []
+    center = 0.0
+    for i in range(n + 1):
+        k = min(bisect.bisect_right(guide_i, i) - 1, len(guide) - 2)
+        (i0, j0), (i1, j1) = guide[max(k, 0)], guide[max(k, 0) + 1]
+        slope = (j1 - j0) / (i1 - i0) if i1 > i0 else 1.0
+        if i > 0:
+            prev = rows[-1]
+            best_j = los[-1] + min(range(len(prev)), key=prev.__getitem__)
+            center = best_j + slope
+        lo = max(0, int(center) - band)
+        hi = min(m, int(math.ceil(center)) + band)
+        if i in pinned:
+            lo, hi = pinned[i]
+        if i == n:
+            hi = m
+        cost = [inf] * (hi - lo + 1)
+        back = bytearray(hi - lo + 1)
+        for j in range(lo, hi + 1):
+            if i == 0 and j == 0:
+                cost[0] = 0.0
+                continue
+            best, best_code = inf, 0
+            for di, dj, prior, code in beads_moves:
+                pi, pj = i - di, j - dj
+                if pi < 0 or pj < 0:
+                    continue
+                if di == 0:
+                    if pj < lo:
+                        continue
+                    prev_cost = cost[pj - lo]
+                else:
+                    if di > len(rows):
+                        continue
+                    plo = los[pi]
+                    prow = rows[-di]
+                    if pj < plo or pj - plo >= len(prow):
+                        continue
+                    prev_cost = prow[pj - plo]
+                if prev_cost == inf:
+                    continue
+                l_en = en_pre[i] - en_pre[pi]
+                l_zh = zh_pre[j] - zh_pre[pj]
+                mean = (l_en + l_zh / ratio) / 2.0
+                if mean > 0:
+                    delta = abs(l_zh - l_en * ratio) / sqrt(mean * var)
+                    # erfc(d / sqrt2) = 2 * (1 - Phi(d)), the two-sided tail
+                    total = prev_cost + prior - log(max(erfc(delta / sqrt2), 1e-300))
+                else:
+                    total = prev_cost + prior
+                if total < best:
+                    best, best_code = total, code
+            cost[j - lo] = best
+            back[j - lo] = best_code
+        los.append(lo)
+        backs.append(back)
+        rows.append(cost)
+        if len(rows) > 2:
+            rows.pop(0)
+
+    if rows[-1][m - los[n]] == inf:
+        # the band lost the path; retry wider, and without anchors once the band covers everything
+        return length_align_beads(en_sents, zh_sents, anchors if band < max(n, m) else None, band * 2)
+
+    beads: List[Tuple[int, int, int, int]] = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        di, dj = _BEAD_CODES[backs[i][j - los[i]]]
+        beads.append((i - di, i, j - dj, j))
+        i, j = i - di, j - dj
+    beads.reverse()
+    return beads
+
+
+def length_align_sentences(
+    en_sents: List[str],
+    zh_sents: List[str],
+    glossary: Optional[Dict[str, str]] = None,
+    band: int = 16,
+) -> List[Tuple[str, str]]:
+    """Length-based sentence pairs; 2-1 / 1-2 / 2-2 beads are merged, 1-0 / 0-1 beads dropped."""
+    anchors = find_alignment_anchors(en_sents, zh_sents, glossary)
+    pairs: List[Tuple[str, str]] = []
+    for i0, i1, j0, j1 in length_align_beads(en_sents, zh_sents, anchors=anchors, band=band):
+        if i1 > i0 and j1 > j0:
+            pairs.append((" ".join(en_sents[i0:i1]), "".join(zh_sents[j0:j1])))
+    return pairs
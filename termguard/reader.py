@@ -0,0 +1,59 @@
+from __future__ import annotations
+import mmap
+import re
+from typing import Iterator, Tuple
+
+from .preprocess import line_sentences
+
+# the separators str.splitlines() breaks on, other than "\n" which mmap scanning handles
+_SUBLINE = re.compile(r"[^\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]+")
+
+
+def iter_sentence_spans(path: str, lang: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Lazily split a UTF-8 file into sentences, one pass over a memory map.
+
+    Yields (start, end, sentence) where start/end are byte offsets of the raw
+    sentence in the file and the sentence is whitespace-normalized exactly as
+    `split_en_sentences` / `split_zh_sentences` would return it. Only one line
+    is decoded at a time, so memory stays flat however large the file is.
+    """
+    if lang not in ("en", "zh"):
+        raise ValueError(f"Unknown language: {lang!r}")
+    with open(path, "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with mm:
+            size = len(mm)
+            pos = 0
+            while pos < size:
+                nl = mm.find(b"\n", pos)
+                end = size if nl < 0 else nl
+                line = mm[pos:end].decode("utf-8")
+                # byte offset of line[char_pos], advanced incrementally
+                char_pos, byte_pos = 0, pos
+                for sub in _SUBLINE.finditer(line):
+                    for s, e, sent in line_sentences(sub.group(), lang):
+                        s += sub.start()
+                        e += sub.start()
+                        byte_pos += len(line[char_pos:s].encode("utf-8"))
+                        start_b = byte_pos
+                        byte_pos += len(line[s:e].encode("utf-8"))
+                        char_pos = e
+                        yield start_b, byte_pos, sent
+                pos = end + 1
+
+
+def iter_sentences(path: str, lang: str) -> Iterator[str]:
+    """Sentences of a file, lazily; see iter_sentence_spans."""
+    for _, _, sent in iter_sentence_spans(path, lang):
+        yield sent
+
+
+def read_span(path: str, start: int, end: int) -> str:
+    """Raw text of a byte span returned by iter_sentence_spans."""
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        return fh.read(end - start).decode("utf-8")
@@ -1,35 +1,251 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple, Any
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
 from pathlib import Path
+import csv
+import gzip
+import importlib
+import io
 import json
-import pandas as pd
-
-
-def make_report_dataframe(flags: List[Dict[str, Any]]) -> pd.DataFrame:
-    rows = []
-    for f in flags:
-        cand_str = "; ".join([f"{c['zh_term']}({c['count']})" for c in f["candidates"]])
-        rows.append({
-            "en_term": f["en_term"],
-            "preferred_zh": f["preferred_zh"],
-            "candidate_zh_terms": cand_str,
-            "total_occurrences": f["total_occurrences"],
-            "entropy": f["entropy"],
-            "top_prob": f["top_prob"],
-            "severity": f["severity"],
-        })
-    df = pd.DataFrame(rows)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+REPORT_COLUMNS = [
+    "en_term", "preferred_zh", "candidate_zh_terms", "total_occurrences", "entropy", "top_prob", "severity",
+]
+REPORT_FORMATS = ("csv", "json", "jsonl", "parquet", "arrow")
+COMPRESSIONS = (None, "gzip", "zstd")
+_SUFFIX = {None: "", "gzip": ".gz", "zstd": ".zst"}
+_TEXT_FORMATS = ("csv", "json", "jsonl")
+
+
+def _optional_import(module: str, feature: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{feature} need the optional '{module}' package: "
+            f"pip install {module} (or pip install -r requirement-reports.txt)"
+        ) from e
+
+
+def make_report_row(f: Dict[str, Any]) -> Dict[str, Any]:
+    cand_str = "; ".join([f"{c['zh_term']}({c['count']})" for c in f["candidates"]])
+    return {
+        "en_term": f["en_term"],
+        "preferred_zh": f["preferred_zh"],
+        "candidate_zh_terms": cand_str,
+        "total_occurrences": f["total_occurrences"],
+        "entropy": f["entropy"],
+        "top_prob": f["top_prob"],
+        "severity": f["severity"],
+    }
+
+
+def make_report_rows(flags: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [make_report_row(f) for f in flags]
+
+
+def make_report_dataframe(flags: List[Dict[str, Any]]) -> "pd.DataFrame":
+    import pandas as pd
+
+    df = pd.DataFrame(make_report_rows(flags), columns=REPORT_COLUMNS)
     return df
 
 
-def write_report(out_dir: str, flags: List[Dict[str, Any]]) -> Tuple[str, str]:
-    Path(out_dir).mkdir(parents=True, exist_ok=True)
-    df = make_report_dataframe(flags)
+def _open_text(path: str, compression: Optional[str], newline: Optional[str] = None) -> TextIO:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline=newline)
+    if compression == "zstd":
+        zstandard = _optional_import("zstandard", "zstd-compressed text reports")
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline=newline)
+    return open(path, "w", encoding="utf-8", newline=newline)
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("en_term", pa.string()),
+        ("preferred_zh", pa.string()),
+        ("candidate_zh_terms", pa.string()),
+        ("total_occurrences", pa.int64()),
+        ("entropy", pa.float64()),
+        ("top_prob", pa.float64()),
+        ("severity", pa.float64()),
+    ])
+
+
+class ReportWriter:
+    """
+    Incremental report writer: `write(flag)` appends one flag to every
+    requested format, so a report never has to exist in memory as a whole.
+
+    Formats: csv, json (the indented array of full flags), jsonl (one flag per
+    line), parquet and arrow (IPC file) with the report-table columns; the
+    columnar ones need pyarrow and are written in record batches of
+    `batch_size` rows. `compression` ("gzip" | "zstd") adds .gz / .zst to the
+    text formats and is used as the codec for parquet/arrow. Rows written so
+    far are kept in `rows` when `keep_rows` is set. With `out_dir=None` nothing
+    touches the disk: `close()` leaves every report's bytes in `data`.
+    """
+
+    def __init__(
+        self,
+        out_dir: Optional[str],
+        formats: Sequence[str] = ("csv", "json"),
+        compression: Optional[str] = None,
+        batch_size: int = 1024,
+        keep_rows: bool = False,
+    ):
+        unknown = [f for f in formats if f not in REPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown report format(s): {unknown}; expected {REPORT_FORMATS}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression!r}")
+        if out_dir is None and compression is not None:
+            raise ValueError("In-memory reports are not compressed")
+        if "arrow" in formats and compression == "gzip":
+            raise ValueError("Arrow IPC files support zstd or no compression, not gzip")
+        # missing optional packages fail here, before any sink is opened
+        if "parquet" in formats or "arrow" in formats:
+            _optional_import("pyarrow", "Parquet/Arrow reports")
+        if compression == "zstd" and any(f in _TEXT_FORMATS for f in formats):
+            _optional_import("zstandard", "zstd-compressed text reports")
+        if out_dir is not None:
+            Path(out_dir).mkdir(parents=True, exist_ok=True)
 
-    csv_path = str(Path(out_dir) / "report.csv")
-    json_path = str(Path(out_dir) / "report.json")
+        self.paths: Dict[str, str] = {}
+        self.data: Dict[str, bytes] = {}
+        self._buffers: Dict[str, Any] = {}
+        self.rows: Optional[List[Dict[str, Any]]] = [] if keep_rows else None
+        self.count = 0
+        self._batch_size = batch_size
+        self._batch: List[Dict[str, Any]] = []
+        self._csv = self._json = self._jsonl = self._parquet = self._arrow = None
 
-    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
-    Path(json_path).write_text(json.dumps(flags, ensure_ascii=False, indent=2), encoding="utf-8")
+        def path(name: str, text: bool) -> Any:
+            fmt = name.rsplit(".", 1)[1]
+            if out_dir is None:
+                if text:
+                    sink: Any = io.StringIO()
+                else:
+                    import pyarrow as pa
 
-    return csv_path, json_path
+                    sink = pa.BufferOutputStream()
+                self._buffers[fmt] = sink
+                return sink
+            p = str(Path(out_dir) / (name + (_SUFFIX[compression] if text else "")))
+            self.paths[fmt] = p
+            return p
+
+        def open_text(name: str, newline: Optional[str] = None) -> TextIO:
+            target = path(name, True)
+            return target if out_dir is None else _open_text(target, compression, newline=newline)
+
+        if "csv" in formats:
+            self._csv_fh = open_text("report.csv", newline="")
+            self._csv_fh.write("\ufeff")  # utf-8-sig, for spreadsheet apps
+            self._csv = csv.DictWriter(self._csv_fh, fieldnames=REPORT_COLUMNS, lineterminator="\n")
+            self._csv.writeheader()
+        if "json" in formats:
+            self._json = open_text("report.json")
+        if "jsonl" in formats:
+            self._jsonl = open_text("report.jsonl")
+        if "parquet" in formats or "arrow" in formats:
+            import pyarrow as pa
+
+            schema = _arrow_schema()
+            if "parquet" in formats:
+                import pyarrow.parquet as pq
+
+                self._parquet = pq.ParquetWriter(path("report.parquet", False), schema, compression=compression or "none")
+            if "arrow" in formats:
+                options = pa.ipc.IpcWriteOptions(compression=compression)
+                self._arrow = pa.ipc.new_file(path("report.arrow", False), schema, options=options)
+
+    def write(self, flag: Dict[str, Any]) -> None:
+        row = make_report_row(flag)
+        if self._csv is not None:
+            self._csv.writerow(row)
+        if self._json is not None:
+            # same bytes as json.dumps(flags, indent=2), one element at a time
+            body = json.dumps(flag, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            self._json.write(("[\n  " if self.count == 0 else ",\n  ") + body)
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(flag, ensure_ascii=False) + "\n")
+        if self._parquet is not None or self._arrow is not None:
+            self._batch.append(row)
+            if len(self._batch) >= self._batch_size:
+                self._flush_batch()
+        if self.rows is not None:
+            self.rows.append(row)
+        self.count += 1
+
+    def write_all(self, flags: Iterable[Dict[str, Any]]) -> None:
+        for f in flags:
+            self.write(f)
+
+    def _flush_batch(self) -> None:
+        if not self._batch:
+            return
+        import pyarrow as pa
+
+        batch = pa.RecordBatch.from_pylist(self._batch, schema=_arrow_schema())
+        if self._parquet is not None:
+            self._parquet.write_batch(batch)
+        if self._arrow is not None:
+            self._arrow.write_batch(batch)
+        self._batch = []
+
+    def close(self) -> Dict[str, str]:
+        if self._json is not None:
+            self._json.write("\n]" if self.count else "[]")
+        self._flush_batch()
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._arrow is not None:
+            self._arrow.close()
+        for fmt, sink in self._buffers.items():
+            value = sink.getvalue()
+            self.data[fmt] = value.encode("utf-8") if isinstance(value, str) else value.to_pybytes()
+        if self._csv is not None:
+            self._csv_fh.close()
+        for fh in (self._json, self._jsonl):
+            if fh is not None:
+                fh.close()
+        return self.paths
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def write_reports(
+    out_dir: str,
+    flags: Iterable[Dict[str, Any]],
+    formats: Sequence[str] = ("csv", "json"),
+    compression: Optional[str] = None,
+) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """Stream `flags` into every format; returns {format: path} and the report table rows."""
+    with ReportWriter(out_dir, formats=formats, compression=compression, keep_rows=True) as w:
+        w.write_all(flags)
+    return w.paths, w.rows or []
+
+
+def render_reports(
+    flags: Iterable[Dict[str, Any]],
+    formats: Sequence[str] = ("csv", "json"),
+) -> Tuple[Dict[str, bytes], List[Dict[str, Any]]]:
+    """In-memory `write_reports`: returns {format: bytes} and the report table rows."""
+    with ReportWriter(None, formats=formats, keep_rows=True) as w:
+        w.write_all(flags)
+    return w.data, w.rows or []
+
+
+def write_report(out_dir: str, flags: List[Dict[str, Any]]) -> Tuple[str, str]:
+    paths, _ = write_reports(out_dir, flags)
+    return paths["csv"], paths["json"]
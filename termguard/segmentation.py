@@ -0,0 +1,111 @@
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+SEGMENTATION_MODES = ("jieba", "glossary", "anchored")
+
+# glossary tokenizers built in this process, by ZhSegmenter.key
+_TOKENIZERS: "OrderedDict[str, Any]" = OrderedDict()
+_MAX_TOKENIZERS = 4
+_lock = threading.Lock()
+
+
+def _build_tokenizer(words: Tuple[str, ...]):
+    import jieba
+
+    jieba.initialize()
+    tk = jieba.Tokenizer()
+    # start from the already loaded default dictionary instead of re-reading it
+    tk.FREQ, tk.total, tk.initialized = dict(jieba.dt.FREQ), jieba.dt.total, True
+    for w in words:
+        tk.add_word(w)
+    return tk
+
+
+class ZhSegmenter:
+    """
+    ZH segmentation and candidate generation settings for one run.
+
+    mode="jieba" is plain jieba with its default dictionary. mode="glossary"
+    segments with a run-scoped jieba.Tokenizer that has `words` (glossary ZH
+    terms and their variants) as user words, so a rendering like 无人机项目
+    is one token instead of pieces the n-gram window has to re-join.
+    mode="anchored" also treats those tokens as anchors: in a sentence that
+    contains one, only n-grams within `window` tokens of an anchor are
+    generated. Sentences without an anchor keep every n-gram, since that is
+    where deviating renderings show up.
+
+    Picklable; worker processes build (and keep) their own tokenizer.
+    """
+
+    def __init__(self, mode: str = "jieba", words: Iterable[str] = (), window: int = 2):
+        if mode not in SEGMENTATION_MODES:
+            raise ValueError(f"Unknown ZH segmentation: {mode!r}")
+        self.mode = mode
+        self.words: Tuple[str, ...] = ()
+        if mode != "jieba":
+            self.words = tuple(dict.fromkeys(w.strip() for w in words if w and w.strip()))
+        self.window = window
+        self.anchors = frozenset(self.words) if mode == "anchored" else None
+        self.key = self._key()
+
+    @classmethod
+    def for_glossary(
+        cls,
+        mode: str = "jieba",
+        glossary: Optional[Mapping[str, str]] = None,
+        window: int = 2,
+    ) -> "ZhSegmenter":
+        from .align import _glossary_variants
+
+        words: List[str] = []
+        for pref in (glossary or {}).values() if mode != "jieba" else ():
+            words.append(pref)
+            words.extend(_glossary_variants(pref))
+        return cls(mode, words, window)
+
+    def _key(self) -> str:
+        """Identifies the segmentation for caches; "" for plain jieba."""
+        if self.mode == "jieba":
+            return ""
+        h = hashlib.blake2b(digest_size=8)
+        h.update(f"{self.mode}\0{self.window}\0".encode("utf-8"))
+        h.update("\0".join(self.words).encode("utf-8"))
+        return h.hexdigest()
+
+    def _tokenizer(self):
+        tk = self.__dict__.get("_tk")
+        if tk is not None:
+            return tk
+        key = self.key
+        with _lock:
+            tk = _TOKENIZERS.get(key)
+            if tk is None:
+                tk = _TOKENIZERS[key] = _build_tokenizer(self.words)
+                while len(_TOKENIZERS) > _MAX_TOKENIZERS:
+                    _TOKENIZERS.popitem(last=False)
+            else:
+                _TOKENIZERS.move_to_end(key)
+        self._tk = tk
+        return tk
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop("_tk", None)
+        return state
+
+    def tokenize(self, s: str) -> List[str]:
+        if self.mode == "jieba" or not self.words:
+            from . import align
+
+            return align.zh_tokenize(s)
+        return [t.strip() for t in self._tokenizer().lcut(s) if t.strip()]
+
+    def sentence_counts(self, table, s: str, max_n: int = 4) -> Tuple[Dict[int, int], int]:
+        """`table.sentence_counts` of `s` under this segmentation."""
+        return table.sentence_counts(self.tokenize(s), max_n, anchors=self.anchors, window=self.window)
+
+    def __repr__(self) -> str:
+        return f"ZhSegmenter(mode={self.mode!r}, words={len(self.words)}, window={self.window})"
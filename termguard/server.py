@@ -0,0 +1,195 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, Optional, Tuple
+
+from .config import TermGuardConfig
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+# per-process warm state, filled once by _init_worker (process pools only)
+_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(glossary: Dict[str, str], config: TermGuardConfig) -> None:
+    from .engine import TermGuardEngine
+
+    _STATE["engine"] = TermGuardEngine(glossary, config)
+
+
+def _check(
+    en_text: str, zh_text: str, glossary: Optional[Dict[str, str]], engine: Optional[Any] = None
+) -> Dict[str, Any]:
+    from .pipeline import check_texts
+
+    engine = engine or _STATE["engine"]
+    if glossary is None:
+        result = engine.check(en_text, zh_text)
+    else:
+        result = check_texts(en_text, zh_text, glossary=glossary, config=engine.config)
+    return {
+        "aligned_pairs": result["aligned_pairs"],
+        "flags": result["flags"],
+        "mappings": {k: [list(c) for c in v] for k, v in result["mappings"].items()},
+        "patched_zh": result["patched_zh"],
+        "stage_times": result["stage_times"],
+    }
+
+
+class TermGuardServer:
+    """
+    Local HTTP/JSON front end for the pipeline.
+
+    POST /check with {"en": ..., "zh": ..., "glossary": {...}?} returns flags,
+    mappings and the patched ZH text; nothing is written to disk. The
+    pipeline runs on an executor whose workers keep jieba and the startup
+    glossary warm, so the event loop keeps accepting requests meanwhile.
+    GET /health reports liveness.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        glossary: Optional[Dict[str, str]] = None,
+        config: Optional[TermGuardConfig] = None,
+        workers: int = 1,
+        use_processes: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.glossary = glossary or {}
+        # requests are the unit of parallelism; no nested alignment pools
+        self.config = replace(config or TermGuardConfig(), align_workers=1)
+        self.workers = workers
+        self.use_processes = use_processes
+        self.logger = logging.getLogger("termguard.server")
+        self._executor: Optional[Executor] = None
+        self._engine: Optional[Any] = None  # shared by all threads when use_processes=False
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> int:
+        """Bind and start serving; returns the bound port (useful with port=0)."""
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(self.glossary, self.config)
+            )
+        else:
+            from .engine import TermGuardEngine
+
+            # one engine serves every thread; build it off the event loop
+            self._executor = ThreadPoolExecutor(self.workers)
+            self._engine = await asyncio.get_running_loop().run_in_executor(
+                self._executor, TermGuardEngine, self.glossary, self.config
+            )
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"[serve] listening on http://{self.host}:{self.port}")
+        return self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            status, payload = await self._dispatch(reader)
+        except Exception as e:
+            self.logger.exception("[serve] request failed")
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("ascii") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> Tuple[int, Any]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) < 2:
+            return 400, {"error": "malformed request line"}
+        method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            k, _, v = line.partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path != "/check":
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return 400, {"error": "invalid Content-Length"}
+        if length > MAX_BODY_BYTES:
+            return 413, {"error": f"body exceeds {MAX_BODY_BYTES} bytes"}
+        try:
+            req = json.loads(await reader.readexactly(length) or b"{}")
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            return 400, {"error": f"invalid JSON body: {e}"}
+        if not isinstance(req, dict) or not isinstance(req.get("en"), str) or not isinstance(req.get("zh"), str):
+            return 400, {"error": "body must be a JSON object with string fields 'en' and 'zh'"}
+        glossary = req.get("glossary")
+        if glossary is not None and not (
+            isinstance(glossary, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in glossary.items())
+        ):
+            return 400, {"error": "'glossary' must be an object of en_term -> zh_term strings"}
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, _check, req["en"], req["zh"], glossary, self._engine)
+        return 200, result
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    glossary: Optional[Dict[str, str]] = None,
+    config: Optional[TermGuardConfig] = None,
+    workers: int = 1,
+) -> None:
+    server = TermGuardServer(host, port, glossary=glossary, config=config, workers=workers)
+
+    async def _main() -> None:
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
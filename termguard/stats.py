@@ -0,0 +1,168 @@
+from __future__ import annotations
+import gzip
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .align import _select_candidates
+
+STATS_FORMAT = "termguard-stats"
+STATS_VERSION = 2  # 2: count-shaping settings are recorded and checked on merge
+
+
+class CorpusStats:
+    """
+    Mergeable per-term alignment statistics.
+
+    For every EN term: the number of sentence pairs it occurred in, the
+    count of every ZH candidate n-gram over those pairs (in first-occurrence
+    order) and the glossary variants seen next to it. These are exactly what
+    candidate selection reads, so stats of several documents merged in
+    document order select the same candidates as one run over all of them
+    with the same terms. Merging is associative: merged stats can be saved
+    and merged again (map-reduce across processes or machines).
+
+    Each document only counts the terms it aligned (usually its own
+    extracted terms). A term missing from some documents' stats is listed
+    in `partial_terms`: its pairs and counts cover only the documents that
+    had it, so they undercount what one run over all of them would see.
+    Use one shared term list (e.g. a glossary) for every document to avoid it.
+
+    Only stats counted the same way can be merged: `zh_ngram_max`,
+    `segmentation` and every entry of `settings` (anchor window, segmenter
+    vocabulary, sentence pairing, exact or approximate counting; see
+    pipeline._count_settings) must match, otherwise merge raises ValueError.
+    """
+
+    def __init__(
+        self, zh_ngram_max: int = 4, segmentation: str = "jieba", settings: Optional[Mapping[str, Any]] = None
+    ):
+        self.zh_ngram_max = zh_ngram_max
+        self.segmentation = segmentation
+        self.settings: Dict[str, Any] = dict(settings or {})
+        self.documents = 0
+        self.aligned_pairs = 0
+        # term -> (pairs, candidate counts, variants seen)
+        self.terms: Dict[str, Tuple[int, Counter, List[str]]] = {}
+        # terms some merged document did not align, in first-seen order
+        self.partial_terms: List[str] = []
+
+    @classmethod
+    def from_alignment(
+        cls,
+        term_stats: Mapping[str, Tuple[int, Counter, List[str]]],
+        aligned_pairs: int,
+        zh_ngram_max: int = 4,
+        segmentation: str = "jieba",
+        settings: Optional[Mapping[str, Any]] = None,
+    ) -> "CorpusStats":
+        """Stats of one document from `align_terms(..., term_stats=...)`."""
+        stats = cls(zh_ngram_max, segmentation, settings)
+        stats.documents = 1
+        stats.aligned_pairs = aligned_pairs
+        for term, (pairs, counts, variants) in term_stats.items():
+            stats.terms[term] = (pairs, Counter(counts), list(variants))
+        return stats
+
+    def merge(self, other: "CorpusStats") -> "CorpusStats":
+        """Add `other` (the later document) into these stats, in place."""
+        if other.zh_ngram_max != self.zh_ngram_max:
+            raise ValueError(
+                f"Cannot merge stats built with zh_ngram_max={other.zh_ngram_max} into {self.zh_ngram_max}"
+            )
+        if other.segmentation != self.segmentation:
+            raise ValueError(
+                f"Cannot merge stats built with {other.segmentation!r} segmentation into {self.segmentation!r}"
+            )
+        for key in dict.fromkeys([*self.settings, *other.settings]):
+            mine, theirs = self.settings.get(key), other.settings.get(key)
+            if mine != theirs:
+                raise ValueError(f"Cannot merge stats built with {key}={theirs!r} into {key}={mine!r}")
+        if self.documents and other.documents:
+            missing = [t for t in self.terms if t not in other.terms] + [t for t in other.terms if t not in self.terms]
+        else:
+            missing = []
+        self.partial_terms = list(dict.fromkeys(self.partial_terms + other.partial_terms + missing))
+        self.documents += other.documents
+        self.aligned_pairs += other.aligned_pairs
+        for term, (pairs, counts, variants) in other.terms.items():
+            mine = self.terms.get(term)
+            if mine is None:
+                self.terms[term] = (pairs, Counter(counts), list(variants))
+                continue
+            my_counts = mine[1]
+            my_counts.update(counts)  # new grams go last: first occurrence stays in document order
+            self.terms[term] = (mine[0] + pairs, my_counts, list(dict.fromkeys(mine[2] + variants)))
+        return self
+
+    def to_mappings(
+        self,
+        max_candidates: int = 5,
+        glossary: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, List[Tuple[str, float, int]]]:
+        """Scored candidates per term, as `align_terms` returns them."""
+        glossary = dict(glossary or {})
+        # glossary terms in glossary order (what a single run selects), then the rest
+        order = [t for t in glossary if t in self.terms] + [t for t in self.terms if t not in glossary]
+        mappings: Dict[str, List[Tuple[str, float, int]]] = {}
+        for term in order:
+            pairs, counts, variants = self.terms[term]
+            if not pairs:
+                mappings[term] = []
+                continue
+            mappings[term] = _select_candidates(
+                term, Counter(counts), pairs, set(variants).__contains__, max_candidates, glossary
+            )
+        return mappings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": STATS_FORMAT,
+            "version": STATS_VERSION,
+            "zh_ngram_max": self.zh_ngram_max,
+            "segmentation": self.segmentation,
+            "settings": self.settings,
+            "documents": self.documents,
+            "aligned_pairs": self.aligned_pairs,
+            "terms": {
+                term: {"pairs": pairs, "counts": list(counts.items()), "variants": variants}
+                for term, (pairs, counts, variants) in self.terms.items()
+            },
+            "partial_terms": self.partial_terms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CorpusStats":
+        if data.get("format") != STATS_FORMAT or data.get("version") != STATS_VERSION:
+            raise ValueError(f"Not a {STATS_FORMAT} v{STATS_VERSION} file")
+        stats = cls(int(data["zh_ngram_max"]), data["segmentation"], data["settings"])
+        stats.documents = int(data["documents"])
+        stats.aligned_pairs = int(data["aligned_pairs"])
+        for term, t in data["terms"].items():
+            stats.terms[term] = (int(t["pairs"]), Counter(dict(t["counts"])), list(t["variants"]))
+        stats.partial_terms = list(data.get("partial_terms", []))
+        return stats
+
+    def save(self, path: str) -> str:
+        """Write gzip-compressed JSON (conventionally *.json.gz)."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, ensure_ascii=False, separators=(",", ":"))
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "CorpusStats":
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def merge_stats_files(paths: Iterable[str]) -> CorpusStats:
+    """Merge saved stats in the given (document) order."""
+    merged: Optional[CorpusStats] = None
+    for path in paths:
+        stats = CorpusStats.load(path)
+        merged = stats if merged is None else merged.merge(stats)
+    if merged is None:
+        raise ValueError("No stats files to merge")
+    return merged
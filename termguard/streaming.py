@@ -0,0 +1,302 @@
+from __future__ import annotations
+import queue
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .align import (
+    ZhGramTable, _glossary_variants, _init_align_worker, _keep_mask, _materialize, _pinned_ids,
+    _select_candidates,
+)
+from .segmentation import ZhSegmenter
+from .term_index import EnTermMatcher
+
+_TABLE_RESET = 1_000_000
+
+_DONE = object()
+
+
+class _Segmenter:
+    """
+    Segmenter stage: matches each EN sentence of a batch against the terms and
+    turns the ZH side of every matching pair into candidate counts.
+
+    Returns (term ids, {gram: count}, n-grams generated, zh) for matching
+    pairs only, in input order. With a shared `table` (one segmenter thread
+    feeding the counter in the same process) grams are that table's ids;
+    otherwise they travel as strings, since ids are local to a process.
+    """
+
+    def __init__(self, terms_lower: List[str], zh_ngram_max: int, table: Optional[ZhGramTable] = None,
+                 segmenter: Optional[ZhSegmenter] = None):
+        self.matcher = EnTermMatcher(terms_lower)
+        self.zh_ngram_max = zh_ngram_max
+        self.table = table
+        self.segmenter = segmenter or ZhSegmenter()
+
+    def __call__(self, batch: List[Tuple[str, str]]) -> List[Tuple[List[int], Dict[Any, int], int, str]]:
+        table = self.table
+        if table is None:
+            table = _local_table()
+        out = []
+        for en, zh in batch:
+            tids = self.matcher.match(en.lower())
+            if tids:
+                counts, generated = self.segmenter.sentence_counts(table, zh, self.zh_ngram_max)
+                if self.table is None:
+                    counts = {table.grams[g]: c for g, c in counts.items()}
+                out.append((tids, counts, generated, zh))
+        return out
+
+
+_worker_table: Optional[ZhGramTable] = None
+
+
+def _local_table() -> ZhGramTable:
+    # a worker's own intern table is only a cache; start over once it is large
+    global _worker_table
+    if _worker_table is None or len(_worker_table) > _TABLE_RESET:
+        _worker_table = ZhGramTable()
+    return _worker_table
+
+
+_worker_segmenter: Optional[_Segmenter] = None
+
+
+def _init_stream_worker(terms_lower: List[str], zh_ngram_max: int, segmenter: Optional[ZhSegmenter]) -> None:
+    global _worker_segmenter
+    _init_align_worker()
+    _worker_segmenter = _Segmenter(terms_lower, zh_ngram_max, segmenter=segmenter)
+
+
+def _segment_in_worker(batch: List[Tuple[str, str]]):
+    return _worker_segmenter(batch)
+
+
+def _put(q: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    # blocking put that gives up once the consumer has stopped
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _CoCounts:
+    """
+    Running gram counts per term for the counter stage.
+
+    Each term buffers incoming (gram id, count) runs in int64 arrays; a full
+    buffer is folded into the term's totals, kept in first-occurrence order
+    like `align._counter_term_counts` builds them. Memory tracks the distinct
+    (term, gram) pairs rather than the corpus.
+    """
+
+    def __init__(self, n_terms: int, compact_every: int = 4096):
+        self.compact_every = compact_every
+        self._buf_gids = [array("q") for _ in range(n_terms)]
+        self._buf_cnts = [array("q") for _ in range(n_terms)]
+        self._gids: List[Any] = [None] * n_terms
+        self._cnts: List[Any] = [None] * n_terms
+
+    def add(self, t: int, counts: Dict[int, int]) -> None:
+        buf = self._buf_gids[t]
+        buf.extend(counts)
+        self._buf_cnts[t].extend(counts.values())
+        # folding re-sorts the totals, so let the buffer grow with them
+        done = self._gids[t]
+        if len(buf) >= max(self.compact_every, 0 if done is None else len(done)):
+            self._compact(t)
+
+    def _compact(self, t: int) -> None:
+        import numpy as np
+
+        gids = np.frombuffer(self._buf_gids[t], dtype=np.int64)
+        cnts = np.frombuffer(self._buf_cnts[t], dtype=np.int64)
+        if self._gids[t] is not None:
+            # earlier totals come first, so first occurrences stay in stream order
+            gids = np.concatenate([self._gids[t], gids])
+            cnts = np.concatenate([self._cnts[t], cnts])
+        uniq, first, inverse = np.unique(gids, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=cnts, minlength=len(uniq)).astype(np.int64)
+        order = np.argsort(first, kind="stable")
+        self._gids[t], self._cnts[t] = uniq[order], totals[order]
+        self._buf_gids[t], self._buf_cnts[t] = array("q"), array("q")
+
+    def by_term(self, t: int):
+        """Gram ids and totals of term `t`, in first-occurrence order."""
+        if len(self._buf_gids[t]) or self._gids[t] is None:
+            self._compact(t)
+        return self._gids[t], self._cnts[t]
+
+
+def pipelined_align_terms(
+    pairs: Iterable[Tuple[str, str]],
+    en_terms: List[str],
+    zh_ngram_max: int = 4,
+    max_candidates: int = 5,
+    glossary: Optional[Dict[str, str]] = None,
+    workers: int = 1,
+    queue_size: int = 8,
+    batch_size: int = 256,
+    stats: Optional[Dict[str, int]] = None,
+    term_stats: Optional[Dict[str, Tuple[int, Counter, List[str]]]] = None,
+    approx_width: Optional[int] = None,
+    segmenter: Optional[ZhSegmenter] = None,
+) -> Dict[str, List[Tuple[str, float, int]]]:
+    """
+    `align_terms` (counter engine) as one streaming pass over `pairs`.
+
+    Three stages run concurrently, joined by bounded queues:
+    reader (a thread draining `pairs` into batches of `batch_size`) ->
+    segmenter (a thread pool, or a process pool of `workers` when workers > 1)
+    -> counter (the calling thread, consuming batch results in order).
+    At most `queue_size` batches wait in each queue; a slow stage blocks the
+    ones before it, so memory is bounded by the queues plus the per-term
+    counts, never by the corpus. Mappings (and `term_stats`) equal
+    align_terms(..., engine="counter"); with `approx_width` each term is
+    counted in a Space-Saving summary instead, as with engine="approx".
+    """
+    glossary = glossary or {}
+    terms = list(dict.fromkeys(en_terms))
+    table = ZhGramTable()
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor: Any = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_stream_worker,
+            initargs=([t.lower() for t in terms], zh_ngram_max, segmenter),
+        )
+        task: Any = _segment_in_worker
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # a single segmenter thread may intern straight into the counter's table
+        executor = ThreadPoolExecutor(max_workers=1)
+        task = _Segmenter([t.lower() for t in terms], zh_ngram_max, table=table, segmenter=segmenter)
+
+    batches: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    results: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def read() -> None:
+        try:
+            batch: List[Tuple[str, str]] = []
+            for pair in pairs:
+                batch.append(pair)
+                if len(batch) >= batch_size:
+                    if not _put(batches, batch, stop):
+                        return
+                    batch = []
+            if batch:
+                _put(batches, batch, stop)
+            _put(batches, _DONE, stop)
+        except BaseException as e:
+            _put(batches, e, stop)
+
+    def dispatch() -> None:
+        while True:
+            item = batches.get()
+            if item is _DONE or isinstance(item, BaseException):
+                _put(results, item, stop)
+                return
+            # futures are queued in submission order, so counting stays in sentence order
+            if not _put(results, executor.submit(task, item), stop):
+                return
+
+    co = _CoCounts(len(terms))
+    summaries = None
+    if approx_width is not None:
+        from .heavy_hitters import SpaceSaving
+
+        # pinned grams are interned up front, before any segmenter thread shares the table
+        summaries = [
+            SpaceSaving(approx_width, pinned=[
+                table.intern_gram(g) for g in [glossary[t]] + _glossary_variants(glossary[t])
+            ] if t in glossary else ())
+            for t in terms
+        ]
+    n_pairs = [0] * len(terms)
+    variants = [_glossary_variants(glossary[t]) if t in glossary else [] for t in terms]
+    seen_variants: List[set] = [set() for _ in terms]
+    sentences_aligned = ngrams_generated = ngrams_kept = 0
+
+    threads = [threading.Thread(target=read, daemon=True), threading.Thread(target=dispatch, daemon=True)]
+    for th in threads:
+        th.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            for tids, counts, generated, zh in item.result():
+                if workers > 1:
+                    counts = {table.intern_gram(g): c for g, c in counts.items()}
+                sentences_aligned += 1
+                ngrams_generated += generated
+                ngrams_kept += sum(counts.values())
+                for t in tids:
+                    if summaries is None:
+                        co.add(t, counts)
+                    else:
+                        summary = summaries[t]
+                        for gid, c in counts.items():
+                            summary.add(gid, c)
+                    n_pairs[t] += 1
+                    for v in variants[t]:
+                        if v in zh:
+                            seen_variants[t].add(v)
+    finally:
+        stop.set()
+        while True:  # unblock a dispatcher waiting on an empty queue
+            try:
+                batches.put_nowait(_DONE)
+                break
+            except queue.Full:
+                try:
+                    batches.get_nowait()
+                except queue.Empty:
+                    pass
+        for th in threads:
+            th.join()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    mapped: Dict[str, List[Tuple[str, float, int]]] = {}
+    for t, term in enumerate(terms):
+        if not n_pairs[t]:
+            if term_stats is not None:
+                term_stats[term] = (0, Counter(), [])
+            mapped[term] = []
+            continue
+        if summaries is None:
+            gids, cnts = co.by_term(t)
+            prune = None if term_stats is not None else max_candidates
+            keep = _keep_mask(gids, cnts, _pinned_ids(term, glossary, table), prune)
+            counts: Counter = _materialize(table, gids[keep], cnts[keep])
+        else:
+            counts = Counter({table.grams[g]: c for g, c in summaries[t].counts.items()})
+        if term_stats is not None:
+            term_stats[term] = (n_pairs[t], Counter(counts), [v for v in variants[t] if v in seen_variants[t]])
+        mapped[term] = _select_candidates(
+            term, counts, n_pairs[t], seen_variants[t].__contains__, max_candidates, glossary
+        )
+
+    if stats is not None:
+        stats.update(
+            terms=len(terms),
+            terms_matched=sum(1 for n in n_pairs if n),
+            sentences_aligned=sentences_aligned,
+            sentences_segmented=sentences_aligned,
+            ngrams_generated=ngrams_generated,
+            ngrams_kept=ngrams_kept,
+        )
+        if summaries is not None:
+            stats["approx_evictions"] = sum(s.evictions for s in summaries)
+    return {term: mapped[term] for term in en_terms}
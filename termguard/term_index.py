@@ -0,0 +1,88 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from .utils import contains_en_term
+
+_WORD = re.compile(r"\w+")
+_ALNUM_TERM = re.compile(r"[a-z0-9 ]+")
+
+
+class EnTermIndex:
+    """
+    Inverted index over lowercased EN sentences, built in a single pass.
+
+    Lookups keep the semantics of `utils.contains_en_term`: alphanumeric terms
+    must match on word boundaries, anything else falls back to substring search.
+    For boundary terms every word of the term is a whole `\\w+` token of the
+    sentence, so the posting lists narrow the candidates before the regex check.
+    """
+
+    def __init__(self, sentences_lower: Iterable[str]):
+        self.sentences: List[str] = list(sentences_lower)
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for i, s in enumerate(self.sentences):
+            for tok in set(_WORD.findall(s)):
+                self.postings[tok].append(i)
+        self._hits: Dict[str, List[int]] = {}
+
+    def lookup(self, term_lower: str) -> List[int]:
+        """Sentence ids (ascending) that contain `term_lower`."""
+        hits = self._hits.get(term_lower)
+        if hits is None:
+            hits = self._hits[term_lower] = self._lookup(term_lower)
+        return hits
+
+    def _lookup(self, term_lower: str) -> List[int]:
+        if not _ALNUM_TERM.fullmatch(term_lower):
+            return [i for i, s in enumerate(self.sentences) if term_lower in s]
+
+        words = term_lower.split()
+        if not words:
+            return [i for i, s in enumerate(self.sentences) if contains_en_term(s, term_lower)]
+
+        lists = sorted((self.postings.get(w, []) for w in set(words)), key=len)
+        if not lists[0]:
+            return []
+        cand = set(lists[0])
+        for other in lists[1:]:
+            cand.intersection_update(other)
+            if not cand:
+                return []
+
+        if len(words) == 1 and term_lower == words[0]:
+            return sorted(cand)
+        return sorted(i for i in cand if contains_en_term(self.sentences[i], term_lower))
+
+    def lookup_all(self, terms_lower: Iterable[str]) -> Dict[str, List[int]]:
+        return {t: self.lookup(t) for t in terms_lower}
+
+
+class EnTermMatcher:
+    """
+    Streaming counterpart of EnTermIndex: the terms are indexed instead of
+    the sentences, so each sentence can be matched on its own as it streams
+    by, with the same `contains_en_term` semantics.
+    """
+
+    def __init__(self, terms_lower: Iterable[str]):
+        self.terms: List[str] = list(terms_lower)
+        self.by_word: Dict[str, List[int]] = defaultdict(list)
+        self.scan: List[int] = []  # terms checked against every sentence
+        for t, term in enumerate(self.terms):
+            words = term.split() if _ALNUM_TERM.fullmatch(term) else []
+            if words:
+                # every word of a boundary match is a whole token; index the first
+                self.by_word[words[0]].append(t)
+            else:
+                self.scan.append(t)
+
+    def match(self, sentence_lower: str) -> List[int]:
+        """Ids (ascending) of the terms `sentence_lower` contains."""
+        hits = [t for t in self.scan if contains_en_term(sentence_lower, self.terms[t])]
+        for tok in set(_WORD.findall(sentence_lower)):
+            for t in self.by_word.get(tok, ()):
+                term = self.terms[t]
+                if term == tok or contains_en_term(sentence_lower, term):
+                    hits.append(t)
+        return sorted(hits)
@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from time import perf_counter
 from pathlib import Path
 
@@ -39,6 +40,10 @@ class Timer:
 def contains_en_term(sentence_lower: str, term_lower: str) -> bool:
     # boundary-safe for alphabetic terms; fallback to substring
     if re.fullmatch(r"[a-z0-9 ]+", term_lower):
-        pat = r"\b" + re.escape(term_lower) + r"\b"
-        return re.search(pat, sentence_lower) is not None
+        return _boundary_pattern(term_lower).search(sentence_lower) is not None
     return term_lower in sentence_lower
+
+
+@lru_cache(maxsize=4096)
+def _boundary_pattern(term_lower: str) -> "re.Pattern[str]":
+    return re.compile(r"\b" + re.escape(term_lower) + r"\b")
@@ -0,0 +1,309 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .align import ZhGramTable, _glossary_variants, _select_candidates
+from .config import TermGuardConfig
+from .consistency import detect_inconsistencies
+from .preprocess import align_sentence_pairs, align_sentence_streams, line_sentences
+from .segmentation import ZhSegmenter
+from .term_index import EnTermMatcher
+from .utils import read_text
+
+
+def _common_ends(old: List[Any], new: List[Any]) -> Tuple[int, int, int]:
+    """(lo, hi_old, hi_new): old[:lo] == new[:lo] and old[hi_old:] == new[hi_new:], both maximal."""
+    n = min(len(old), len(new))
+    lo = 0
+    while lo < n and old[lo] == new[lo]:
+        lo += 1
+    hi_old, hi_new = len(old), len(new)
+    while hi_old > lo and hi_new > lo and old[hi_old - 1] == new[hi_new - 1]:
+        hi_old -= 1
+        hi_new -= 1
+    return lo, hi_old, hi_new
+
+
+class IncrementalChecker:
+    """
+    Consistency state that is updated in place as sentence pairs change.
+
+    `update(pairs)` diffs the new pairs against the current ones, subtracts
+    the removed pairs' ZH candidate counts from the terms they matched, adds
+    the new pairs' counts, and re-scores and re-flags only the affected
+    terms. ZH segmentation is cached per sentence text and sentence
+    splitting per line, so a one-line edit costs roughly one sentence of
+    work plus one scan over the pair list. Mappings and flags equal those of
+    a full run with the same terms.
+    """
+
+    def __init__(
+        self,
+        en_terms: Iterable[str],
+        glossary: Optional[Mapping[str, str]] = None,
+        config: Optional[TermGuardConfig] = None,
+    ):
+        self.cfg = config or TermGuardConfig()
+        self.glossary = dict(glossary or {})
+        self.terms: List[str] = list(dict.fromkeys(en_terms))
+        self.matcher = EnTermMatcher([t.lower() for t in self.terms])
+        self.table = ZhGramTable()
+        self.segmenter = ZhSegmenter.for_glossary(self.cfg.zh_segmentation, self.glossary, self.cfg.zh_anchor_window)
+        self.pairs: List[Tuple[str, str]] = []
+        self._pair_terms: List[List[int]] = []
+        self._features: Dict[str, Dict[int, int]] = {}
+        self._counts: Dict[int, Counter] = {}
+        self._n_pairs: Dict[int, int] = {}
+        self._mappings: Dict[int, List[Tuple[str, float, int]]] = {}
+        self._flags: Dict[int, Dict[str, Any]] = {}
+        # lang -> (lines, sentences per line, sentences) of the last split
+        self._lines: Dict[str, Tuple[List[str], List[List[str]], List[str]]] = {
+            "en": ([], [], []), "zh": ([], [], [])
+        }
+
+    @classmethod
+    def for_texts(
+        cls,
+        en_text: str,
+        zh_text: str,
+        glossary: Optional[Mapping[str, str]] = None,
+        config: Optional[TermGuardConfig] = None,
+    ) -> "IncrementalChecker":
+        """
+        Checker with the terms a full run would use: every multi-word glossary
+        term (absent ones simply never match), or without a glossary the terms
+        extracted from these texts, which then stay fixed across updates.
+        Call `update_texts` to load the texts.
+        """
+        cfg = config or TermGuardConfig()
+        if glossary:
+            return cls([t for t in glossary if " " in t], glossary, cfg)
+        from .instrument import Instrumentation
+        from .pipeline import _extract_terms
+
+        pairs = align_sentence_pairs(
+            en_text, zh_text, method=cfg.sentence_aligner, glossary=None, band=cfg.aligner_band
+        )
+        en_sents = [en for en, _ in pairs]
+        _, en_terms = _extract_terms(en_sents, en_sents, {}, cfg, Instrumentation(), logging.getLogger("termguard"))
+        return cls(en_terms, glossary, cfg)
+
+    @property
+    def mappings(self) -> Dict[str, List[Tuple[str, float, int]]]:
+        return {self.terms[t]: m for t, m in sorted(self._mappings.items())}
+
+    @property
+    def flags(self) -> List[Dict[str, Any]]:
+        flags = [self._flags[t] for t in sorted(self._flags)]
+        flags.sort(key=lambda x: x["severity"], reverse=True)
+        return flags
+
+    def split(self, text: str, lang: str) -> List[str]:
+        """Sentences of `text`, re-splitting only the lines changed since the previous call."""
+        lines = text.splitlines()
+        old_lines, per_line, sents = self._lines[lang]
+        lo, hi_old, hi_new = _common_ends(old_lines, lines)
+        mid = [[s for _, _, s in line_sentences(ln, lang)] for ln in lines[lo:hi_new]]
+        start = sum(map(len, per_line[:lo]))
+        end = len(sents) - sum(map(len, per_line[hi_old:]))
+        sents = sents[:start] + [s for got in mid for s in got] + sents[end:]
+        self._lines[lang] = (lines, per_line[:lo] + mid + per_line[hi_old:], sents)
+        return sents
+
+    def update_texts(self, en_text: str, zh_text: str) -> Dict[str, Any]:
+        pairs = align_sentence_streams(
+            self.split(en_text, "en"), self.split(zh_text, "zh"),
+            method=self.cfg.sentence_aligner, glossary=self.glossary, band=self.cfg.aligner_band,
+        )
+        return self.update(pairs)
+
+    def update(self, pairs: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """Move to `pairs`; returns what changed and the current flags."""
+        t0 = time.perf_counter()
+        old, new = self.pairs, list(pairs)
+        lo, hi_old, hi_new = _common_ends(old, new)
+
+        affected: Set[int] = set()
+        removed = added = 0
+        pair_terms = self._pair_terms[:lo]
+        ops = SequenceMatcher(None, old[lo:hi_old], new[lo:hi_new], autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in ops:
+            if tag == "equal":
+                pair_terms.extend(self._pair_terms[lo + i1:lo + i2])
+                continue
+            for i in range(lo + i1, lo + i2):
+                removed += 1
+                self._apply(self._pair_terms[i], old[i][1], -1, affected)
+            for j in range(lo + j1, lo + j2):
+                added += 1
+                tids = self.matcher.match(new[j][0].lower())
+                self._apply(tids, new[j][1], 1, affected)
+                pair_terms.append(tids)
+        pair_terms.extend(self._pair_terms[hi_old:])
+        self.pairs, self._pair_terms = new, pair_terms
+
+        if len(self._features) > 2 * len(new) + 1024:
+            live = {zh for _, zh in new}
+            self._features = {zh: f for zh, f in self._features.items() if zh in live}
+
+        before = {self.terms[t] for t in self._flags}
+        self._rescore(affected)
+        after = {self.terms[t] for t in self._flags}
+        return {
+            "pairs": len(new),
+            "removed_pairs": removed,
+            "added_pairs": added,
+            "affected_terms": [self.terms[t] for t in sorted(affected)],
+            "new_flags": sorted(after - before),
+            "resolved_flags": sorted(before - after),
+            "flags": self.flags,
+            "elapsed": time.perf_counter() - t0,
+        }
+
+    def _zh_counts(self, zh: str) -> Dict[int, int]:
+        counts = self._features.get(zh)
+        if counts is None:
+            counts, _ = self.segmenter.sentence_counts(self.table, zh, self.cfg.zh_ngram_max)
+            self._features[zh] = counts
+        return counts
+
+    def _apply(self, tids: List[int], zh: str, sign: int, affected: Set[int]) -> None:
+        if not tids:
+            return
+        feats = self._zh_counts(zh)
+        for t in tids:
+            affected.add(t)
+            self._n_pairs[t] = self._n_pairs.get(t, 0) + sign
+            acc = self._counts.setdefault(t, Counter())
+            for g, c in feats.items():
+                v = acc[g] + sign * c
+                if v:
+                    acc[g] = v
+                else:
+                    del acc[g]
+
+    def _rescore(self, affected: Set[int]) -> None:
+        """
+        Re-select candidates for `affected` terms. Only grams that can be
+        scored (count >= 2, or the pinned glossary term and variants) need
+        their first-occurrence order, which one scan over the pairs
+        recovers; the scan stops once every term has seen all of its grams.
+        """
+        todo: Dict[int, Set[int]] = {}
+        order: Dict[int, List[int]] = {}
+        variants: Dict[int, List[str]] = {}
+        found: Dict[int, Set[str]] = {}
+        for t in affected:
+            if not self._n_pairs.get(t):
+                self._n_pairs.pop(t, None)
+                self._counts.pop(t, None)
+                self._mappings.pop(t, None)
+                self._flags.pop(t, None)
+                continue
+            term = self.terms[t]
+            pinned: List[str] = []
+            if term in self.glossary:
+                variants[t] = _glossary_variants(self.glossary[term])
+                pinned = [self.glossary[term]] + variants[t]
+            counts = self._counts[t]
+            ids = (self.table.gram_id(g) for g in pinned)
+            todo[t] = {g for g, c in counts.items() if c >= 2} | {g for g in ids if g is not None and g in counts}
+            order[t] = []
+            found[t] = set()
+
+        pending = set(todo)
+        for tids, (_, zh) in zip(self._pair_terms, self.pairs):
+            if not pending:
+                break
+            for t in tids:
+                if t not in pending:
+                    continue
+                need = todo[t]
+                if need:
+                    for g in self._zh_counts(zh):
+                        if g in need:
+                            need.discard(g)
+                            order[t].append(g)
+                for v in variants.get(t, ()):
+                    if v in zh:
+                        found[t].add(v)
+                if not need and len(found[t]) == len(variants.get(t, ())):
+                    pending.discard(t)
+
+        cfg = self.cfg
+        for t in order:
+            term = self.terms[t]
+            counts = self._counts[t]
+            ordered = Counter({self.table.grams[g]: counts[g] for g in order[t]})
+            mapping = _select_candidates(
+                term, ordered, self._n_pairs[t], found[t].__contains__,
+                cfg.max_zh_candidates_per_en_term, self.glossary
+            )
+            self._mappings[t] = mapping
+            flags = detect_inconsistencies(
+                {term: mapping}, glossary=self.glossary,
+                min_total_occurrences=cfg.min_total_occurrences,
+                entropy_threshold=cfg.flag_entropy_threshold
+            )
+            if flags:
+                self._flags[t] = flags[0]
+            else:
+                self._flags.pop(t, None)
+
+
+def _file_state(*paths: str) -> Tuple[Tuple[int, int], ...]:
+    return tuple((st.st_mtime_ns, st.st_size) for st in (os.stat(p) for p in paths))
+
+
+def watch(
+    en_path: str,
+    zh_path: str,
+    glossary_path: Optional[str] = None,
+    out_dir: str = "outputs/watch",
+    config: Optional[TermGuardConfig] = None,
+    interval: float = 0.5,
+    on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+    stop: Optional[threading.Event] = None,
+) -> IncrementalChecker:
+    """
+    Check `en_path`/`zh_path` once, then poll them every `interval` seconds
+    and apply each change as a delta; reports in `out_dir` are rewritten
+    after every update. Runs until `stop` is set (or Ctrl-C).
+    """
+    from .glossary import load_glossary
+    from .logger import get_logger
+    from .report import write_reports
+
+    cfg = config or TermGuardConfig()
+    stop = stop or threading.Event()
+    logger = get_logger(log_path=os.path.join(out_dir, "termguard.log"))
+    glossary = load_glossary(glossary_path) if glossary_path else {}
+
+    checker: Optional[IncrementalChecker] = None
+    state = None
+    while True:
+        try:
+            current = _file_state(en_path, zh_path)
+            texts = (read_text(en_path), read_text(zh_path)) if current != state else None
+        except FileNotFoundError:  # editors that save by rename: skip this tick, retry on the next
+            texts = None
+        if texts is not None:
+            state = current
+            en_text, zh_text = texts
+            if checker is None:
+                checker = IncrementalChecker.for_texts(en_text, zh_text, glossary, cfg)
+            result = checker.update_texts(en_text, zh_text)
+            write_reports(out_dir, result["flags"], formats=cfg.report_formats, compression=cfg.report_compression)
+            logger.info(
+                f"[watch] pairs={result['pairs']} changed=-{result['removed_pairs']}/+{result['added_pairs']} "
+                f"terms={len(result['affected_terms'])} flags={len(result['flags'])} time={result['elapsed'] * 1e3:.1f}ms"
+            )
+            if on_update is not None:
+                on_update(result)
+        if stop.wait(interval):
+            return checker
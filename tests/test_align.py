@@ -0,0 +1,52 @@
+import termguard.align as align
+from termguard.align import align_terms
+
+
+def test_each_zh_sentence_segmented_once(monkeypatch):
+    calls = []
+    real = align.zh_tokenize
+    monkeypatch.setattr(align, "zh_tokenize", lambda s: calls.append(s) or real(s))
+
+    pairs = [
+        ("The drone program protects campus security.", "无人机项目保护校园安全。"),
+        ("The drone program expanded campus security.", "无人机项目扩大了校园安全。"),
+    ]
+    mappings = align_terms(pairs, ["drone program", "campus security", "drone"])
+    assert len(calls) == 2
+    assert ("无人机项目", 1.0, 2) in mappings["drone program"]
+
+
+def test_sparse_engine_matches_counter_engine():
+    from termguard.preprocess import align_sentence_pairs
+    from termguard.utils import read_text
+
+    pairs = align_sentence_pairs(read_text("data/demo_en.txt"), read_text("data/demo_zh.txt"))
+    terms = ["drone program", "drone", "program", "campus", "campus security", "privacy"]
+    for glossary in (None, {"drone program": "无人机项目"}):
+        for k in (1, 3, 5):
+            expected = align_terms(pairs, terms, max_candidates=k, glossary=glossary)
+            assert align_terms(pairs, terms, max_candidates=k, glossary=glossary, engine="sparse") == expected
+
+
+def test_parallel_alignment_matches_serial():
+    pairs = [
+        ("The drone program protects campus security.", "无人机项目保护校园安全。"),
+        ("The drone program expanded.", "无人飞行器项目扩大了。"),
+        ("Campus security improved.", "校园安全提升。"),
+    ] * 4
+    terms = ["drone program", "campus security"]
+    glossary = {"drone program": "无人机项目"}
+    assert align_terms(pairs, terms, glossary=glossary, workers=2) == align_terms(pairs, terms, glossary=glossary)
+
+
+def test_gram_table_matches_string_candidates():
+    from collections import Counter
+    from termguard.align import ZhGramTable, zh_candidate_grams
+
+    table = ZhGramTable()
+    for tokens in (["无人", "机", "项目", "的", "无人机", "项目"], ["无人机", "项目", "了", "无人", "机项目"]):
+        counts, _ = table.sentence_counts(tokens, max_n=4)
+        assert Counter({table.grams[g]: c for g, c in counts.items()}) == Counter(zh_candidate_grams(tokens))
+        assert [table.grams[g] for g in counts] == list(dict.fromkeys(zh_candidate_grams(tokens)))
+    # different token splits of the same string share one id
+    assert table.gram_id("无人机项目") is not None and table.grams.count("无人机项目") == 1
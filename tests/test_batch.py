@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from termguard.batch import load_manifest, run_batch
+
+
+def test_batch_runs_manifest_and_keeps_going_on_errors(tmp_path):
+    data = Path(__file__).parent.parent / "data"
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text(
+        "id,en,zh,glossary\n"
+        f"demo,{data / 'demo_en.txt'},{data / 'demo_zh.txt'},{data / 'demo_glossary.csv'}\n"
+        f"broken,{data / 'demo_en.txt'},missing_zh.txt,\n",
+        encoding="utf-8",
+    )
+    result = run_batch(load_manifest(str(manifest)), out_dir=str(tmp_path / "out"))
+
+    assert [r["status"] for r in result["rows"]] == ["ok", "error"]
+    assert result["rows"][0]["flags"] == 1
+    assert (tmp_path / "out" / "demo" / "report.csv").exists()
+    assert Path(result["summary_csv"]).exists()
+
+
+def test_batch_rejects_unsafe_and_duplicate_ids(tmp_path):
+    en, zh = str(tmp_path / "en.txt"), str(tmp_path / "zh.txt")
+    for doc_id in ("../escape", str(tmp_path / "abs")):
+        with pytest.raises(ValueError, match="relative path"):
+            run_batch([{"id": doc_id, "en": en, "zh": zh}], out_dir=str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("id,en,zh\ndoc,en.txt,zh.txt\ndoc,en.txt,zh.txt\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="share the id 'doc'"):
+        load_manifest(str(manifest))
@@ -0,0 +1,74 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from termguard.engine import TermGuardEngine
+from termguard.logger import get_logger
+from termguard.pipeline import check_texts
+from termguard.utils import read_text
+
+EN = Path(__file__).parent.parent.joinpath("data", "demo_en.txt").read_text(encoding="utf-8")
+ZH = Path(__file__).parent.parent.joinpath("data", "demo_zh.txt").read_text(encoding="utf-8")
+GLOSSARY = {"drone program": "无人机项目", "campus security": "校园安全"}
+
+
+def test_check_is_in_memory_and_matches_check_texts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = TermGuardEngine(GLOSSARY)
+    result = engine.check(EN, ZH)
+    expected = check_texts(EN, ZH, glossary=GLOSSARY)
+    for key in ("flags", "mappings", "patched_zh"):
+        assert result[key] == expected[key]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_file_output_is_opt_in_with_a_log_per_call(tmp_path):
+    engine = TermGuardEngine(GLOSSARY)
+    first = engine.check(EN, ZH, out_dir=str(tmp_path / "a"))
+    engine.check(EN, ZH.replace("无人飞行器", "无人机"), out_dir=str(tmp_path / "b"))
+    assert first["patched_zh"] == read_text(first["patched_path"])
+    assert (tmp_path / "a" / "report.csv").exists()
+    for name in ("a", "b"):
+        assert read_text(str(tmp_path / name / "termguard.log")).count("[consistency]") == 1
+    handlers = logging.getLogger("termguard").handlers
+    assert not any(str(tmp_path) in getattr(h, "baseFilename", "") for h in handlers)
+
+
+def test_run_log_follows_a_custom_logger(tmp_path):
+    engine = TermGuardEngine(GLOSSARY, logger=logging.getLogger("termguard.test_service"))
+    engine.check(EN, ZH, out_dir=str(tmp_path))
+    assert "[consistency]" in read_text(str(tmp_path / "termguard.log"))
+
+
+def test_concurrent_checks_share_one_engine():
+    engine = TermGuardEngine(GLOSSARY)
+    inputs = [(EN, ZH), (EN, ZH.replace("无人飞行器", "无人机"))] * 4
+    expected = [engine.check(en, zh)["flags"] for en, zh in inputs]
+    with ThreadPoolExecutor(4) as ex:
+        got = list(ex.map(lambda p: engine.check(*p)["flags"], inputs))
+    assert got == expected
+
+
+def test_get_logger_follows_the_latest_log_path(tmp_path):
+    name = "termguard.test_engine"
+    try:
+        get_logger(name, str(tmp_path / "first.log"))
+        get_logger(name, str(tmp_path / "second.log")).info("second run")
+        assert "second run" not in read_text(str(tmp_path / "first.log"))
+        assert "second run" in read_text(str(tmp_path / "second.log"))
+    finally:
+        for h in logging.getLogger(name).handlers[:]:
+            logging.getLogger(name).removeHandler(h)
+            h.close()
+
+
+def test_run_pipeline_log_is_closed_before_later_checks(tmp_path):
+    from termguard.pipeline import run_pipeline
+
+    run_pipeline(EN, ZH, glossary=GLOSSARY, out_dir=str(tmp_path / "run"))
+    log = tmp_path / "run" / "termguard.log"
+    before = read_text(str(log))
+    engine = TermGuardEngine(GLOSSARY)
+    engine.check(EN, ZH)
+    engine.check(EN, ZH)
+    assert read_text(str(log)) == before
@@ -9,3 +9,15 @@ def test_extract_en_terms_contains_drone():
     terms = extract_en_terms(sents, top_k=20)
     term_list = [t for t, _ in terms]
     assert any("drone" in t for t in term_list)
+
+
+def test_streaming_extraction_matches_tfidf_ranking_on_small_input():
+    from termguard.extract_terms import extract_en_terms_streaming
+
+    sents = [
+        "The drone program improves campus security.",
+        "The police department uses drones to monitor events.",
+        "After an incident, the drone program expanded across campus.",
+    ]
+    expected = [t for t, _ in extract_en_terms(sents, top_k=10)]
+    assert [t for t, _ in extract_en_terms_streaming(sents, top_k=10, chunk_size=2)] == expected
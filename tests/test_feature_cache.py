@@ -0,0 +1,23 @@
+from collections import Counter
+
+from termguard.align import align_terms
+from termguard.feature_cache import ZhFeatureCache
+
+
+def test_cache_roundtrip_keeps_order_and_evicts(tmp_path):
+    with ZhFeatureCache(str(tmp_path / "f.sqlite"), max_entries=2) as cache:
+        cache.put_many([("a", Counter({"校园安全": 1, "无人机": 2}))])
+        assert list(cache.get_many(["a"])["a"].items()) == [("校园安全", 1), ("无人机", 2)]
+        cache.put_many([("b", Counter()), ("c", Counter({"x": 1}))])
+        assert len(cache.get_many(["a", "b", "c"])) == 2
+
+
+def test_align_terms_reuses_cached_features(tmp_path):
+    pairs = [("The drone program.", "无人机项目。"), ("The drone program again.", "无人机项目再次。")]
+    path = str(tmp_path / "f.sqlite")
+    with ZhFeatureCache(path) as cache:
+        first = align_terms(pairs, ["drone program"], feature_cache=cache)
+        assert cache.stats()["misses"] == 2
+    with ZhFeatureCache(path) as cache:
+        assert align_terms(pairs, ["drone program"], feature_cache=cache) == first
+        assert cache.stats()["hit_rate"] == 1.0
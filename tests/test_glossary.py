@@ -0,0 +1,21 @@
+import pickle
+
+from termguard.glossary import CompiledGlossary, compile_glossary, find_present_terms, load_glossary
+
+
+def test_compiled_glossary_roundtrip_and_presence(tmp_path):
+    glossary = {"drone program": "无人机项目", "Police Department": "警方", "e-mail policy": "邮件政策",
+                "privacy": "隐私", "campus security": "校园安全"}
+    path = compile_glossary(glossary, str(tmp_path / "glossary.tgg"))
+    compiled = load_glossary(path)
+
+    assert isinstance(compiled, CompiledGlossary)
+    assert dict(compiled) == glossary and list(compiled) == list(glossary)
+    assert "privacy" in compiled and "drone" not in compiled
+    assert dict(pickle.loads(pickle.dumps(compiled))) == glossary
+
+    # case-insensitive substring semantics, as `term.lower() in text.lower()`
+    text = "Our xdrone programs help.\nPolice departments follow the E-mail policy. Campus\nsecurity"
+    expected = ["drone program", "Police Department", "e-mail policy"]
+    assert find_present_terms(compiled, [text]) == expected
+    assert find_present_terms(glossary, [text]) == expected
@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+import pytest
+
+from termguard.align import align_terms
+from termguard.cli import _run_main
+from termguard.config import TermGuardConfig
+from termguard.heavy_hitters import SpaceSaving
+from termguard.streaming import pipelined_align_terms
+
+
+def test_space_saving_error_bounds():
+    rnd = random.Random(0)
+    summary, true = SpaceSaving(8, pinned=["pinned"]), Counter()
+    for _ in range(2000):
+        key = "pinned" if rnd.random() < 0.05 else f"k{int(rnd.paretovariate(1.1)) % 50}"
+        c = rnd.randint(1, 3)
+        summary.add(key, c)
+        true[key] += c
+
+    n = sum(c for k, c in true.items() if k != "pinned")
+    assert summary.counts["pinned"] == true["pinned"]
+    assert len(summary) <= 8 + 1
+    for key, count in summary.counts.items():
+        assert true[key] <= count <= true[key] + n / 8
+        assert count - summary.error(key) <= true[key]
+    assert all(key in summary.counts for key, c in true.items() if c > n / 8)
+
+
+def test_approx_engine_is_exact_below_width():
+    pairs = [
+        ("The drone program protects campus security.", "无人机项目保护校园安全。"),
+        ("The drone program expanded.", "无人飞行器项目扩大了。"),
+        ("Campus security improved.", "校园安全提升。"),
+    ] * 3
+    terms = ["drone program", "campus security"]
+    glossary = {"drone program": "无人机项目"}
+    stats = {}
+    approx = align_terms(pairs, terms, glossary=glossary, engine="approx", approx_width=64, stats=stats)
+    assert approx == align_terms(pairs, terms, glossary=glossary)
+    assert stats["approx_evictions"] == 0
+
+
+def test_zero_width_is_rejected_on_every_path(capsys):
+    with pytest.raises(SystemExit):
+        _run_main(["--en", "en.txt", "--zh", "zh.txt", "--approx", "0"])
+    assert "--approx" in capsys.readouterr().err
+    with pytest.raises(ValueError, match="approx_width"):
+        TermGuardConfig(approx_width=0)
+    pairs = [("The drone program expanded.", "无人机项目扩大了。")]
+    with pytest.raises(ValueError, match="width"):
+        pipelined_align_terms(iter(pairs), ["drone program"], approx_width=0)
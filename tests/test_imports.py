@@ -0,0 +1,12 @@
+import json
+import subprocess
+import sys
+
+
+def test_pipeline_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, json, termguard.pipeline, termguard.cli\n"
+        "print(json.dumps([m for m in ('pandas', 'numpy', 'scipy', 'sklearn', 'jieba') if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert json.loads(out) == []
@@ -0,0 +1,22 @@
+from termguard.instrument import Instrumentation
+from termguard.pipeline import check_texts
+
+
+def test_stage_callbacks_counters_and_chrome_trace():
+    events = []
+    inst = Instrumentation(on_stage_start=lambda n: events.append(("start", n)),
+                           on_stage_end=lambda r: events.append(("end", r.name)))
+    result = check_texts(
+        "The drone program works. The drone program grows.",
+        "无人机项目有效。无人飞行器项目扩大。",
+        glossary={"drone program": "无人机项目"},
+        instrumentation=inst,
+    )
+    names = [r.name for r in inst.records]
+    assert names == ["preprocess_align", "extract_terms", "align_terms", "detect_inconsistencies", "patch"]
+    assert events[:2] == [("start", "preprocess_align"), ("end", "preprocess_align")]
+    assert inst.records[2].counters["sentences_aligned"] == 2
+    assert set(result["stage_times"]) == set(names)
+
+    trace = inst.to_chrome_trace()["traceEvents"]
+    assert [e["name"] for e in trace if e["ph"] == "X"] == names
@@ -0,0 +1,32 @@
+from termguard.config import TermGuardConfig
+from termguard.instrument import Instrumentation
+from termguard.memo import RunCache, run_key
+
+EN = "The drone program protects campus security. The drone program expanded."
+ZH = "无人机项目保护校园安全。无人飞行器项目扩大了。"
+GLOSSARY = {"drone program": "无人机项目"}
+
+
+def test_run_cache_memoizes_and_isolates_results():
+    cache = RunCache(max_entries=2)
+    stages = []
+    first, hit = cache.get_or_run(EN, ZH, GLOSSARY, instrumentation=Instrumentation(on_stage_start=stages.append))
+    assert not hit and "align_terms" in stages
+    assert first["reports"]["csv"].startswith("\ufeffen_term".encode("utf-8"))
+
+    first["flags"].clear()  # a caller's copy is its own
+    stages.clear()
+    again, hit = cache.get_or_run(EN, ZH, dict(GLOSSARY), instrumentation=Instrumentation(on_stage_start=stages.append))
+    assert hit and not stages
+    assert again["flags"] and again["patched_zh"] == first["patched_zh"]
+
+    _, hit = cache.get_or_run(EN, ZH, GLOSSARY, config=TermGuardConfig(max_zh_candidates_per_en_term=3))
+    assert not hit
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_run_key_follows_glossary_order():
+    forward = {"drone program": "无人机项目", "campus security": "校园安全"}
+    backward = dict(reversed(list(forward.items())))
+    assert run_key(EN, ZH, forward) != run_key(EN, ZH, backward)
+    assert run_key(EN, ZH, forward) == run_key(EN, ZH, dict(forward))
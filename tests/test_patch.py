@@ -11,3 +11,42 @@ def test_patch_replaces_alternate():
     patched = patch_zh_text(zh, glossary, inconsistencies)
     assert "无人机项目" in patched
     assert "无人飞行器" not in patched
+
+
+def test_patch_single_pass_longest_match_and_spans():
+    from termguard.patch import build_patch_rules, patch_zh_text_spans
+
+    zh = "无人飞行器项目和无人机计划。"
+    flags = [
+        {"preferred_zh": "无人机项目", "candidate_terms": ["无人机项目", "无人飞行器项目", "无人机计划", "项目"]},
+        # must not rewrite inside the text produced by the first flag
+        {"preferred_zh": "航空器", "candidate_terms": ["无人机"]},
+    ]
+    patched, spans = patch_zh_text_spans(zh, build_patch_rules(flags))
+    assert patched == "无人机项目和无人机项目。"
+    assert spans == [(0, 7, "无人飞行器项目", "无人机项目"), (8, 13, "无人机计划", "无人机项目")]
+
+
+def test_chunked_file_patch_matches_full_text(tmp_path):
+    import json
+    from termguard.patch import build_patch_rules, patch_zh_file, patch_zh_text_spans
+
+    flags = [{"preferred_zh": "无人机项目", "candidate_terms": ["无人飞行器项目", "无人机计划", "项目"]}]
+    rules = build_patch_rules(flags)
+    # one long line, so matches straddle chunk boundaries
+    zh = "无人飞行器项目和无人机计划，项目无人机项目项目。" * 50
+    expected, spans = patch_zh_text_spans(zh, rules)
+    src = tmp_path / "zh.txt"
+    src.write_text(zh, encoding="utf-8")
+    for chunk_chars in (1, 3, 7, 64, 1 << 20):
+        dst, log = tmp_path / "out.txt", tmp_path / "log.jsonl"
+        n = patch_zh_file(str(src), str(dst), rules, chunk_chars=chunk_chars, log_path=str(log))
+        assert dst.read_text(encoding="utf-8") == expected
+        rows = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+        assert n == len(spans) and [(r["start"], r["end"], r["old"], r["new"]) for r in rows] == spans
+
+    import pytest
+
+    with pytest.raises(ValueError, match="chunk_chars"):
+        patch_zh_file(str(src), str(tmp_path / "zero.txt"), rules, chunk_chars=0)
+    assert not (tmp_path / "zero.txt").exists()
@@ -6,3 +6,11 @@ def test_align_sentence_pairs_truncates():
     zh = "你好世界。第二句。第三句。"
     pairs = align_sentence_pairs(en, zh)
     assert len(pairs) == 2
+
+
+def test_length_aligner_recovers_from_split_sentence():
+    en = "Hello world. The second sentence is rather long and continues. Third has 42 items. Fourth."
+    zh = "你好世界。第二句比较长。而且还在继续。第三句有42个项目。第四。"
+    pairs = align_sentence_pairs(en, zh, method="length")
+    assert pairs[1] == ("The second sentence is rather long and continues.", "第二句比较长。而且还在继续。")
+    assert pairs[2] == ("Third has 42 items.", "第三句有42个项目。")
@@ -0,0 +1,16 @@
+from termguard.preprocess import split_en_sentences, split_zh_sentences
+from termguard.reader import iter_sentence_spans, iter_sentences, read_span
+
+
+def test_reader_matches_splitters_and_offsets(tmp_path):
+    en = "Hello  world. Second\tone!\r\n\n  Third line?\n"
+    zh = "你好　世界。第二句！\n\n第三句"
+    (tmp_path / "en.txt").write_bytes(en.encode("utf-8"))
+    (tmp_path / "zh.txt").write_bytes(zh.encode("utf-8"))
+
+    assert list(iter_sentences(str(tmp_path / "en.txt"), "en")) == split_en_sentences(en)
+    assert list(iter_sentences(str(tmp_path / "zh.txt"), "zh")) == split_zh_sentences(zh)
+
+    spans = list(iter_sentence_spans(str(tmp_path / "zh.txt"), "zh"))
+    assert read_span(str(tmp_path / "zh.txt"), *spans[0][:2]) == "你好　世界。"
+    assert [s for _, _, s in spans] == ["你好 世界。", "第二句！", "第三句"]
@@ -0,0 +1,44 @@
+import gzip
+import json
+import sys
+
+import pytest
+
+from termguard.report import ReportWriter, write_report
+
+FLAGS = [
+    {"en_term": "drone program", "preferred_zh": "无人机项目", "total_occurrences": 3, "entropy": 0.6,
+     "top_prob": 0.67, "severity": 0.93, "candidates": [{"zh_term": "无人机项目", "score": 1.0, "count": 2},
+                                                       {"zh_term": "无人飞行器项目", "score": 0.5, "count": 1}]},
+    {"en_term": "campus", "preferred_zh": "校园", "total_occurrences": 2, "entropy": 0.0,
+     "top_prob": 1.0, "severity": 0.0, "candidates": [{"zh_term": "校园", "score": 1.0, "count": 2}]},
+]
+
+
+def test_streamed_json_matches_full_dump_and_jsonl_is_gzipped(tmp_path):
+    _, json_path = write_report(str(tmp_path / "plain"), FLAGS)
+    with open(json_path, encoding="utf-8") as fh:
+        assert fh.read() == json.dumps(FLAGS, ensure_ascii=False, indent=2)
+
+    with ReportWriter(str(tmp_path / "gz"), formats=("jsonl",), compression="gzip", keep_rows=True) as w:
+        for f in FLAGS:
+            w.write(f)
+    with gzip.open(w.paths["jsonl"], "rt", encoding="utf-8") as fh:
+        assert [json.loads(ln) for ln in fh] == FLAGS
+    assert w.rows[0]["candidate_zh_terms"] == "无人机项目(2); 无人飞行器项目(1)"
+
+
+def test_arrow_with_gzip_is_rejected_before_anything_is_written(tmp_path):
+    with pytest.raises(ValueError, match="gzip"):
+        ReportWriter(str(tmp_path / "out"), formats=("csv", "arrow"), compression="gzip")
+    assert not (tmp_path / "out").exists()
+
+
+def test_missing_optional_packages_are_named(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        ReportWriter(str(tmp_path / "out"), formats=("csv", "parquet"))
+    with pytest.raises(ImportError, match="pip install zstandard"):
+        ReportWriter(str(tmp_path / "out"), formats=("jsonl",), compression="zstd")
+    assert not (tmp_path / "out").exists()
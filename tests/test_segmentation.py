@@ -0,0 +1,49 @@
+import pickle
+
+from termguard.align import ZhGramTable, align_terms
+from termguard.feature_cache import sentence_key
+from termguard.segmentation import ZhSegmenter
+from termguard.streaming import pipelined_align_terms
+
+GLOSSARY = {"drone program": "无人机项目"}
+PAIRS = [
+    ("The drone program protects campus security.", "学生加入了无人机项目，保护校园安全。"),
+    ("The drone program expanded.", "无人飞行器项目扩大了。"),
+    ("The drone program and campus security.", "无人机计划和校园安保。"),
+] * 2
+
+
+def test_glossary_terms_become_single_tokens():
+    seg = ZhSegmenter.for_glossary("glossary", GLOSSARY)
+    assert seg.words == ("无人机项目", "无人飞行器项目")
+    assert "无人机项目" in seg.tokenize("学生加入了无人机项目。")
+    assert "无人飞行器项目" in pickle.loads(pickle.dumps(seg)).tokenize("无人飞行器项目扩大了。")
+    assert ZhSegmenter().key == "" and seg.key != ZhSegmenter.for_glossary("anchored", GLOSSARY).key
+    assert sentence_key("无人机项目。", 4, seg.key) != sentence_key("无人机项目。", 4)
+
+
+def test_anchored_mode_only_generates_grams_near_anchors():
+    tokens = ["学生", "加入", "无人机项目", "保护", "校园", "安全"]
+    table = ZhGramTable()
+    _, full = table.sentence_counts(tokens, 4)
+    counts, generated = table.sentence_counts(tokens, 4, anchors={"无人机项目"}, window=1)
+    assert generated < full
+    assert [table.grams[g] for g in counts] == [
+        "加入", "无人机项目", "保护", "加入无人机项目", "无人机项目保护", "加入无人机项目保护"
+    ]
+    # no anchor in the sentence: every n-gram is kept
+    assert table.sentence_counts(tokens[3:], 4, anchors={"无人机项目"}) == table.sentence_counts(tokens[3:], 4)
+
+
+def test_engines_agree_under_glossary_segmentation():
+    for mode in ("glossary", "anchored"):
+        seg = ZhSegmenter.for_glossary(mode, GLOSSARY)
+        terms = ["drone program", "campus security"]
+        stats = {}
+        expected = align_terms(PAIRS, terms, glossary=GLOSSARY, segmenter=seg, stats=stats)
+        assert expected["drone program"][0] == ("无人机项目", 999.0, 3)
+        assert align_terms(PAIRS, terms, glossary=GLOSSARY, segmenter=seg, engine="sparse") == expected
+        assert pipelined_align_terms(PAIRS, terms, glossary=GLOSSARY, segmenter=seg, batch_size=2) == expected
+        baseline = {}
+        align_terms(PAIRS, terms, glossary=GLOSSARY, stats=baseline)
+        assert stats["ngrams_generated"] < baseline["ngrams_generated"]
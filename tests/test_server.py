@@ -0,0 +1,96 @@
+import asyncio
+import json
+import urllib.request
+from pathlib import Path
+
+from termguard.server import TermGuardServer
+
+
+def _post(port, payload):
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}/check",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def test_server_checks_concurrent_requests_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    en = Path(__file__).parent.parent.joinpath("data", "demo_en.txt").read_text(encoding="utf-8")
+    zh = Path(__file__).parent.parent.joinpath("data", "demo_zh.txt").read_text(encoding="utf-8")
+
+    async def scenario():
+        server = TermGuardServer(port=0, glossary={"drone program": "无人机项目"}, workers=2, use_processes=False)
+        port = await server.start()
+        try:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(None, _post, port, {"en": en, "zh": zh}) for _ in range(3)
+            ])
+        finally:
+            await server.close()
+        return results
+
+    results = asyncio.run(scenario())
+    for res in results:
+        assert [f["en_term"] for f in res["flags"]] == ["drone program"]
+        assert "无人飞行器项目" not in res["patched_zh"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_server_rejects_bad_content_length():
+    async def scenario():
+        server = TermGuardServer(port=0, use_processes=False)
+        port = await server.start()
+        statuses = []
+        try:
+            for length in ("-5", "abc"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(f"POST /check HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+                await writer.drain()
+                statuses.append((await reader.readline()).decode("latin-1").split()[1])
+                writer.close()
+                await writer.wait_closed()
+        finally:
+            await server.close()
+        return statuses
+
+    assert asyncio.run(scenario()) == ["400", "400"]
+
+
+def test_thread_mode_builds_one_engine_and_rejects_non_string_glossaries(monkeypatch):
+    import urllib.error
+
+    from termguard import engine
+
+    built = []
+    init = engine.TermGuardEngine.__init__
+
+    def counting_init(self, *args, **kwargs):
+        built.append(1)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(engine.TermGuardEngine, "__init__", counting_init)
+
+    async def scenario():
+        server = TermGuardServer(port=0, workers=3, use_processes=False)
+        port = await server.start()
+        try:
+            loop = asyncio.get_running_loop()
+            ok = await loop.run_in_executor(None, _post, port, {"en": "A drone program.", "zh": "无人机项目。"})
+            bad = None
+            try:
+                await loop.run_in_executor(
+                    None, _post, port, {"en": "x", "zh": "y", "glossary": {"drone program": 1}}
+                )
+            except urllib.error.HTTPError as e:
+                bad = e.code
+        finally:
+            await server.close()
+        return ok, bad
+
+    ok, bad = asyncio.run(scenario())
+    assert built == [1] and "flags" in ok
+    assert bad == 400
@@ -0,0 +1,59 @@
+import pytest
+
+from termguard.align import align_terms
+from termguard.stats import CorpusStats, merge_stats_files
+
+PAIRS = [
+    ("The drone program protects campus security.", "无人机项目保护校园安全。"),
+    ("The drone program expanded.", "无人飞行器项目扩大了。"),
+    ("Campus security improved.", "校园安全提升。"),
+    ("The drone program and campus security.", "无人机计划和校园安保。"),
+] * 3
+TERMS = ["drone program", "campus security"]
+GLOSSARY = {"drone program": "无人机项目"}
+
+
+def test_merged_stats_match_a_single_run(tmp_path):
+    paths = []
+    for i, (lo, hi) in enumerate([(0, 5), (5, 6), (6, 12)]):
+        term_stats = {}
+        align_terms(PAIRS[lo:hi], TERMS, glossary=GLOSSARY, term_stats=term_stats)
+        stats = CorpusStats.from_alignment(term_stats, aligned_pairs=hi - lo)
+        paths.append(stats.save(str(tmp_path / f"doc{i}.json.gz")))
+
+    merged = merge_stats_files(paths)
+    assert (merged.documents, merged.aligned_pairs) == (3, len(PAIRS))
+    for k in (1, 3):
+        assert merged.to_mappings(k, GLOSSARY) == align_terms(PAIRS, TERMS, max_candidates=k, glossary=GLOSSARY)
+
+    with pytest.raises(ValueError):
+        merged.merge(CorpusStats(zh_ngram_max=3))
+    with pytest.raises(ValueError):
+        merged.merge(CorpusStats(segmentation="glossary"))
+
+
+def test_merge_refuses_stats_counted_with_other_settings(tmp_path):
+    from termguard.config import TermGuardConfig
+    from termguard.pipeline import check_texts
+
+    en, zh = (" ".join(p[i] for p in PAIRS) for i in (0, 1))
+    configs = [TermGuardConfig(write_stats=True, zh_segmentation="anchored", zh_anchor_window=w) for w in (1, 2)]
+    first, second = (check_texts(en, zh, glossary=GLOSSARY, config=c)["term_stats"] for c in configs)
+    assert first.settings["zh_anchor_window"] == 1
+    with pytest.raises(ValueError, match="zh_anchor_window"):
+        first.merge(second)
+    saved = CorpusStats.load(first.save(str(tmp_path / "a.json.gz")))
+    assert saved.settings == first.settings
+    with pytest.raises(ValueError, match="counting"):
+        saved.merge(CorpusStats(4, "anchored", {**first.settings, "counting": "approx:64"}))
+
+
+def test_merge_reports_terms_missing_from_some_documents():
+    stats = []
+    for terms in (TERMS, TERMS[:1]):
+        term_stats = {}
+        align_terms(PAIRS, terms, glossary=GLOSSARY, term_stats=term_stats)
+        stats.append(CorpusStats.from_alignment(term_stats, aligned_pairs=len(PAIRS)))
+    merged = stats[0].merge(stats[1])
+    assert merged.partial_terms == ["campus security"]
+    assert CorpusStats.from_dict(merged.to_dict()).partial_terms == ["campus security"]
@@ -0,0 +1,63 @@
+import pytest
+
+from termguard.align import align_terms
+from termguard.config import TermGuardConfig
+from termguard.pipeline import check_files_pipelined
+from termguard.streaming import pipelined_align_terms
+
+
+PAIRS = [
+    ("The drone program protects campus security.", "无人机项目保护校园安全。"),
+    ("The drone program expanded.", "无人飞行器项目扩大了。"),
+    ("Campus security improved.", "校园安全提升。"),
+    ("Nothing relevant here.", "这里没有相关内容。"),
+] * 5
+TERMS = ["drone program", "campus security", "drone", "missing term"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipelined_matches_staged_alignment(workers):
+    glossary = {"drone program": "无人机项目"}
+    expected_stats, stats = {}, {}
+    expected = align_terms(PAIRS, TERMS, glossary=glossary, stats=expected_stats)
+    got = pipelined_align_terms(
+        iter(PAIRS), TERMS, glossary=glossary, workers=workers, queue_size=1, batch_size=3, stats=stats
+    )
+    assert got == expected
+    assert stats == expected_stats
+
+
+def test_pipelined_reader_errors_propagate():
+    def broken():
+        yield PAIRS[0]
+        raise OSError("disk gone")
+
+    with pytest.raises(OSError, match="disk gone"):
+        pipelined_align_terms(broken(), TERMS, batch_size=1)
+
+
+@pytest.mark.parametrize("config", [
+    TermGuardConfig(execution="pipelined", align_engine="sparse"),
+    TermGuardConfig(execution="pipelined", feature_cache_path="cache.sqlite"),
+])
+def test_pipelined_rejects_whole_corpus_options(config):
+    with pytest.raises(ValueError, match="pipelined"):
+        check_files_pipelined(lambda: iter(PAIRS), config=config)
+
+
+def test_stream_input_runs_the_bounded_path(tmp_path, monkeypatch):
+    from pathlib import Path
+
+    from termguard import pipeline
+
+    data = Path(__file__).parent.parent / "data"
+    args = (str(data / "demo_en.txt"), str(data / "demo_zh.txt"), str(data / "demo_glossary.csv"))
+    staged = pipeline.run_pipeline_from_files(*args, str(tmp_path / "staged"))
+    calls = []
+    monkeypatch.setattr(pipeline, "check_texts", lambda *a, **kw: calls.append(kw))
+    streamed = pipeline.run_pipeline_from_files(*args, str(tmp_path / "stream"), TermGuardConfig(stream_input=True))
+    assert calls == [] and streamed["flags"] == staged["flags"]
+    with pytest.raises(ValueError, match="feature_cache_path"):
+        pipeline.run_pipeline_from_files(
+            *args, str(tmp_path / "cache"), TermGuardConfig(stream_input=True, feature_cache_path="c.sqlite")
+        )
@@ -0,0 +1,18 @@
+from termguard.term_index import EnTermIndex, EnTermMatcher
+from termguard.utils import contains_en_term
+
+
+def test_index_matches_contains_en_term():
+    sents = [
+        "the drone program improves campus security.",
+        "drones are not a drone-program.",
+        "e-mail the drone  program office",
+        "a drone_program is one token",
+    ]
+    terms = ["drone program", "drone", "program", "e-mail", "drone-program", "drones", "missing term", "drone  program"]
+    idx = EnTermIndex(sents)
+    matcher = EnTermMatcher(terms)
+    for t, term in enumerate(terms):
+        expected = [i for i, s in enumerate(sents) if contains_en_term(s, term)]
+        assert idx.lookup(term) == expected
+        assert [i for i, s in enumerate(sents) if t in matcher.match(s)] == expected
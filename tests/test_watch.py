@@ -0,0 +1,97 @@
+import random
+import threading
+
+from termguard.config import TermGuardConfig
+from termguard.pipeline import check_texts
+from termguard.watch import IncrementalChecker, watch
+
+EN = [
+    "The drone program protects campus security.",
+    "The drone program expanded.",
+    "Campus security improved.",
+    "The drone program and campus security.",
+    "Students joined the drone program.",
+] * 4
+ZH = [
+    "无人机项目保护校园安全。",
+    "无人飞行器项目扩大了。",
+    "校园安全提升。",
+    "无人机计划和校园安保。",
+    "学生加入了无人机计划。",
+] * 4
+GLOSSARY = {"drone program": "无人机项目", "campus security": "校园安全"}
+
+
+def test_updates_match_a_full_run():
+    en, zh = list(EN), list(ZH)
+    checker = IncrementalChecker.for_texts("\n".join(en), "\n".join(zh), GLOSSARY)
+    checker.update_texts("\n".join(en), "\n".join(zh))
+    rnd = random.Random(7)
+    for _ in range(25):
+        i, j = rnd.randrange(len(en)), rnd.randrange(len(en))
+        op = rnd.choice(["change", "insert", "delete"])
+        if op == "change":
+            zh[i] = ZH[j]
+        elif op == "insert":
+            en.insert(i, EN[j])
+            zh.insert(i, ZH[j])
+        elif len(en) > 1:
+            del en[i], zh[i]
+        en_text, zh_text = "\n".join(en), "\n".join(zh)
+        result = checker.update_texts(en_text, zh_text)
+        full = check_texts(en_text, zh_text, glossary=GLOSSARY)
+        assert result["flags"] == full["flags"]
+        assert checker.mappings == {t: m for t, m in full["mappings"].items() if m}
+
+
+def test_only_changed_pairs_are_recounted():
+    checker = IncrementalChecker(["drone program", "campus security"], GLOSSARY, TermGuardConfig())
+    checker.update(list(zip(EN, ZH)))
+    pairs = list(zip(EN, ZH))
+    pairs[2] = ("Campus security improved.", "校园安保提升。")
+    result = checker.update(pairs)
+    assert (result["removed_pairs"], result["added_pairs"]) == (1, 1)
+    assert result["affected_terms"] == ["campus security"]
+
+
+def test_watch_picks_up_file_changes(tmp_path):
+    en_path, zh_path = tmp_path / "en.txt", tmp_path / "zh.txt"
+    en_path.write_text("\n".join(EN), encoding="utf-8")
+    zh_path.write_text("\n".join(ZH[:3] + ["校园安全。"] + ZH[4:]), encoding="utf-8")
+    stop = threading.Event()
+    updates = []
+
+    def on_update(result):
+        updates.append(result)
+        if len(updates) == 1:
+            zh_path.write_text("\n".join(ZH), encoding="utf-8")
+        else:
+            stop.set()
+
+    watch(str(en_path), str(zh_path), out_dir=str(tmp_path / "out"), config=TermGuardConfig(),
+          interval=0.01, on_update=on_update, stop=stop)
+    assert updates[1]["added_pairs"] == 1
+    assert (tmp_path / "out" / "report.csv").exists()
+
+
+def test_watch_skips_a_tick_while_a_file_is_being_replaced(tmp_path, monkeypatch):
+    from termguard import watch as watch_module
+    from termguard.utils import read_text
+
+    en_path, zh_path = tmp_path / "en.txt", tmp_path / "zh.txt"
+    en_path.write_text("\n".join(EN), encoding="utf-8")
+    zh_path.write_text("\n".join(ZH), encoding="utf-8")
+    reads = []
+
+    def flaky_read(path):
+        reads.append(path)
+        if len(reads) == 1:  # renamed away between the stat and the read
+            raise FileNotFoundError(path)
+        return read_text(path)
+
+    stop = threading.Event()
+    updates = []
+    monkeypatch.setattr(watch_module, "read_text", flaky_read)
+    watch(str(en_path), str(zh_path), out_dir=str(tmp_path / "out"), config=TermGuardConfig(),
+          interval=0.01, on_update=lambda r: (updates.append(r), stop.set()), stop=stop)
+    assert len(updates) == 1 and updates[0]["pairs"] == len(EN)